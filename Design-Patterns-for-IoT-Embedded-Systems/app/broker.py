@@ -14,9 +14,8 @@
 
 import os
 import sys
+import pandas as pd
 import streamlit as st
-from streamlit_autorefresh import st_autorefresh
-from threading import Thread, Event
 import atexit
 
 ##################### INICIO DA PLATAFORMA BROKER ###################################################
@@ -44,9 +43,12 @@ if src_dir not in sys.path:
     sys.path.append(src_dir)
 
 # Importações dos módulos
-from src.main import processar_e_criar_dispositivos, ler_sensor
-from src.observer import GenericSubscriber
-from src.devices import AIDevicePublisher
+from src.log_config import configurar_logging
+from src.backend import DISPOSITIVO_VISUALIZACAO, BrokerBackend, preparar_dispositivos
+from src.broker_client import RemoteBackend
+
+# Logging em fila (nível via BROKER_LOG_LEVEL); configurado uma única vez por processo
+configurar_logging()
 
 # Carregar CSS personalizado
 def load_css():
@@ -61,41 +63,38 @@ def load_css():
 # Chamando a função para carregar o CSS
 load_css()
 
-# Carregar dispositivos criados usando a função do main.py
-if 'dispositivos_criados' not in st.session_state:
-    try:
-        dispositivos_criados = processar_e_criar_dispositivos()
-        st.session_state['dispositivos_criados'] = dispositivos_criados
-        if not dispositivos_criados:
-            st.error("Nenhum dispositivo foi criado. Verifique o arquivo Excel.")
-    except Exception as e:
-        st.error(f"Erro ao processar e criar dispositivos: {e}")
-else:
-    dispositivos_criados = st.session_state['dispositivos_criados']
-
-# Verificar se dispositivos_criados está definido e não está vazio
-if not dispositivos_criados:
+# Backend único por processo: planilha lida, porta serial aberta e thread de ingestão criadas uma vez,
+# compartilhados por todas as sessões (abas) do navegador. Com BROKER_DAEMON_URL definido, a ingestão
+# roda no daemon (python -m src.brokerd) e a interface só consome a API HTTP de snapshot
+@st.cache_resource
+def obter_backend(url_daemon=None):
+    if url_daemon:
+        backend = RemoteBackend(url_daemon)
+        backend.verificar()
+        return backend
+
+    backend = BrokerBackend()
+    if backend.dispositivos:
+        preparar_dispositivos(backend.dispositivos)
+        backend.iniciar()
+        # Para a thread de ingestão e fecha a porta quando o processo do Streamlit sair
+        atexit.register(backend.parar)
+    return backend
+
+try:
+    backend = obter_backend(os.environ.get('BROKER_DAEMON_URL'))
+except Exception as e:
+    st.error(f"Erro ao processar e criar dispositivos: {e}")
+    st.stop()
+
+# Verificar se algum dispositivo foi criado
+if not len(backend):
+    st.error("Nenhum dispositivo foi criado. Verifique o arquivo Excel.")
     st.stop()  # Parar a execução do Streamlit se não houver dispositivos
 
-# Iniciar a thread de leitura do sensor
-if 'sensor_thread' not in st.session_state:
-    stop_event = Event()
-    sensor_thread = Thread(target=ler_sensor, args=(dispositivos_criados, stop_event), daemon=True)
-    sensor_thread.start()
-    st.session_state['sensor_thread'] = sensor_thread
-    st.session_state['stop_event'] = stop_event
-
-# Função para parar a thread ao encerrar a aplicação
-def stop_sensor_thread():
-    if 'stop_event' in st.session_state:
-        st.session_state['stop_event'].set()
-        st.session_state['sensor_thread'].join()
-
-# Registrar a função de limpeza para ser chamada quando o programa sair
-atexit.register(stop_sensor_thread)
-
-# Atualização automática da página a cada 1000ms (1 segundo)
-st_autorefresh(interval=400, key="data_refresh")
+# Intervalo de atualização dos valores em tempo real. Só os fragmentos abaixo (@st.fragment) são
+# reexecutados nesse ritmo; CSS, menu lateral e formulários rodam apenas em interações do usuário
+INTERVALO_ATUALIZACAO = float(os.environ.get('BROKER_REFRESH_S', '0.5'))
 
 ##################### MENU LATERAL ####################################################
 
@@ -120,9 +119,8 @@ if page == "Broker":
 
 ##################### "use state" PARA MANTER DADOS NA MEMORIA ####################################################
 
-    if 'associacoes' not in st.session_state:
-        st.session_state['associacoes'] = []
-    associacoes = st.session_state['associacoes']
+    # Associações ficam no backend compartilhado: todas as sessões veem a mesma tabela
+    associacoes = backend.hub
 
 ##################### PREENCHE COM OBJETOS CRIADOS E ASSOCIA ####################################################
 
@@ -132,38 +130,34 @@ if page == "Broker":
     col1, col2, col3 = st.columns([3, 3, 1])
 
     with col1:
-        dispositivos_ai = [d.tag for d in dispositivos_criados if isinstance(d, AIDevicePublisher)]
+        dispositivos_ai = backend.tags("AI")
         dispositivo_selecionado = st.selectbox("Dispositivo AI:", dispositivos_ai, key='novo_dispositivo')
+        # Assinatura por padrão: um observador em todos os pontos que casam, inclusive os criados depois
+        padrao_tag = st.text_input("Ou padrão de TAG (A1-AI-*, A1-#, area:1):", key='novo_padrao')
 
     with col2:
         subscriber_name = st.text_input("Associar com:", key='novo_subscriber')
 
     def adicionar_associacao():
-        dispositivo_tag = dispositivo_selecionado
+        dispositivo_tag = padrao_tag.strip() or dispositivo_selecionado
         subscriber_name_input = subscriber_name.strip()
 
         if not subscriber_name_input:
             st.warning("Por favor, insira o nome do objeto associado.")
             return
 
-        if any(assoc['dispositivo'] == dispositivo_tag and assoc['subscriber'] == subscriber_name_input for assoc in associacoes):
+        if associacoes.existe(dispositivo_tag, subscriber_name_input):
             st.warning("Essa associação já existe.")
             return
 
-        dispositivo = next((d for d in dispositivos_criados if d.tag == dispositivo_tag), None)
-
-        if dispositivo and isinstance(dispositivo, AIDevicePublisher):
-            observer = GenericSubscriber(subscriber_name_input)
-            dispositivo.attach(observer)
-            associacoes.append({
-                'dispositivo': dispositivo_tag,
-                'subscriber': subscriber_name_input,
-                'observer': observer
-            })
-            st.session_state['associacoes'] = associacoes.copy()
-            st.success(f"Associação criada entre {dispositivo_tag} e {subscriber_name_input}")
-        else:
-            st.error("Dispositivo não encontrado ou inválido.")
+        try:
+            associacoes.associar(dispositivo_tag, subscriber_name_input)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        # O padrão tem precedência sobre o selectbox: limpa o campo para a próxima associação usar o dispositivo escolhido
+        st.session_state['novo_padrao'] = ""
+        st.success(f"Associação criada entre {dispositivo_tag} e {subscriber_name_input}")
 
     with col3:
         st.button("Criar Associação", on_click=adicionar_associacao)
@@ -172,51 +166,57 @@ if page == "Broker":
 
 ##################### ATUALIZAÇÃO DA TABELA DE ASSOCIAÇÕES ####################################################
 
-    # Exibe a lista de associações
+    # Exibe a lista de associações; apenas este trecho é reexecutado a cada INTERVALO_ATUALIZACAO
     st.header("Associações Criadas")
-    if associacoes:
-        cols = st.columns([1, 3, 3, 3, 1])
-        cols[0].markdown('<div class="table-header">Nº</div>', unsafe_allow_html=True)
-        cols[1].markdown('<div class="table-header">Dispositivo AI</div>', unsafe_allow_html=True)
-        cols[2].markdown('<div class="table-header">Objeto Associado</div>', unsafe_allow_html=True)
-        cols[3].markdown('<div class="table-header">Valor em Tempo Real</div>', unsafe_allow_html=True)
-        cols[4].markdown('<div class="table-header">Ações</div>', unsafe_allow_html=True)
-
-        for i, assoc in enumerate(associacoes):
-            dispositivo = next((d for d in dispositivos_criados if d.tag == assoc['dispositivo']), None)
-            current_value = f"{dispositivo.value} {dispositivo.unit}" if dispositivo and isinstance(dispositivo, AIDevicePublisher) else "N/A"
-
-            cols = st.columns([1, 3, 3, 3, 1])
-            cols[0].markdown(f'<div class="table-cell">{i+1}</div>', unsafe_allow_html=True)
-            cols[1].markdown(f'<div class="table-cell">{assoc["dispositivo"]}</div>', unsafe_allow_html=True)
-            cols[2].markdown(f'<div class="table-cell">{assoc["subscriber"]}</div>', unsafe_allow_html=True)
-            cols[3].markdown(f'<div class="table-cell">{current_value}</div>', unsafe_allow_html=True)
-
-            if cols[4].button("❌", key=f"remove_{i}"):
-                if dispositivo:
-                    dispositivo.detach(assoc['observer'])
-                associacoes.pop(i)
-                st.session_state['associacoes'] = associacoes.copy()
-                st.experimental_rerun()
-    else:
-        st.info("Nenhuma associação criada ainda.")
+
+    @st.fragment(run_every=INTERVALO_ATUALIZACAO)
+    def tabela_associacoes():
+        if not associacoes:
+            st.info("Nenhuma associação criada ainda.")
+            return
+        # Um único bloco HTML; a cada atualização só as células de valor alteradas são refeitas
+        st.markdown(associacoes.html(), unsafe_allow_html=True)
+
+    tabela_associacoes()
+
+    # Remoção fora do fragmento: widgets estáticos, redesenhados só em interações do usuário
+    linhas = associacoes.linhas()
+    if linhas:
+        col_remover, col_botao = st.columns([6, 1])
+        with col_remover:
+            indice_remover = st.selectbox(
+                "Remover associação:", range(len(linhas)), key='remover_associacao',
+                format_func=lambda i: f"{i + 1} - {linhas[i].dispositivo} → {linhas[i].subscriber}",
+            )
+        with col_botao:
+            if st.button("❌", key="remover"):
+                linha = linhas[indice_remover]
+                try:
+                    associacoes.desassociar(linha.dispositivo, linha.subscriber)
+                except ValueError:
+                    pass  # Já removida em outra sessão; o rerun mostra a tabela atual
+                st.rerun()
 
     st.markdown("---")
 
 ##################### NOTIFICA OBSERVADORES ####################################################
 
     st.header("Notificações dos Observadores")
-    if associacoes:
-        for assoc in associacoes:
-            observer = assoc['observer']
-            if observer.notifications:
-                st.subheader(f"Objeto Associado: {observer.name}")
-                for notification in observer.notifications[-5:]:
+
+    @st.fragment(run_every=INTERVALO_ATUALIZACAO)
+    def notificacoes_observadores():
+        if not associacoes:
+            st.info("Nenhuma notificação para exibir.")
+            return
+        for nome, notificacoes in associacoes.notificacoes(5):
+            if notificacoes:
+                st.subheader(f"Objeto Associado: {nome}")
+                for notification in notificacoes:
                     st.write(notification)
             else:
-                st.write(f"Objeto Associado: {observer.name} - Nenhuma notificação ainda.")
-    else:
-        st.info("Nenhuma notificação para exibir.")
+                st.write(f"Objeto Associado: {nome} - Nenhuma notificação ainda.")
+
+    notificacoes_observadores()
 
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -227,18 +227,17 @@ elif page == "Visualização":
     st.title("Visualização da Temperatura")
     st.header("Monitoramento em Tempo Real")
 
-    # Encontrar o dispositivo A1-AI-TIT01
-    dispositivo = next((d for d in dispositivos_criados if d.tag == "A1-AI-TIT01"), None)
-
-    if dispositivo and isinstance(dispositivo, AIDevicePublisher):
-        current_value = f"{dispositivo.value} {dispositivo.unit}"
+    @st.fragment(run_every=INTERVALO_ATUALIZACAO)
+    def painel_temperatura(tag):
+        leitura = backend.leitura(tag)
+        current_value = f"{leitura['value']} {leitura['unit']}"
 
         # Exibir a temperatura usando classes CSS do styles.css
         st.markdown(
             f"""
             <div class="temperature-container">
                 <div class="temperature-card">
-                    <h2 class="temperature-tag">{dispositivo.tag}</h2>
+                    <h2 class="temperature-tag">{tag}</h2>
                     <p class="temperature-label">Temperatura Atual:</p>
                     <h1 class="temperature-value">{current_value}</h1>
                 </div>
@@ -246,8 +245,31 @@ elif page == "Visualização":
             """,
             unsafe_allow_html=True
         )
+
+        # Tendência a partir do buffer circular, reamostrada para no máximo 300 pontos.
+        # O DataFrame só é refeito quando chegam amostras novas (o total de amostras mudou)
+        grafico = st.session_state.get('grafico_tendencia')
+        tendencia = backend.tendencia(tag, 300, grafico[0] if grafico is not None else None)
+        if tendencia is not None:
+            total, timestamps, valores = tendencia
+            if grafico is None or grafico[0] != total:
+                grafico = (total, pd.DataFrame({tag: valores}, index=pd.to_datetime(timestamps, unit='s')))
+                st.session_state['grafico_tendencia'] = grafico
+            st.subheader("Tendência")
+            st.line_chart(grafico[1], height=300)
+
+        # Métricas do motor de ingestão único, compartilhado por todas as sessões
+        metricas = backend.metricas()
+        latencia = metricas.get('latencia')
+        if latencia and latencia['count']:
+            st.caption(f"Leituras despachadas: {metricas['linhas_despachadas']} | "
+                       f"latência p50 {latencia['p50_ms']:.2f} ms, p95 {latencia['p95_ms']:.2f} ms, "
+                       f"máx {latencia['max_ms']:.2f} ms | pendentes: {metricas['pendentes']}")
+
+    if backend.leitura(DISPOSITIVO_VISUALIZACAO) is not None:
+        painel_temperatura(DISPOSITIVO_VISUALIZACAO)
     else:
-        st.error("Dispositivo A1-AI-TIT01 não encontrado.")
+        st.error(f"Dispositivo {DISPOSITIVO_VISUALIZACAO} não encontrado.")
 
 else:
     st.error("Página não encontrada.")
@@ -4,6 +4,41 @@
 const int sensorPin = A0;
 const float offset = -10.0;
 
+// 0 = texto ("%.2f\n"); 1 = quadro binário (src/framing.py, BROKER_SERIAL_PROTOCOL=binario no broker)
+#define PROTOCOLO_BINARIO 0
+
+const uint8_t SYNC = 0xA5;
+const uint8_t TIPO_FLOAT32 = 0x01;
+const uint8_t CANAL_TEMPERATURA = 0;  // Canal 0 = A1-AI-TIT01
+
+uint8_t sequencia[256] = {0};  // Uma sequência por canal (0-255), para o broker detectar quadros perdidos
+
+// CRC-16/CCITT (poli 0x1021, inicial 0xFFFF), o mesmo de binascii.crc_hqx
+uint16_t crc16(const uint8_t *dados, size_t tamanho) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < tamanho; i++) {
+    crc ^= (uint16_t)dados[i] << 8;
+    for (uint8_t b = 0; b < 8; b++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// SYNC | TIPO | CANAL | SEQ | float32 (LE) | CRC-16 (LE) sobre TIPO..valor
+void enviarQuadro(uint8_t canal, float valor) {
+  uint8_t quadro[10];
+  quadro[0] = SYNC;
+  quadro[1] = TIPO_FLOAT32;
+  quadro[2] = canal;
+  quadro[3] = sequencia[canal]++;
+  memcpy(&quadro[4], &valor, sizeof(float));  // ESP8266 é little-endian
+  uint16_t crc = crc16(&quadro[1], 7);
+  quadro[8] = crc & 0xFF;
+  quadro[9] = crc >> 8;
+  Serial.write(quadro, sizeof(quadro));
+}
+
 void setup() {
   Serial.begin(115200);
   delay(1000);
@@ -17,8 +52,11 @@ void loop() {
 
   temperatura += offset;
 
+#if PROTOCOLO_BINARIO
+  enviarQuadro(CANAL_TEMPERATURA, temperatura);
+#else
   Serial.printf("%.2f\n", temperatura);
+#endif
 
   delay(500);
 }
-
@@ -0,0 +1,274 @@
+# src/backend.py
+
+import asyncio
+import logging
+import math
+import os
+import threading
+
+from .devices import AIDevicePublisher
+from .ingestion import IngestionEngine
+from .main import processar_e_criar_dispositivos
+from .observer import GenericSubscriber
+from .render_cache import AssociationTable
+from .routing import DISPOSITIVO_PADRAO
+from .topics import TopicTrie, e_padrao, filtrar
+from .transport import SerialTransport
+
+logger = logging.getLogger(__name__)
+
+DISPOSITIVO_VISUALIZACAO = DISPOSITIVO_PADRAO  # Ponto do sensor de temperatura (canal 0 do firmware)
+
+
+def _sem_nan(valores):
+    # NaN (leitura inválida ou bloco sem leituras) não existe em JSON: vira None
+    return [None if v != v else v for v in valores]
+
+
+def valor_json(valor):
+    # NaN/inf não existem em JSON; ex.: célula 'Unit' vazia na planilha chega como NaN
+    return None if isinstance(valor, float) and not math.isfinite(valor) else valor
+
+
+def preparar_dispositivos(dispositivos_criados, deadband=None, heartbeat=None):
+    # Configuração comum ao Streamlit e ao daemon, aplicada uma vez após ler a lista de I/O
+    # Histórico limitado para o gráfico de tendência (~10 min a 2 leituras/s)
+    dispositivo_visualizacao = dispositivos_criados.get(DISPOSITIVO_VISUALIZACAO)
+    if isinstance(dispositivo_visualizacao, AIDevicePublisher):
+        dispositivo_visualizacao.enable_history(1200)
+    # Banda morta opcional (desligada por padrão): % do span e/ou heartbeat em segundos.
+    # Filtra só os observadores locais; o fan-out pub/sub se inscreve com filtrado=False
+    if deadband is None:
+        deadband = os.environ.get('BROKER_DEADBAND_PERCENT')
+    if heartbeat is None:
+        heartbeat = os.environ.get('BROKER_DEADBAND_HEARTBEAT')
+    percentual = float(deadband) if deadband not in (None, '') else None
+    intervalo = float(heartbeat) if heartbeat not in (None, '') else None
+    if percentual or intervalo:
+        for dispositivo_ai in dispositivos_criados.by_type("AI"):
+            dispositivo_ai.set_deadband(percentual=percentual or None, heartbeat=intervalo or None)
+    return dispositivos_criados
+
+
+##################### ASSINATURA POR PADRÃO DE TAG (A1-AI-*, A1-#, area:1) ###################################################
+
+class PatternSubscription:
+    # Ocupa o lugar do dispositivo na linha da tabela de associações: um observador em todos os pontos que casam
+    __slots__ = ('padrao', 'observer', 'dispositivos', 'chave')
+
+    def __init__(self, padrao, observer):
+        self.padrao = padrao
+        self.observer = observer
+        self.dispositivos = []
+        self.chave = None  # Chave na TopicTrie do SubscriberHub
+
+    def attach(self, dispositivo):
+        dispositivo.attach(self.observer)
+        self.dispositivos.append(dispositivo)
+
+    def detach(self, observer):
+        for dispositivo in self.dispositivos:
+            try:
+                dispositivo.detach(observer)
+            except ValueError:  # Ponto já removido do registro e do observador
+                pass
+        self.dispositivos.clear()
+
+    @property
+    def value(self):
+        # Célula "Valor em Tempo Real": última leitura recebida entre os pontos que casam
+        registros = self.observer.notifications.registros
+        if not registros:
+            return f"{len(self.dispositivos)} pontos"
+        _, tag, valor, _ = registros[-1]
+        return f"{tag} = {valor}"
+
+    @property
+    def unit(self):
+        registros = self.observer.notifications.registros
+        return registros[-1][3] if registros else ''
+
+
+##################### ASSOCIAÇÕES COMPARTILHADAS ENTRE SESSÕES ###############################################################
+
+class SubscriberHub:
+    def __init__(self, registry):
+        self.registry = registry
+        self.associacoes = AssociationTable()
+        # Várias sessões do Streamlit leem e alteram a mesma tabela, cada uma em sua thread
+        self._lock = threading.Lock()
+        # Padrão -> PatternSubscription; pontos incluídos depois entram nas assinaturas que casarem
+        self._padroes = TopicTrie()
+        registry.ao_adicionar(self._novo_dispositivo)
+
+    def existe(self, tag, nome):
+        with self._lock:
+            return self.associacoes.existe(tag, nome)
+
+    def associar(self, tag, nome):
+        if not nome or not nome.strip():  # Mesma regra da página Broker, valendo também para a API do daemon
+            raise ValueError("Informe o nome do objeto associado")
+        if e_padrao(tag):
+            return self._associar_padrao(tag, nome)
+        dispositivo = self.registry.get(tag)
+        if not isinstance(dispositivo, AIDevicePublisher):
+            raise ValueError(f"Dispositivo {tag} não encontrado ou inválido")
+        with self._lock:
+            if self.associacoes.existe(tag, nome):
+                raise ValueError(f"Associação entre {tag} e {nome} já existe")
+            observer = GenericSubscriber(nome)
+            dispositivo.attach(observer)
+            return self.associacoes.adicionar(tag, nome, observer, dispositivo)
+
+    def _associar_padrao(self, padrao, nome):
+        with self._lock:
+            if self.associacoes.existe(padrao, nome):
+                raise ValueError(f"Associação entre {padrao} e {nome} já existe")
+            observer = GenericSubscriber(nome)
+            assinatura = PatternSubscription(padrao, observer)
+            assinatura.chave = self._padroes.adicionar(padrao, assinatura)  # ValueError se o padrão for inválido
+            for dispositivo in filtrar(padrao, self.registry.by_type("AI")):
+                assinatura.attach(dispositivo)
+            return self.associacoes.adicionar(padrao, nome, observer, assinatura)
+
+    def _novo_dispositivo(self, dispositivo):
+        if dispositivo.tipo != "AI":
+            return
+        with self._lock:
+            for assinatura in self._padroes.casar(dispositivo.tag, dispositivo.area):
+                assinatura.attach(dispositivo)
+
+    def desassociar(self, tag, nome):
+        with self._lock:
+            try:
+                linha = self.associacoes.remover(tag, nome)
+            except KeyError:
+                raise ValueError(f"Associação entre {tag} e {nome} não existe") from None
+            if isinstance(linha.device, PatternSubscription):
+                self._padroes.remover(linha.device.chave)
+        if linha.device is not None:
+            linha.device.detach(linha.observer)
+        return linha
+
+    def html(self):
+        with self._lock:
+            return self.associacoes.html()
+
+    def linhas(self):
+        # Cópia: a sessão itera sem segurar o lock enquanto outra sessão altera a tabela
+        with self._lock:
+            return list(self.associacoes)
+
+    def notificacoes(self, n=5):
+        # [(nome do objeto associado, últimas n notificações formatadas)]
+        return [(linha.subscriber, linha.observer.notifications.ultimas(n)) for linha in self.linhas()]
+
+    def resumo(self, n=5):
+        # Representação serializável (API HTTP do daemon)
+        return [
+            {
+                'dispositivo': linha.dispositivo,
+                'subscriber': linha.subscriber,
+                'value': valor_json(linha.device.value) if linha.device is not None else None,
+                'unit': valor_json(linha.device.unit) if linha.device is not None else None,
+                'notificacoes': linha.observer.notifications.ultimas(n),
+            }
+            for linha in self.linhas()
+        ]
+
+    def __len__(self):
+        return len(self.associacoes)
+
+
+##################### BACKEND ÚNICO POR PROCESSO (REGISTRO + INGESTÃO + ASSOCIAÇÕES) #########################################
+
+class BrokerBackend:
+    def __init__(self, dispositivos_criados=None, fontes=None, protocolo=None):
+        # Planilha lida e porta serial aberta uma única vez, independente do número de sessões
+        if dispositivos_criados is None:
+            dispositivos_criados = processar_e_criar_dispositivos()
+        self.dispositivos = dispositivos_criados
+        self.fontes = fontes
+        self.protocolo = protocolo or os.environ.get('BROKER_SERIAL_PROTOCOL', 'texto')
+        self.hub = SubscriberHub(dispositivos_criados)
+        self.engine = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def iniciar(self):
+        if self._thread is not None:
+            return self
+        fontes = self.fontes if self.fontes is not None else [SerialTransport()]
+        self.engine = IngestionEngine(self.dispositivos, fontes, protocolo=self.protocolo)
+        self._thread = threading.Thread(target=self._executar, name='ingestao', daemon=True)
+        self._thread.start()
+        return self
+
+    def _executar(self):
+        try:
+            asyncio.run(self.engine.executar(self._stop_event))
+        except Exception:
+            logger.exception("Ingestão encerrada com erro")
+
+    @property
+    def ativo(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def parar(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def metricas(self):
+        if self.engine is None:
+            return {}
+        return self.engine.metricas()
+
+    ##################### CONSULTAS (MESMA INTERFACE DO CLIENTE REMOTO EM src/broker_client.py) #############################
+
+    def tags(self, tipo="AI"):
+        return [dispositivo.tag for dispositivo in self.dispositivos.by_type(tipo)]
+
+    def leitura(self, tag):
+        dispositivo = self.dispositivos.get(tag)
+        if not isinstance(dispositivo, AIDevicePublisher):
+            return None
+        return {'tag': tag, 'value': valor_json(dispositivo.value), 'unit': valor_json(dispositivo.unit)}
+
+    def tendencia(self, tag, pontos=300, total_conhecido=None):
+        # (total de amostras, timestamps, valores); sem amostras novas desde total_conhecido,
+        # devolve (total, None, None) e o chamador reaproveita o gráfico que já tem
+        historico = getattr(self.dispositivos.get(tag), 'historico', None)
+        if historico is None or not len(historico):
+            return None
+        total = historico.total
+        if total == total_conhecido:
+            return total, None, None
+        timestamps, valores = historico.reamostrar(pontos)
+        return total, timestamps.tolist(), _sem_nan(valores.tolist())
+
+    def snapshot(self):
+        # Valores atuais de todos os pontos AI a partir da tabela colunar (uma cópia, sem laço sobre observadores)
+        from .value_table import QUALIDADE_BOA
+
+        tabela = self.dispositivos.value_table
+        if tabela is None:
+            return []
+        colunas = tabela.snapshot()
+        return [
+            {
+                'tag': tag,
+                'value': valor_json(valor) if qualidade == QUALIDADE_BOA else None,
+                'unit': valor_json(getattr(self.dispositivos.get(tag), 'unit', None)),  # Ponto removido: só o índice permanece
+                'timestamp': timestamp or None,
+                'quality': qualidade,
+            }
+            for tag, valor, timestamp, qualidade in zip(colunas['tag'], colunas['value'].tolist(),
+                                                        colunas['timestamp'].tolist(), colunas['quality'].tolist())
+        ]
+
+    def __len__(self):
+        return len(self.dispositivos)
+
+    def __repr__(self):
+        return f"BrokerBackend(dispositivos={len(self.dispositivos)}, ativo={self.ativo})"
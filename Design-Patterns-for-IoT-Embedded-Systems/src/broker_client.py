@@ -0,0 +1,192 @@
+# src/broker_client.py
+
+import json
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+from .render_cache import AssociationTable
+
+TTL_PADRAO = 0.25  # Respostas GET reaproveitadas por todas as sessões dentro dessa janela
+TIMEOUT_PADRAO = 2.0
+
+
+class _Leitura:
+    # Substitui o dispositivo nas linhas do AssociationTable espelhado (só value e unit são lidos)
+    __slots__ = ('value', 'unit')
+
+    def __init__(self, value, unit):
+        self.value = value
+        self.unit = unit
+
+
+##################### CLIENTE HTTP DO DAEMON (src/brokerd.py) ################################################################
+
+class BrokerClient:
+    def __init__(self, url, ttl=TTL_PADRAO, timeout=TIMEOUT_PADRAO):
+        self.url = url.rstrip('/')
+        self.ttl = ttl
+        self.timeout = timeout
+        self._cache = {}  # caminho -> (instante, dados)
+        self._lock = threading.Lock()
+
+    def requisitar(self, metodo, caminho, dados=None):
+        corpo = None if dados is None else json.dumps(dados).encode('utf-8')
+        requisicao = Request(self.url + caminho, data=corpo, method=metodo,
+                             headers={'Content-Type': 'application/json'} if corpo is not None else {})
+        try:
+            with urlopen(requisicao, timeout=self.timeout) as resposta:
+                return json.loads(resposta.read())
+        except HTTPError as e:
+            # Erros da API (400/404) chegam como ValueError, igual ao SubscriberHub local
+            try:
+                mensagem = json.loads(e.read()).get('erro', e.reason)
+            except ValueError:
+                mensagem = e.reason
+            raise ValueError(mensagem) from None
+
+    def get(self, caminho, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        agora = time.monotonic()
+        with self._lock:
+            em_cache = self._cache.get(caminho)
+        if em_cache is not None and agora - em_cache[0] < ttl:
+            return em_cache[1]
+        dados = self.requisitar('GET', caminho)
+        with self._lock:
+            self._cache[caminho] = (agora, dados)
+        return dados
+
+    def invalidar(self):
+        with self._lock:
+            self._cache.clear()
+
+
+##################### ASSOCIAÇÕES REMOTAS (MESMA INTERFACE DO SubscriberHub) #################################################
+
+class RemoteHub:
+    def __init__(self, cliente):
+        self._cliente = cliente
+        # Espelho local: o HTML das linhas é reaproveitado e só as células de valor alteradas são refeitas
+        self.associacoes = AssociationTable()
+        self._chaves = []
+        self._notificacoes = []
+        self._lock = threading.Lock()
+
+    def _sincronizar(self):
+        dados = self._cliente.get('/associacoes')
+        chaves = [(a['dispositivo'], a['subscriber']) for a in dados]
+        with self._lock:
+            if chaves != self._chaves:
+                self.associacoes = AssociationTable()
+                for a in dados:
+                    self.associacoes.adicionar(a['dispositivo'], a['subscriber'], None, _Leitura(a['value'], a['unit']))
+                self._chaves = chaves
+            else:
+                for linha, a in zip(self.associacoes, dados):
+                    linha.device.value = a['value']
+                    linha.device.unit = a['unit']
+            self._notificacoes = [(a['subscriber'], a['notificacoes']) for a in dados]
+
+    def existe(self, tag, nome):
+        self._sincronizar()
+        return (tag, nome) in self._chaves
+
+    def associar(self, tag, nome):
+        resposta = self._cliente.requisitar('POST', '/associacoes', {'dispositivo': tag, 'subscriber': nome})
+        self._cliente.invalidar()
+        return resposta
+
+    def desassociar(self, tag, nome):
+        params = urlencode({'dispositivo': tag, 'subscriber': nome}, quote_via=quote)
+        resposta = self._cliente.requisitar('DELETE', '/associacoes?' + params)
+        self._cliente.invalidar()
+        return resposta
+
+    def html(self):
+        self._sincronizar()
+        with self._lock:
+            return self.associacoes.html()
+
+    def linhas(self):
+        self._sincronizar()
+        with self._lock:
+            return list(self.associacoes)
+
+    def notificacoes(self, n=5):
+        self._sincronizar()
+        return [(nome, mensagens[-n:] if n > 0 else []) for nome, mensagens in self._notificacoes]
+
+    def __len__(self):
+        self._sincronizar()
+        return len(self._chaves)
+
+
+##################### BACKEND REMOTO (MESMA INTERFACE DO BrokerBackend) ######################################################
+
+class RemoteBackend:
+    def __init__(self, url, ttl=TTL_PADRAO, timeout=TIMEOUT_PADRAO):
+        self.cliente = BrokerClient(url, ttl, timeout)
+        self.hub = RemoteHub(self.cliente)
+        self._tags = {}
+        # (tag, pontos) -> (instante, última série completa): uma entrada por gráfico, não por total de amostras
+        self._tendencias = {}
+        self._lock = threading.Lock()
+
+    def verificar(self):
+        # Falha cedo (URLError/OSError) se o daemon não estiver acessível
+        return self.cliente.requisitar('GET', '/saude')
+
+    @property
+    def ativo(self):
+        return self.cliente.get('/saude').get('ativo', False)
+
+    def tags(self, tipo="AI"):
+        # A lista de I/O não muda enquanto o daemon roda: busca uma vez por tipo
+        if tipo not in self._tags:
+            self._tags[tipo] = [d['tag'] for d in self.cliente.requisitar('GET', '/dispositivos?' + urlencode({'tipo': tipo}))]
+        return self._tags[tipo]
+
+    def leitura(self, tag):
+        for ponto in self.snapshot():
+            if ponto['tag'] == tag:
+                return {'tag': tag, 'value': ponto['value'], 'unit': ponto['unit']}
+        return None
+
+    def tendencia(self, tag, pontos=300, total_conhecido=None):
+        chave = (tag, pontos)
+        agora = time.monotonic()
+        with self._lock:
+            em_cache = self._tendencias.get(chave)
+        if em_cache is None or agora - em_cache[0] >= self.cliente.ttl:
+            serie = em_cache[1] if em_cache is not None else None
+            params = {'tag': tag, 'pontos': pontos}
+            if serie is not None:
+                params['total'] = serie['total']  # O daemon só reenvia os pontos se houver amostras novas
+            dados = self.cliente.requisitar('GET', '/historico?' + urlencode(params, quote_via=quote))
+            if dados is not None and dados['values'] is None:
+                dados = serie  # Sem amostras novas: a série guardada continua válida
+            em_cache = (agora, dados)
+            with self._lock:
+                self._tendencias[chave] = em_cache
+
+        serie = em_cache[1]
+        if serie is None:
+            return None
+        if serie['total'] == total_conhecido:
+            return serie['total'], None, None
+        return serie['total'], serie['timestamps'], serie['values']
+
+    def snapshot(self):
+        return self.cliente.get('/snapshot')
+
+    def metricas(self):
+        return self.cliente.get('/metricas')
+
+    def __len__(self):
+        return self.cliente.get('/saude').get('dispositivos', 0)
+
+    def __repr__(self):
+        return f"RemoteBackend(url={self.cliente.url})"
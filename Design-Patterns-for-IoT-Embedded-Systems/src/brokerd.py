@@ -0,0 +1,185 @@
+# src/brokerd.py
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .backend import BrokerBackend, preparar_dispositivos, valor_json
+from .log_config import configurar_logging
+from .pubsub import PORTA_PADRAO as PORTA_PUBSUB, PubSubServer
+
+logger = logging.getLogger('src.brokerd')  # Nome fixo: com python -m src.brokerd, __name__ seria '__main__'
+
+HOST_PADRAO = '127.0.0.1'  # Somente local: a API não tem autenticação
+PORTA_PADRAO = 8765
+TAMANHO_MAX_CORPO = 4096
+
+
+##################### API HTTP DE SNAPSHOT ###################################################################################
+#
+#   GET    /saude                     -> {"ativo": bool, "dispositivos": n}
+#   GET    /dispositivos[?tipo=AI]    -> [{"tag", "area", "descricao", "tipo", "unit"}]
+#   GET    /snapshot                  -> [{"tag", "value", "unit", "timestamp", "quality"}]
+#   GET    /historico?tag=&pontos=&total=
+#   GET    /metricas                  -> IngestionEngine.metricas()
+#   GET    /associacoes               -> [{"dispositivo", "subscriber", "value", "unit", "notificacoes"}]
+#   POST   /associacoes               <- {"dispositivo", "subscriber"}
+#   DELETE /associacoes?dispositivo=&subscriber=
+
+class BrokerRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'brokerd/1.0'
+    # Rota -> método; os parâmetros da query string viram argumentos nomeados do método
+    ROTAS_GET = {
+        '/saude': '_saude',
+        '/dispositivos': '_dispositivos',
+        '/snapshot': '_snapshot',
+        '/historico': '_historico',
+        '/metricas': '_metricas',
+        '/associacoes': '_associacoes',
+    }
+
+    @property
+    def backend(self):
+        return self.server.backend
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        nome = self.ROTAS_GET.get(url.path.rstrip('/'))
+        if nome is None:
+            return self._erro(404, f"Rota desconhecida: {url.path}")
+        params = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        try:
+            self._responder(200, getattr(self, nome)(**params))
+        except (TypeError, ValueError) as e:  # Parâmetro ausente, desconhecido ou não numérico
+            self._erro(400, str(e))
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip('/') != '/associacoes':
+            return self._erro(404, f"Rota desconhecida: {self.path}")
+        try:
+            tamanho = int(self.headers.get('Content-Length', 0))
+            if not 0 < tamanho <= TAMANHO_MAX_CORPO:
+                raise ValueError("Corpo da requisição ausente ou grande demais")
+            corpo = json.loads(self.rfile.read(tamanho))
+            linha = self.backend.hub.associar(str(corpo['dispositivo']), str(corpo['subscriber']).strip())
+        except (KeyError, TypeError, ValueError) as e:  # json.JSONDecodeError é um ValueError
+            return self._erro(400, str(e))
+        self._responder(201, {'dispositivo': linha.dispositivo, 'subscriber': linha.subscriber})
+
+    def do_DELETE(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/associacoes':
+            return self._erro(404, f"Rota desconhecida: {self.path}")
+        params = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        if 'dispositivo' not in params or 'subscriber' not in params:
+            return self._erro(400, "Parâmetros dispositivo e subscriber são obrigatórios")
+        try:
+            linha = self.backend.hub.desassociar(params['dispositivo'], params['subscriber'])
+        except ValueError as e:
+            return self._erro(404, str(e))
+        self._responder(200, {'dispositivo': linha.dispositivo, 'subscriber': linha.subscriber})
+
+    def _saude(self):
+        return {'ativo': self.backend.ativo, 'dispositivos': len(self.backend)}
+
+    def _dispositivos(self, tipo=None):
+        dispositivos = self.backend.dispositivos
+        selecionados = dispositivos.by_type(tipo) if tipo else dispositivos
+        # Células vazias da planilha chegam como NaN em qualquer coluna (Descrição, Area, Unit)
+        campos = ('tag', 'area', 'descricao', 'tipo', 'unit')
+        return [{campo: valor_json(getattr(d, campo, None)) for campo in campos} for d in selecionados]
+
+    def _snapshot(self):
+        return self.backend.snapshot()
+
+    def _metricas(self):
+        metricas = dict(self.backend.metricas())
+        if self.server.pubsub is not None:
+            metricas['pubsub'] = self.server.pubsub.metricas()
+        return metricas
+
+    def _associacoes(self, n='5'):
+        return self.backend.hub.resumo(int(n))
+
+    def _historico(self, tag, pontos='300', total=None):
+        tendencia = self.backend.tendencia(tag, int(pontos), None if total is None else int(total))
+        if tendencia is None:
+            return None
+        total, timestamps, valores = tendencia
+        return {'total': total, 'timestamps': timestamps, 'values': valores}
+
+    def _responder(self, status, dados):
+        # allow_nan=False: um NaN esquecido vira erro aqui em vez de JSON inválido para o cliente
+        corpo = json.dumps(dados, ensure_ascii=False, allow_nan=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _erro(self, status, mensagem):
+        self._responder(status, {'erro': mensagem})
+
+    def log_message(self, formato, *args):
+        # Requisições vão para o logging do projeto (DEBUG), não para stderr
+        logger.debug("%s %s", self.address_string(), formato % args)
+
+
+def criar_servidor(backend, host=HOST_PADRAO, porta=PORTA_PADRAO, pubsub=None):
+    # Uma thread por requisição: leituras lentas de um cliente não bloqueiam os demais nem a ingestão
+    servidor = ThreadingHTTPServer((host, porta), BrokerRequestHandler)
+    servidor.daemon_threads = True
+    servidor.backend = backend
+    servidor.pubsub = pubsub  # Só para expor as métricas em /metricas
+    return servidor
+
+
+##################### CLI: python -m src.brokerd [--host H] [--port P] [--pubsub-port P | --no-pubsub] ####################
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Broker IoT sem interface: ingestão, observadores e API HTTP de snapshot.")
+    parser.add_argument('--host', default=os.environ.get('BROKER_DAEMON_HOST', HOST_PADRAO))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('BROKER_DAEMON_PORT', PORTA_PADRAO)))
+    parser.add_argument('--pubsub-port', type=int, default=int(os.environ.get('BROKER_PUBSUB_PORT', PORTA_PUBSUB)),
+                        help="Porta TCP de distribuição das leituras por padrão de TAG (JSON por linha)")
+    parser.add_argument('--no-pubsub', action='store_true', help="Não abre a porta de pub/sub")
+    parser.add_argument('--deadband', type=float, default=None,
+                        help="Banda morta em %% do span para os observadores locais (padrão: BROKER_DEADBAND_PERCENT ou desligada)")
+    parser.add_argument('--heartbeat', type=float, default=None,
+                        help="Intervalo máximo (s) sem notificar com a banda morta (padrão: BROKER_DEADBAND_HEARTBEAT)")
+    args = parser.parse_args(argv)
+
+    configurar_logging()
+    backend = BrokerBackend()
+    if not backend.dispositivos:
+        logger.error("Nenhum dispositivo foi criado. Verifique o arquivo Excel.")
+        return 1
+    preparar_dispositivos(backend.dispositivos, args.deadband, args.heartbeat)
+    # Pub/sub antes da ingestão: o observador já está inscrito quando chega a primeira leitura
+    pubsub = None if args.no_pubsub else PubSubServer(backend.dispositivos, args.host, args.pubsub_port).iniciar()
+    backend.iniciar()
+
+    servidor = criar_servidor(backend, args.host, args.port, pubsub)
+    # shutdown() espera o fim de serve_forever(): precisa ser chamado de outra thread
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=servidor.shutdown, daemon=True).start())
+    logger.info("API de snapshot em http://%s:%d", *servidor.server_address[:2])
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        backend.parar()
+        if pubsub is not None:
+            pubsub.parar()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,9 @@ class AIDeviceBuilder:
         self._range_min = None
         self._range_max = None
         self._unit = None
+        self._taxa_max = None
+        self._porta = None
+        self._canal = None
 
     def set_tag(self, tag):
         self._tag = tag
@@ -38,5 +41,25 @@ class AIDeviceBuilder:
         self._unit = unit
         return self
 
+    def set_taxa_max(self, taxa_max):
+        self._taxa_max = taxa_max
+        return self
+
+    def set_porta(self, porta):
+        self._porta = porta
+        return self
+
+    def set_canal(self, canal):
+        self._canal = canal
+        return self
+
     def build(self):
-        return AIDevicePublisher(self._tag, self._area, self._descricao, self._range_min, self._range_max, self._unit)
+        dispositivo = AIDevicePublisher(self._tag, self._area, self._descricao, self._range_min, self._range_max, self._unit)
+        # Atributos opcionais da lista de I/O, fora do construtor básico
+        if self._taxa_max is not None:
+            dispositivo.taxa_max = self._taxa_max
+        if self._porta is not None:
+            dispositivo.porta = self._porta
+        if self._canal is not None:
+            dispositivo.canal = self._canal
+        return dispositivo
@@ -1,9 +1,23 @@
 # src/devices.py
 
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# attach/detach são raros: um lock compartilhado evita um Lock por dispositivo.
+# notify() nunca o adquire enquanto a tupla de inscritos estiver atualizada.
+_subscribers_lock = threading.Lock()
+_inscricoes = itertools.count()  # Chave de cada inscrição (o mesmo observador pode se inscrever mais de uma vez)
+
 
 ##################### Superclasse Device ###################################################################################
 
 class Device:
+    __slots__ = ('tag', 'area', 'descricao', 'tipo')  # Sem __dict__ por instância
+
     def __init__(self, tag, area, descricao, tipo):
         self.tag = tag
         self.area = area
@@ -14,31 +28,291 @@ class Device:
         return f"Device(tag={self.tag}, area={self.area}, descricao={self.descricao}, tipo={self.tipo})"
 
 
+##################### Lote de notificações ###################################################################################
+
+class NotificationBatch:
+    __slots__ = ('tamanho_max', 'janela', 'valores', 'inicio')
+
+    def __init__(self, tamanho_max=None, janela=None):
+        if tamanho_max is None and janela is None:
+            raise ValueError("Informe tamanho_max e/ou janela para o lote")
+        self.tamanho_max = tamanho_max  # Quantidade de leituras por lote
+        self.janela = janela  # Tempo máximo (s) entre a primeira leitura e a entrega
+        self.valores = []
+        self.inicio = None
+
+    def adicionar(self, valor, agora):
+        # Retorna True quando o lote deve ser entregue
+        if not self.valores:
+            self.inicio = agora
+        self.valores.append(valor)
+        return self.vencido(agora)
+
+    def vencido(self, agora):
+        if not self.valores:
+            return False
+        if self.tamanho_max is not None and len(self.valores) >= self.tamanho_max:
+            return True
+        return self.janela is not None and agora - self.inicio >= self.janela
+
+    def drenar(self):
+        valores, self.valores = self.valores, []
+        self.inicio = None
+        return valores
+
+
+##################### Banda morta e heartbeat ################################################################################
+
+class Deadband:
+    __slots__ = ('banda', 'heartbeat', 'ultimo_valor', 'ultimo_instante', 'suprimidas')
+
+    def __init__(self, banda=0.0, heartbeat=None):
+        if banda < 0:
+            raise ValueError("A banda morta não pode ser negativa")
+        if heartbeat is not None and heartbeat <= 0:
+            raise ValueError("O intervalo de heartbeat deve ser positivo")
+        self.banda = banda  # Variação mínima (na unidade do ponto) em relação ao último valor notificado
+        self.heartbeat = heartbeat  # Tempo máximo (s) sem notificar enquanto chegam leituras
+        self.ultimo_valor = None
+        self.ultimo_instante = None
+        self.suprimidas = 0
+
+    def deve_notificar(self, valor, agora):
+        # Compara com o último valor *notificado*: uma deriva lenta acaba notificando
+        if (self.ultimo_instante is None
+                or (valor is None) != (self.ultimo_valor is None)
+                or (valor is not None and abs(valor - self.ultimo_valor) > self.banda)
+                or (self.heartbeat is not None and agora - self.ultimo_instante >= self.heartbeat)):
+            self.ultimo_valor = valor
+            self.ultimo_instante = agora
+            return True
+        self.suprimidas += 1
+        return False
+
+
+##################### Estado opcional do AI Device ##########################################################################
+
+class _AIExtras:
+    # Tudo o que a maioria dos pontos não usa fica aqui, alocado só no primeiro uso:
+    # um ponto sem rota, inscritos, tabela, histórico, lote ou banda morta paga um único slot
+    __slots__ = ('taxa_max', 'porta', 'canal', 'inscricoes', 'chaves_por_id', 'sem_filtro',
+                 'value_table', 'value_index', 'historico', 'batch', 'deadband')
+
+    def __init__(self):
+        self.taxa_max = None  # Variação máxima aceita por segundo (coluna opcional 'Rate Max'); None = sem limite
+        self.porta = None  # Rota (colunas opcionais 'Port'/'Channel'); porta None = qualquer porta
+        self.canal = None
+        self.inscricoes = None  # {chave: observador} em ordem de inscrição
+        self.chaves_por_id = None  # {id(observador): [chaves]} para detach O(1) por identidade
+        self.sem_filtro = ()  # Inscritos com filtrado=False: recebem também as leituras suprimidas pela banda morta
+        self.value_table = None  # Tabela colunar compartilhada (src/value_table.py)
+        self.value_index = None
+        self.historico = None  # Buffer circular (src/history.py), habilitado por enable_history
+        self.batch = None  # Lote de notificações, habilitado por set_batch
+        self.deadband = None  # Filtro de notificações, habilitado por set_deadband
+
+
+def _extra(campo):
+    # Atributo público guardado em _AIExtras; ler não aloca, atribuir None a um ponto sem extras também não
+    def ler(self):
+        extras = self._extras
+        return None if extras is None else getattr(extras, campo)
+
+    def escrever(self, valor):
+        if valor is None and self._extras is None:
+            return
+        setattr(self._extras_alocar(), campo, valor)
+
+    return property(ler, escrever)
+
+
 ##################### Subclasse AI Device ###################################################################################
 
 class AIDevicePublisher(Device):
-    def __init__(self, tag, area, descricao, range_min, range_max, unit):
+    __slots__ = ('range_min', 'range_max', 'unit', 'value', '_subscribers', '_extras')
+
+    taxa_max = _extra('taxa_max')
+    porta = _extra('porta')
+    canal = _extra('canal')
+    historico = _extra('historico')
+
+    def __init__(self, tag, area, descricao, range_min, range_max, unit, taxa_max=None, porta=None, canal=None):
         super().__init__(tag, area, descricao, "AI")
         self.range_min = range_min
         self.range_max = range_max
         self.unit = unit
         self.value = None  # Valor atual
-        self.subscribers = []  # Lista de observadores #subscriber
+        self._subscribers = ()  # Tupla imutável lida por notify(); None = reconstruir após attach/detach
+        self._extras = None  # _AIExtras, criado só quando algum recurso opcional é usado
+        self.taxa_max = taxa_max
+        self.porta = porta
+        self.canal = canal
+
+    def _extras_alocar(self):
+        if self._extras is None:
+            self._extras = _AIExtras()
+        return self._extras
+
+    ##################### Inscritos (copy-on-write) ##########################################################################
 
-    def attach(self, subscriber):
-        self.subscribers.append(subscriber) # Adiciona observador
+    @property
+    def subscribers(self):
+        # Cópia: alterar a lista devolvida não afeta os inscritos, use attach/detach
+        return list(self._inscritos())
+
+    @subscribers.setter
+    def subscribers(self, subscribers):
+        with _subscribers_lock:
+            if self._extras is not None:
+                self._extras.inscricoes = None
+                self._extras.chaves_por_id = None
+                self._extras.sem_filtro = ()
+            for subscriber in subscribers:
+                self._inscrever(subscriber)
+            self._subscribers = None
+
+    def _inscrever(self, subscriber):
+        # Chamado com _subscribers_lock adquirido
+        extras = self._extras_alocar()
+        if extras.inscricoes is None:
+            extras.inscricoes = {}
+            extras.chaves_por_id = {}
+        chave = next(_inscricoes)
+        extras.inscricoes[chave] = subscriber
+        extras.chaves_por_id.setdefault(id(subscriber), []).append(chave)
+
+    def _inscritos(self):
+        # A tupla só é reconstruída na primeira notificação após attach/detach
+        subscribers = self._subscribers
+        if subscribers is None:
+            with _subscribers_lock:
+                if self._subscribers is None:
+                    inscricoes = self._extras.inscricoes if self._extras is not None else None
+                    self._subscribers = tuple(inscricoes.values()) if inscricoes else ()
+                subscribers = self._subscribers
+        return subscribers
+
+    def attach(self, subscriber, filtrado=True):
+        # filtrado=False: o observador recebe toda leitura, mesmo as que a banda morta suprime (ex.: fan-out pub/sub)
+        with _subscribers_lock:
+            self._inscrever(subscriber) # Adiciona observador
+            if not filtrado:
+                self._extras.sem_filtro += (subscriber,)
+            self._subscribers = None
 
     def detach(self, subscriber):
-        self.subscribers.remove(subscriber) # Remove observador
+        with _subscribers_lock:
+            extras = self._extras
+            chaves_por_id = extras.chaves_por_id if extras is not None else None
+            chaves = chaves_por_id.get(id(subscriber)) if chaves_por_id else None
+            if not chaves:
+                raise ValueError(f"{subscriber!r} não está inscrito em {self.tag}")
+            del extras.inscricoes[chaves.pop(0)] # Remove observador (a inscrição mais antiga, como list.remove)
+            if not chaves:
+                del chaves_por_id[id(subscriber)]
+            for i, inscrito in enumerate(extras.sem_filtro):
+                if inscrito is subscriber:
+                    extras.sem_filtro = extras.sem_filtro[:i] + extras.sem_filtro[i + 1:]
+                    break
+            self._subscribers = None
 
     def notify(self):
-        for subscriber in self.subscribers:
+        # Itera sobre a tupla vigente sem lock: attach/detach durante a notificação valem a partir da próxima
+        for subscriber in self._inscritos():
             subscriber.update(self)  # Notifica observadores
 
+    def notify_batch(self, values):
+        for subscriber in self._inscritos():
+            update_batch = getattr(subscriber, 'update_batch', None)
+            if update_batch is not None:
+                update_batch(self, values)  # Uma chamada por lote
+            else:
+                subscriber.update(self)  # Observadores sem suporte a lote recebem o último valor
+
+    def set_batch(self, tamanho_max=None, janela=None):
+        # Sem argumentos, entrega o que estiver pendente e volta a notificar a cada leitura
+        self.flush()
+        if tamanho_max is None and janela is None:
+            if self._extras is not None:
+                self._extras.batch = None
+        else:
+            self._extras_alocar().batch = NotificationBatch(tamanho_max, janela)
+
+    def flush(self):
+        batch = self._extras.batch if self._extras is not None else None
+        if batch is not None and batch.valores:
+            self.notify_batch(batch.drenar())
+
+    def flush_if_due(self, agora=None):
+        # Entrega lotes cuja janela venceu sem novas leituras (chamado periodicamente pela ingestão)
+        batch = self._extras.batch if self._extras is not None else None
+        if batch is not None and batch.vencido(time.monotonic() if agora is None else agora):
+            self.flush()
+
+    def set_deadband(self, absoluto=None, percentual=None, heartbeat=None):
+        # Banda = maior entre `absoluto` e `percentual`% do span (range_max - range_min).
+        # Sem argumentos, volta a notificar toda leitura; só com heartbeat, notifica mudanças de valor.
+        if absoluto is None and percentual is None and heartbeat is None:
+            if self._extras is not None:
+                self._extras.deadband = None
+            return None
+        banda = absoluto or 0.0
+        if percentual is not None:
+            span = self.span()
+            if span is None:
+                logger.warning("%s sem Range Min/Max numéricos: banda percentual ignorada", self.tag)
+            else:
+                banda = max(banda, span * percentual / 100)
+        deadband = self._extras_alocar().deadband = Deadband(banda, heartbeat)
+        return deadband
+
+    @property
+    def deadband(self):
+        return self._extras.deadband if self._extras is not None else None
+
+    def span(self):
+        try:
+            span = abs(float(self.range_max) - float(self.range_min))
+        except (TypeError, ValueError):
+            return None
+        return span if 0 < span < float('inf') else None  # NaN também cai aqui
+
+    def bind_value_table(self, tabela, indice):
+        if tabela is None and self._extras is None:
+            return
+        extras = self._extras_alocar()
+        extras.value_table = tabela
+        extras.value_index = indice
+
+    def enable_history(self, capacidade):
+        # Importação tardia: o numpy só é carregado para dispositivos com histórico
+        from .history import RingBuffer
+
+        historico = self._extras_alocar().historico = RingBuffer(capacidade)
+        return historico
+
     def update_value(self, new_value):
         self.value = new_value # Atualiza valor
-        print(f"Atualizando {self.tag} com valor {self.value} {self.unit}")
-        self.notify()  # Notifica os inscritos
+        logger.debug("Atualizando %s com valor %s %s", self.tag, self.value, self.unit)
+        extras = self._extras
+        if extras is None:
+            self.notify()  # Ponto sem tabela, histórico, banda morta nem lote
+            return
+        if extras.value_table is not None or extras.historico is not None:
+            agora = time.time()
+            if extras.value_table is not None:
+                extras.value_table.escrever(extras.value_index, new_value, agora)  # Espelha na tabela colunar
+            if extras.historico is not None:
+                extras.historico.append(new_value, agora)
+        if extras.deadband is not None and not extras.deadband.deve_notificar(new_value, time.monotonic()):
+            # Valor, tabela e histórico atualizados; só a notificação aos inscritos filtrados é suprimida
+            for subscriber in extras.sem_filtro:
+                subscriber.update(self)
+            return
+        if extras.batch is None:
+            self.notify()  # Notifica os inscritos
+        elif extras.batch.adicionar(new_value, time.monotonic()):
+            self.flush()  # Notifica os inscritos com o lote acumulado
 
     def __repr__(self):
         return (f"AIDevicePublisher(tag={self.tag}, area={self.area}, descricao={self.descricao}, "
@@ -49,6 +323,8 @@ class AIDevicePublisher(Device):
 ##################### Subclasse DO Device ###################################################################################
 
 class DODevice(Device):
+    __slots__ = ()
+
     def __init__(self, tag, area, descricao):
         super().__init__(tag, area, descricao, "DO")
 
@@ -0,0 +1,180 @@
+# src/dispatcher.py
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+# Política aplicada quando a fila de um observador está cheia
+DESCARTAR_ANTIGAS = 'drop_oldest'  # Descarta a leitura pendente mais antiga
+DESCARTAR_NOVAS = 'drop_newest'  # Rejeita a leitura que acabou de chegar
+COALESCER = 'coalesce'  # Uma leitura pendente por dispositivo: a mais recente vence
+POLITICAS = (DESCARTAR_ANTIGAS, DESCARTAR_NOVAS, COALESCER)
+
+TAMANHO_FILA = 64
+
+
+##################### Leitura congelada no momento da notificação ###########################################################
+
+class DeviceSnapshot:
+    # O observador roda depois, em outra thread: value é o da notificação, não o atual do dispositivo
+    __slots__ = ('device', 'value', 'timestamp')
+
+    def __init__(self, device, value, timestamp):
+        self.device = device
+        self.value = value
+        self.timestamp = timestamp
+
+    def __getattr__(self, nome):
+        return getattr(self.device, nome)  # tag, unit, area, ...
+
+    def __repr__(self):
+        return f"DeviceSnapshot(tag={self.device.tag}, value={self.value})"
+
+
+##################### Observador assíncrono (fila própria, limitada) ########################################################
+
+class AsyncSubscriber:
+    def __init__(self, subscriber, executor, tamanho_fila=TAMANHO_FILA, politica=DESCARTAR_ANTIGAS):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconhecida: {politica!r} (use uma de {POLITICAS})")
+        if tamanho_fila <= 0:
+            raise ValueError("O tamanho da fila deve ser positivo")
+        self.subscriber = subscriber
+        self.tamanho_fila = tamanho_fila
+        self.politica = politica
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._pendentes = {}  # Ordem de chegada; chave = id do dispositivo em COALESCER
+        self._sequencia = itertools.count()
+        self._agendado = False  # No máximo uma tarefa por observador: entrega em ordem, sem concorrência
+        self.latencia = LatencyStats()  # Da notificação até o fim de update() do observador
+        self.entregues = 0
+        self.descartadas = 0
+        self.coalescidas = 0
+        self.erros = 0
+
+    # Chamados na thread de ingestão: só enfileiram, nunca esperam pelo observador
+    def update(self, device):
+        self._enfileirar(device, None)
+
+    def update_batch(self, device, values):
+        self._enfileirar(device, list(values))
+
+    def _enfileirar(self, device, values):
+        agora = time.perf_counter()
+        item = (DeviceSnapshot(device, device.value, agora), values)
+        with self._lock:
+            if self.politica == COALESCER:
+                chave = id(device)
+                if chave in self._pendentes:
+                    del self._pendentes[chave]  # Reinsere no fim: a leitura anterior nunca será entregue
+                    self.coalescidas += 1
+            else:
+                chave = next(self._sequencia)
+            if len(self._pendentes) >= self.tamanho_fila:
+                if self.politica == DESCARTAR_NOVAS:
+                    self.descartadas += 1
+                    return
+                del self._pendentes[next(iter(self._pendentes))]
+                self.descartadas += 1
+            self._pendentes[chave] = item
+            if self._agendado:
+                return
+            self._agendado = True
+        try:
+            self._executor.submit(self._drenar)
+        except RuntimeError:  # Despachante encerrado: as leituras ficam pendentes
+            with self._lock:
+                self._agendado = False
+
+    def _drenar(self):
+        while True:
+            with self._lock:
+                if not self._pendentes:
+                    self._agendado = False
+                    return
+                chave = next(iter(self._pendentes))
+                snapshot, values = self._pendentes.pop(chave)
+            try:
+                if values is None:
+                    self.subscriber.update(snapshot)
+                else:
+                    update_batch = getattr(self.subscriber, 'update_batch', None)
+                    if update_batch is not None:
+                        update_batch(snapshot, values)
+                    else:
+                        self.subscriber.update(snapshot)
+            except Exception:
+                # Sem quem propague o erro: registra e segue para a próxima leitura
+                self.erros += 1
+                logger.exception("Erro ao notificar %r com %r", self.subscriber, snapshot)
+            else:
+                self.entregues += 1
+            self.latencia.registrar(time.perf_counter() - snapshot.timestamp)
+
+    @property
+    def pendentes(self):
+        return len(self._pendentes)
+
+    def metricas(self):
+        return {
+            'entregues': self.entregues,
+            'descartadas': self.descartadas,
+            'coalescidas': self.coalescidas,
+            'erros': self.erros,
+            'pendentes': self.pendentes,
+            'latencia': self.latencia.resumo(),
+        }
+
+    def __repr__(self):
+        return f"AsyncSubscriber(subscriber={self.subscriber!r}, politica={self.politica}, pendentes={self.pendentes})"
+
+
+##################### Despachante ###########################################################################################
+
+class AsyncDispatcher:
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='observer')
+        self._envoltorios = {}  # (id(dispositivo), id(observador)) -> (dispositivo, AsyncSubscriber)
+
+    def attach(self, device, subscriber, tamanho_fila=TAMANHO_FILA, politica=DESCARTAR_ANTIGAS):
+        # Inscreve o observador no dispositivo por meio de uma fila própria; notify() só enfileira
+        chave = (id(device), id(subscriber))
+        if chave in self._envoltorios:
+            raise ValueError(f"{subscriber!r} já está inscrito em {device.tag} por este despachante")
+        envoltorio = AsyncSubscriber(subscriber, self._executor, tamanho_fila, politica)
+        self._envoltorios[chave] = (device, envoltorio)
+        device.attach(envoltorio)
+        return envoltorio
+
+    def detach(self, device, subscriber):
+        _, envoltorio = self._envoltorios.pop((id(device), id(subscriber)), (None, None))
+        if envoltorio is None:
+            raise ValueError(f"{subscriber!r} não está inscrito em {device.tag} por este despachante")
+        device.detach(envoltorio)
+
+    def metricas(self):
+        return [
+            dict(tag=device.tag, subscriber=getattr(envoltorio.subscriber, 'name', repr(envoltorio.subscriber)),
+                 **envoltorio.metricas())
+            for device, envoltorio in self._envoltorios.values()
+        ]
+
+    def encerrar(self, wait=True):
+        # Com wait=True as filas pendentes são entregues antes de retornar
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+    def __repr__(self):
+        return f"AsyncDispatcher(inscricoes={len(self._envoltorios)})"
@@ -0,0 +1,127 @@
+# src/framing.py
+
+import binascii
+import math
+import struct
+
+##################### QUADRO BINÁRIO (firmware -> broker) ####################################################################
+#
+#   0     1      2      3     4 .. n-3       n-2 .. n-1
+#   SYNC  TIPO   CANAL  SEQ   VALOR (LE)     CRC-16/CCITT (LE) sobre TIPO..VALOR
+#
+#   TIPO_FLOAT32: valor float32            -> 10 bytes
+#   TIPO_INT16:   valor int16 * 1/ESCALA   -> 8 bytes
+#   SEQ: contador de 8 bits por canal, usado para detectar quadros perdidos
+#   NaN/inf no valor = leitura inválida do sensor (entregue como None)
+
+SYNC = 0xA5
+TIPO_FLOAT32 = 0x01
+TIPO_INT16 = 0x02
+ESCALA_INT16 = 100  # Centésimos: -327.68 a 327.67
+CRC_INICIAL = 0xFFFF
+
+_FORMATOS = {TIPO_FLOAT32: struct.Struct('<f'), TIPO_INT16: struct.Struct('<h')}
+TAMANHOS = {tipo: 4 + formato.size + 2 for tipo, formato in _FORMATOS.items()}
+TAMANHO_MAX = max(TAMANHOS.values())
+_CRC = struct.Struct('<H')
+
+
+def codificar_quadro(canal, sequencia, valor, tipo=TIPO_FLOAT32):
+    # Usado por simuladores e testes; o firmware monta o mesmo quadro em C
+    if tipo == TIPO_INT16:
+        if valor is None:
+            raise ValueError("Leituras inválidas exigem TIPO_FLOAT32 (NaN)")
+        valor = round(valor * ESCALA_INT16)
+    elif tipo == TIPO_FLOAT32:
+        valor = math.nan if valor is None else valor
+    else:
+        raise ValueError(f"Tipo de quadro desconhecido: {tipo}")
+    try:
+        corpo = bytes((tipo, canal, sequencia & 0xFF)) + _FORMATOS[tipo].pack(valor)
+    except struct.error as e:
+        raise ValueError(f"Valor fora do intervalo do tipo {tipo}: {valor}") from e
+    return bytes((SYNC,)) + corpo + _CRC.pack(binascii.crc_hqx(corpo, CRC_INICIAL))
+
+
+##################### DECODIFICADOR INCREMENTAL ##############################################################################
+
+class FrameDecoder:
+    def __init__(self):
+        self._buffer = bytearray()  # Só guarda um quadro incompleto entre chamadas (< TAMANHO_MAX bytes)
+        self._sequencias = {}  # canal -> última SEQ recebida
+        self.quadros = 0
+        self.crc_invalidos = 0
+        self.bytes_descartados = 0  # Ruído antes do SYNC ou SYNC falso
+        self.perdidos = 0
+        self.perdidos_por_canal = {}
+
+    def feed(self, dados):
+        # Aceita blocos de qualquer tamanho; devolve as leituras (canal, valor) dos quadros completos
+        buffer = self._buffer
+        buffer += dados
+        tamanho_buffer = len(buffer)
+        leituras = []
+        pos = 0
+        with memoryview(buffer) as mv:  # Fatias para o CRC sem copiar o buffer
+            while True:
+                inicio = buffer.find(SYNC, pos)
+                if inicio < 0:
+                    self.bytes_descartados += tamanho_buffer - pos
+                    pos = tamanho_buffer
+                    break
+                self.bytes_descartados += inicio - pos
+                pos = inicio
+                if tamanho_buffer - pos < 2:
+                    break
+                tipo = buffer[pos + 1]
+                tamanho = TAMANHOS.get(tipo)
+                if tamanho is None:
+                    self.bytes_descartados += 1
+                    pos += 1
+                    continue
+                if tamanho_buffer - pos < tamanho:
+                    break  # Quadro incompleto: aguarda o restante
+                crc, = _CRC.unpack_from(buffer, pos + tamanho - 2)
+                if binascii.crc_hqx(mv[pos + 1:pos + tamanho - 2], CRC_INICIAL) != crc:
+                    # Pode ser um byte 0xA5 dentro de outro quadro: ressincroniza no próximo SYNC
+                    self.crc_invalidos += 1
+                    pos += 1
+                    continue
+
+                canal = buffer[pos + 2]
+                self._verificar_sequencia(canal, buffer[pos + 3])
+                valor, = _FORMATOS[tipo].unpack_from(buffer, pos + 4)
+                if tipo == TIPO_INT16:
+                    valor /= ESCALA_INT16
+                elif not math.isfinite(valor):
+                    valor = None
+                leituras.append((canal, valor))
+                self.quadros += 1
+                pos += tamanho
+        del buffer[:pos]
+        return leituras
+
+    def _verificar_sequencia(self, canal, sequencia):
+        anterior = self._sequencias.get(canal)
+        self._sequencias[canal] = sequencia
+        if anterior is None:
+            return
+        perdidos = (sequencia - anterior - 1) & 0xFF
+        if perdidos:
+            self.perdidos += perdidos
+            self.perdidos_por_canal[canal] = self.perdidos_por_canal.get(canal, 0) + perdidos
+
+    @property
+    def pendentes(self):
+        return len(self._buffer)
+
+    def resumo(self):
+        return {
+            'quadros': self.quadros,
+            'crc_invalidos': self.crc_invalidos,
+            'bytes_descartados': self.bytes_descartados,
+            'perdidos': self.perdidos,
+        }
+
+    def __repr__(self):
+        return f"FrameDecoder(quadros={self.quadros}, perdidos={self.perdidos}, crc_invalidos={self.crc_invalidos})"
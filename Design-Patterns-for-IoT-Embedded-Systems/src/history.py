@@ -0,0 +1,80 @@
+# src/history.py
+
+import time
+
+import numpy as np
+
+
+##################### BUFFER CIRCULAR DE HISTÓRICO (timestamp, valor) ########################################################
+
+class RingBuffer:
+    def __init__(self, capacidade):
+        if capacidade <= 0:
+            raise ValueError("A capacidade do histórico deve ser positiva")
+        self.capacidade = capacidade
+        # Cada amostra é gravada em i e em i + capacidade: qualquer janela das últimas N
+        # amostras é uma fatia contígua, devolvida como view sem cópia
+        self._timestamps = np.zeros(2 * capacidade)
+        self._values = np.full(2 * capacidade, np.nan)
+        self._proximo = 0
+        self._total = 0
+
+    def append(self, valor, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        if valor is None:
+            valor = np.nan
+        i = self._proximo
+        j = i + self.capacidade
+        self._timestamps[i] = self._timestamps[j] = timestamp
+        self._values[i] = self._values[j] = valor
+        self._proximo = i + 1 if i + 1 < self.capacidade else 0
+        self._total += 1
+
+    def __len__(self):
+        return min(self._total, self.capacidade)
+
+    @property
+    def total(self):
+        # Quantidade de amostras já recebidas, inclusive as sobrescritas
+        return self._total
+
+    def ultimos(self, n=None):
+        # Views somente leitura: refletem escritas posteriores, copie se precisar congelar
+        tamanho = len(self)
+        n = tamanho if n is None else max(0, min(n, tamanho))
+        fim = self._proximo + self.capacidade
+        inicio = fim - n
+        timestamps = self._timestamps[inicio:fim]
+        values = self._values[inicio:fim]
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+        return timestamps, values
+
+    def janela(self, inicio, fim=None):
+        # Amostras com inicio <= timestamp < fim (timestamps crescentes)
+        timestamps, values = self.ultimos()
+        a = np.searchsorted(timestamps, inicio, side='left')
+        b = len(timestamps) if fim is None else np.searchsorted(timestamps, fim, side='left')
+        return timestamps[a:b], values[a:b]
+
+    def reamostrar(self, pontos, n=None):
+        # Reduz para no máximo `pontos` amostras pela média de cada bloco (para gráficos)
+        timestamps, values = self.ultimos(n)
+        if pontos <= 0:
+            raise ValueError("A quantidade de pontos deve ser positiva")
+        if len(values) <= pontos:
+            return timestamps, values
+
+        inicios = np.linspace(0, len(values), pontos, endpoint=False).astype(np.intp)
+        contagens = np.diff(np.r_[inicios, len(values)])
+        validos = ~np.isnan(values)
+        somas = np.add.reduceat(np.where(validos, values, 0.0), inicios)
+        quantidades = np.add.reduceat(validos.astype(np.intp), inicios)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            medias = somas / quantidades  # Bloco só com leituras inválidas vira NaN
+        # Timestamp de cada bloco: o da última amostra do bloco
+        return timestamps[inicios + contagens - 1], medias
+
+    def __repr__(self):
+        return f"RingBuffer(capacidade={self.capacidade}, amostras={len(self)}, total={self._total})"
@@ -0,0 +1,299 @@
+# src/ingestion.py
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import serial
+
+from .devices import AIDevicePublisher
+from .framing import FrameDecoder
+from .line_parser import LineParser
+from .metrics import LatencyStats
+from .registry import DeviceRegistry
+
+logger = logging.getLogger(__name__)
+
+# Protocolo da porta serial: linhas ASCII ou quadros binários (src/framing.py)
+PROTOCOLO_TEXTO = 'texto'
+PROTOCOLO_BINARIO = 'binario'
+
+_parser_padrao = LineParser()
+
+
+##################### PROCESSAMENTO DE UMA LINHA RECEBIDA ###################################################################
+
+def processar_linha(registry, line, parser=None, rejeicoes=None, porta=None):
+    if parser is None:
+        parser = _parser_padrao
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    logger.debug("Leitura do sensor: %r", line)
+
+    leituras = parser.parse(line)
+    if leituras is None:
+        logger.warning("Leitura rejeitada (%s): %r", parser.ultimo_motivo, line)
+        return
+    processar_leituras(registry, leituras, rejeicoes, porta)
+
+
+def processar_leituras(registry, leituras, rejeicoes=None, porta=None):
+    # Leituras (canal, valor) vindas do parser de texto ou do decodificador binário.
+    # Canais numéricos são resolvidos pela tabela de rotas (porta, canal) da lista de I/O; canais texto são TAGs.
+    # A faixa (Range Min/Max) e a taxa (Rate Max) de cada ponto já estão na tabela colunar do registry:
+    # o quadro inteiro é validado com uma única comparação de arrays.
+    tabela = registry.value_table
+    if tabela is None:
+        tabela = registry.build_value_table()
+    rotas = registry.routing_table
+    if rotas is None:
+        rotas = registry.build_routing_table()
+
+    dispositivos, indices, valores = [], [], []
+    for canal, valor in leituras:
+        if isinstance(canal, str):
+            dispositivo = registry.get(canal)
+            if not isinstance(dispositivo, AIDevicePublisher):
+                logger.warning("TAG desconhecida na leitura: %s", canal)
+                _contar(rejeicoes, 'sem_rota')
+                continue
+        else:
+            dispositivo = rotas.resolver(porta, canal)
+            if dispositivo is None:
+                logger.warning("Canal %d da porta %s sem dispositivo associado: %s", canal, porta, valor)
+                _contar(rejeicoes, 'sem_rota')
+                continue
+
+        if valor is None:
+            dispositivo.update_value(None)  # Leitura inválida sinalizada pelo firmware
+        else:
+            dispositivos.append(dispositivo)
+            indices.append(tabela.indice(dispositivo.tag))
+            valores.append(valor)
+
+    if not dispositivos:
+        return
+    from .value_table import FORA_DA_FAIXA, LEITURA_VALIDA  # Já carregado pela tabela; evita o numpy no import do módulo
+
+    resultado = tabela.validar_lote(indices, valores)
+    for dispositivo, valor, codigo in zip(dispositivos, valores, resultado.tolist()):
+        if codigo == LEITURA_VALIDA:
+            dispositivo.update_value(valor)
+        elif codigo == FORA_DA_FAIXA:
+            logger.warning("Leitura fora da faixa de %s: %s %s", dispositivo.tag, valor, dispositivo.unit)
+            _contar(rejeicoes, 'fora_da_faixa')
+        else:
+            logger.warning("Variação acima de Rate Max em %s: %s -> %s %s",
+                           dispositivo.tag, dispositivo.value, valor, dispositivo.unit)
+            _contar(rejeicoes, 'taxa_excedida')
+
+
+def _contar(rejeicoes, motivo):
+    if rejeicoes is not None:
+        rejeicoes[motivo] = rejeicoes.get(motivo, 0) + 1
+
+
+##################### MOTOR DE INGESTÃO ASSÍNCRONO ###########################################################################
+
+class IngestionEngine:
+    def __init__(self, dispositivos_criados, fontes, handler=None, tamanho_fila=1024, intervalo_polling=0.05,
+                 intervalo_flush=None, protocolo=PROTOCOLO_TEXTO, timeout_leitura=0.2):
+        if protocolo not in (PROTOCOLO_TEXTO, PROTOCOLO_BINARIO):
+            raise ValueError(f"Protocolo desconhecido: {protocolo!r}")
+        self.registry = DeviceRegistry.from_iterable(dispositivos_criados)
+        self.fontes = list(fontes)
+        self.protocolo = protocolo
+        self.parser = LineParser()  # Contadores de linhas aceitas e rejeitadas por motivo
+        self.rejeicoes = {}  # Leituras descartadas após o parse: sem_rota, fora_da_faixa, taxa_excedida
+        self.decodificadores = {}  # Porta -> FrameDecoder (protocolo binário), com contadores de perdas e CRC
+        # O handler recebe (fonte, linha em bytes) no protocolo texto e (fonte, (canal, valor)) no binário
+        if handler is not None:
+            self.handler = handler
+        elif protocolo == PROTOCOLO_BINARIO:
+            self.handler = self._processar_quadro
+        else:
+            self.handler = self._processar_linha
+        # Rotas e limites de validação compilados uma vez, antes da primeira leitura
+        if self.registry.value_table is None:
+            self.registry.build_value_table()
+        if self.registry.routing_table is None:
+            self.registry.build_routing_table()
+        self.tamanho_fila = tamanho_fila
+        self.intervalo_polling = intervalo_polling  # Usado só em fontes sem descritor nem leitura bloqueante
+        self.timeout_leitura = timeout_leitura  # Leitura bloqueante: só limita o tempo de resposta ao parar
+        self.latencia = LatencyStats()  # Da chegada dos bytes à porta até o fim de update_value (observadores incluídos)
+        self.intervalo_flush = intervalo_flush  # Entrega periódica de lotes de notificação vencidos
+        self.linhas_recebidas = 0
+        self.linhas_despachadas = 0
+        self._executor = None
+        self._loop = None
+        self._fila = None
+        self._parar = None
+
+    async def executar(self, stop_event=None):
+        self._loop = asyncio.get_running_loop()
+        # Fila limitada: quando cheia, os leitores param de consumir a porta (backpressure)
+        self._fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        self._parar = asyncio.Event()
+
+        # Conecta todas as portas em paralelo (cada uma pode aguardar a estabilização do NodeMCU)
+        resultados = await asyncio.gather(*(self._loop.run_in_executor(None, fonte.conectar) for fonte in self.fontes),
+                                          return_exceptions=True)
+        falhas = [resultado for resultado in resultados if isinstance(resultado, BaseException)]
+        if falhas:
+            # Fecha as portas que chegaram a abrir antes de propagar o primeiro erro
+            for fonte in self.fontes:
+                fonte.fechar()
+            raise falhas[0]
+        # Uma thread por porta sem descritor, bloqueada na leitura até chegar dado
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.fontes)), thread_name_prefix='serial')
+
+        tarefas = [asyncio.create_task(self._ler_fonte(fonte)) for fonte in self.fontes]
+        despacho = asyncio.create_task(self._despachar())
+        if stop_event is not None:
+            tarefas.append(asyncio.create_task(self._aguardar_stop_event(stop_event)))
+        if self.intervalo_flush:
+            tarefas.append(asyncio.create_task(self._flush_periodico()))
+
+        try:
+            await self._parar.wait()
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+            # Entrega o que já estava na fila antes de encerrar
+            await self._fila.join()
+            despacho.cancel()
+            await asyncio.gather(despacho, return_exceptions=True)
+            # Entrega lotes de notificação ainda pendentes
+            for dispositivo in self.registry.by_type("AI"):
+                dispositivo.flush()
+            # Aguarda as leituras bloqueantes em andamento (no máximo timeout_leitura) antes de fechar as portas
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            for fonte in self.fontes:
+                fonte.fechar()
+
+    def _processar_linha(self, fonte, linha):
+        processar_linha(self.registry, linha, self.parser, self.rejeicoes, fonte.port)
+
+    def _processar_quadro(self, fonte, leitura):
+        processar_leituras(self.registry, (leitura,), self.rejeicoes, fonte.port)
+
+    def _processar_leituras(self, fonte, leituras):
+        processar_leituras(self.registry, leituras, self.rejeicoes, fonte.port)
+
+    def parar(self):
+        # Pode ser chamado de outra thread
+        if self._loop is not None and self._parar is not None:
+            self._loop.call_soon_threadsafe(self._parar.set)
+
+    async def _aguardar_stop_event(self, stop_event):
+        while not stop_event.is_set():
+            await asyncio.sleep(self.intervalo_polling)
+        self._parar.set()
+
+    async def _flush_periodico(self):
+        while True:
+            await asyncio.sleep(self.intervalo_flush)
+            for dispositivo in self.registry.by_type("AI"):
+                dispositivo.flush_if_due()
+
+    async def _ler_fonte(self, fonte):
+        fd = fonte.fileno()
+        pronto = asyncio.Event()
+        bloqueante = None
+        if fd is not None:
+            self._loop.add_reader(fd, pronto.set)  # select/epoll: acorda só quando há bytes
+        else:
+            bloqueante = getattr(fonte, 'ler_bloqueante', None)
+
+        buffer = bytearray()
+        decodificador = None
+        if self.protocolo == PROTOCOLO_BINARIO:
+            decodificador = self.decodificadores[fonte.port] = FrameDecoder()
+        # Com o handler padrão, cada bloco recebido passa inteiro pelo parse_chunk; um handler customizado recebe as linhas
+        em_blocos = decodificador is None and self.handler == self._processar_linha
+        try:
+            while True:
+                if fd is not None:
+                    await pronto.wait()
+                    pronto.clear()
+                try:
+                    if bloqueante is not None:
+                        dados = await self._loop.run_in_executor(self._executor, bloqueante, self.timeout_leitura)
+                    else:
+                        dados = fonte.ler_disponivel()
+                except (serial.SerialException, OSError) as e:
+                    logger.error("Erro de leitura em %s: %s", fonte.port, e)
+                    return
+                if not dados:
+                    if fd is None and bloqueante is None:
+                        await asyncio.sleep(self.intervalo_polling)
+                    continue
+                recebido = time.perf_counter()
+
+                if decodificador is not None:
+                    for leitura in decodificador.feed(dados):
+                        self.linhas_recebidas += 1
+                        await self._fila.put((self.handler, fonte, leitura, recebido, 1))
+                    continue
+
+                # Drena todas as linhas completas recebidas nesta leitura
+                buffer += dados
+                fim = buffer.rfind(b'\n')
+                if fim < 0:
+                    continue
+                if em_blocos:
+                    bloco = bytes(buffer[:fim + 1])
+                    del buffer[:fim + 1]
+                    linhas = bloco.count(b'\n')
+                    rejeitadas = self.parser.rejeitadas
+                    leituras, _ = self.parser.parse_chunk(bloco)
+                    if self.parser.rejeitadas > rejeitadas:
+                        logger.warning("%d linha(s) rejeitada(s) em %s (último motivo: %s)",
+                                       self.parser.rejeitadas - rejeitadas, fonte.port, self.parser.ultimo_motivo)
+                    self.linhas_recebidas += linhas
+                    await self._fila.put((self._processar_leituras, fonte, leituras, recebido, linhas))
+                    continue
+                linhas = buffer[:fim].split(b'\n')
+                del buffer[:fim + 1]
+                for linha in linhas:
+                    self.linhas_recebidas += 1
+                    await self._fila.put((self.handler, fonte, bytes(linha), recebido, 1))
+        finally:
+            if fd is not None:
+                self._loop.remove_reader(fd)
+
+    async def _despachar(self):
+        while True:
+            handler, fonte, dados, recebido, linhas = await self._fila.get()
+            try:
+                handler(fonte, dados)
+                self.linhas_despachadas += linhas
+                self.latencia.registrar(time.perf_counter() - recebido)
+            except Exception:
+                logger.exception("Erro ao despachar leitura de %s", fonte.port)
+            finally:
+                self._fila.task_done()
+
+    def metricas(self):
+        metricas = {
+            'linhas_recebidas': self.linhas_recebidas,
+            'linhas_despachadas': self.linhas_despachadas,
+            'pendentes': self._fila.qsize() if self._fila is not None else 0,
+            'latencia': self.latencia.resumo(),
+            'parser': self.parser.resumo(),
+            'rejeicoes': dict(self.rejeicoes),
+        }
+        if self.decodificadores:
+            metricas['quadros'] = {porta: d.resumo() for porta, d in self.decodificadores.items()}
+        return metricas
+
+
+def executar_ingestao(dispositivos_criados, fontes, stop_event, **kwargs):
+    # Ponto de entrada síncrono para ser usado como alvo de uma Thread
+    engine = IngestionEngine(dispositivos_criados, fontes, **kwargs)
+    asyncio.run(engine.executar(stop_event))
+    return engine
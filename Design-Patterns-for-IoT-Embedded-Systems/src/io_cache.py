@@ -0,0 +1,124 @@
+# src/io_cache.py
+
+##################### Cache binário da lista de I/O ###################################################################################
+
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import sys
+
+from .read_excel import ler_dados_excel
+
+VERSAO_CACHE = 4  # 3: colunas opcionais da lista de I/O (Rate Max, Port, Channel); 4: linhas DO sem TAG descartadas
+SUFIXO_CACHE = '.cache.pkl'
+
+logger = logging.getLogger(__name__)
+
+
+def caminho_cache(file_path):
+    # O cache fica ao lado da planilha: Ambiente_Controlado.xlsx.cache.pkl
+    return file_path + SUFIXO_CACHE
+
+
+def calcular_hash(file_path):
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _ler_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get('versao') != VERSAO_CACHE:
+        return None
+    return cache
+
+
+def _gravar_cache(cache_path, cache):
+    # Grava em arquivo temporário e troca de forma atômica para não deixar cache corrompido
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        logger.warning("Não foi possível gravar o cache %s: %s", cache_path, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def construir_cache(file_path, sha256=None):
+    stat = os.stat(file_path)
+    devices_data = ler_dados_excel(file_path)
+    cache = {
+        'versao': VERSAO_CACHE,
+        'tamanho': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256 or calcular_hash(file_path),
+        'devices_data': devices_data,
+    }
+    _gravar_cache(caminho_cache(file_path), cache)
+    return devices_data
+
+
+def carregar_dados_dispositivos(file_path, usar_cache=True):
+    if not usar_cache:
+        return ler_dados_excel(file_path)
+
+    cache_path = caminho_cache(file_path)
+    cache = _ler_cache(cache_path)
+    if cache is None:
+        return construir_cache(file_path)
+
+    stat = os.stat(file_path)
+    # Caminho rápido: tamanho e mtime iguais dispensam o hash do arquivo
+    if cache['tamanho'] == stat.st_size and cache['mtime_ns'] == stat.st_mtime_ns:
+        return cache['devices_data']
+
+    # mtime mudou (cópia, checkout): só reconstrói se o conteúdo realmente mudou
+    sha256 = calcular_hash(file_path)
+    if cache['sha256'] == sha256:
+        cache['tamanho'] = stat.st_size
+        cache['mtime_ns'] = stat.st_mtime_ns
+        _gravar_cache(cache_path, cache)
+        return cache['devices_data']
+
+    return construir_cache(file_path, sha256=sha256)
+
+
+##################### CLI: python -m src.io_cache [planilha.xlsx ...] ###################################################################################
+
+def main(argv=None):
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    padrao = os.path.normpath(os.path.join(base_path, '..', 'data', 'Ambiente_Controlado.xlsx'))
+
+    parser = argparse.ArgumentParser(description="Pré-compila o cache binário da lista de I/O.")
+    parser.add_argument('planilhas', nargs='*', default=[padrao], help="Arquivos .xlsx da lista de I/O")
+    parser.add_argument('--force', action='store_true', help="Reconstrói o cache mesmo que esteja válido")
+    args = parser.parse_args(argv)
+
+    codigo = 0
+    for file_path in args.planilhas:
+        if not os.path.exists(file_path):
+            print(f"Erro: Arquivo de dados não encontrado {file_path}")
+            codigo = 1
+            continue
+        if args.force:
+            devices_data = construir_cache(file_path)
+        else:
+            devices_data = carregar_dados_dispositivos(file_path)
+        print(f"{caminho_cache(file_path)}: {len(devices_data)} dispositivos")
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
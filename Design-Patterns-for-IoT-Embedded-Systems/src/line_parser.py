@@ -0,0 +1,132 @@
+# src/line_parser.py
+
+import math
+
+# Motivos de rejeição contabilizados em LineParser.rejeicoes
+VAZIA = 'vazia'
+NUMERO_INVALIDO = 'numero_invalido'
+NAO_FINITO = 'nao_finito'  # nan/inf
+CAMPO_VAZIO = 'campo_vazio'  # Ex.: "25.1,,3.2" ou "TIT01="
+TAG_INVALIDA = 'tag_invalida'  # Ex.: "=25.1" ou TAG não ASCII
+MUITO_LONGA = 'muito_longa'
+MOTIVOS = (VAZIA, NUMERO_INVALIDO, NAO_FINITO, CAMPO_VAZIO, TAG_INVALIDA, MUITO_LONGA)
+
+TAMANHO_MAX_LINHA = 256
+MAX_TAGS_EM_CACHE = 4096
+
+
+##################### PARSER DE LINHAS DO PROTOCOLO SERIAL ###################################################################
+
+class LineParser:
+    # Converte linhas em bytes em leituras (canal, valor), sem decodificar nem copiar a linha.
+    # Formatos (decimal '.', sinal opcional; espaços e \r ignorados):
+    #   b"25.5"                     -> [(0, 25.5)]  valor simples = canal 0
+    #   b"25.5,-3.2,1"              -> [(0, 25.5), (1, -3.2), (2, 1.0)]
+    #   b"A1-AI-TIT01=25.5,LIT01=3" -> [('A1-AI-TIT01', 25.5), ('LIT01', 3.0)]
+    # Uma linha com qualquer campo inválido é rejeitada inteira.
+
+    def __init__(self, tamanho_max=TAMANHO_MAX_LINHA):
+        self.tamanho_max = tamanho_max
+        self.aceitas = 0
+        self.rejeicoes = dict.fromkeys(MOTIVOS, 0)
+        self.ultimo_motivo = None
+        self._tags = {}  # bytes -> str: cada TAG é decodificada uma única vez
+
+    def parse(self, linha):
+        # Retorna a lista de leituras, ou None se a linha foi rejeitada (motivo em ultimo_motivo)
+        if len(linha) > self.tamanho_max:
+            return self._rejeitar(MUITO_LONGA)
+        try:
+            valor = float(linha)  # float() aceita bytes e ignora espaços/\r: caminho rápido do valor simples
+        except ValueError:
+            return self._parse_quadro(linha)
+        if b'_' in linha:  # float() aceita separador de dígitos ("1_000"): linha corrompida, não um número do protocolo
+            return self._rejeitar(NUMERO_INVALIDO)
+        if not math.isfinite(valor):
+            return self._rejeitar(NAO_FINITO)
+        self.aceitas += 1
+        return [(0, valor)]
+
+    def parse_chunk(self, dados):
+        # Processa todas as linhas completas de um bloco; devolve as leituras e o resto sem '\n'.
+        # Mesmo resultado de parse() linha a linha, com o caminho do valor simples sem chamadas de método
+        fim = dados.rfind(b'\n')
+        if fim < 0:
+            return [], dados
+        leituras = []
+        adicionar = leituras.append
+        tamanho_max = self.tamanho_max
+        aceitas = 0
+        bloco = dados[:fim]
+        sem_separador = b'_' not in bloco  # Uma busca no bloco inteiro evita testar '_' linha a linha
+        for linha in bloco.split(b'\n'):
+            try:
+                valor = float(linha)
+            except ValueError:
+                valor = None
+            # valor - valor só é 0.0 para números finitos (nan e inf dão nan)
+            if (valor is not None and valor - valor == 0.0 and len(linha) <= tamanho_max
+                    and (sem_separador or b'_' not in linha)):
+                adicionar((0, valor))
+                aceitas += 1
+                continue
+            resultado = self.parse(linha)
+            if resultado is not None:
+                leituras.extend(resultado)
+        self.aceitas += aceitas
+        return leituras, dados[fim + 1:]
+
+    def _parse_quadro(self, linha):
+        if b',' not in linha and b'=' not in linha:
+            return self._rejeitar(NUMERO_INVALIDO if linha.strip() else VAZIA)
+
+        leituras = []
+        for indice, campo in enumerate(linha.split(b',')):
+            tag, separador, texto = campo.partition(b'=')
+            if separador:
+                canal = self._tags.get(tag)
+                if canal is None:
+                    canal = self._decodificar_tag(tag)
+                    if canal is None:
+                        return self._rejeitar(TAG_INVALIDA)
+            else:
+                canal, texto = indice, campo
+            try:
+                valor = float(texto)
+            except ValueError:
+                return self._rejeitar(NUMERO_INVALIDO if texto.strip() else CAMPO_VAZIO)
+            if b'_' in texto:
+                return self._rejeitar(NUMERO_INVALIDO)
+            if not math.isfinite(valor):
+                return self._rejeitar(NAO_FINITO)
+            leituras.append((canal, valor))
+
+        self.aceitas += 1
+        return leituras
+
+    def _decodificar_tag(self, tag):
+        nome = tag.strip()
+        if not nome:
+            return None
+        try:
+            nome = nome.decode('ascii')
+        except UnicodeDecodeError:
+            return None
+        if len(self._tags) < MAX_TAGS_EM_CACHE:  # Limita a memória com ruído na linha
+            self._tags[bytes(tag)] = nome
+        return nome
+
+    def _rejeitar(self, motivo):
+        self.rejeicoes[motivo] += 1
+        self.ultimo_motivo = motivo
+        return None
+
+    @property
+    def rejeitadas(self):
+        return sum(self.rejeicoes.values())
+
+    def resumo(self):
+        return {'aceitas': self.aceitas, 'rejeitadas': self.rejeitadas, **self.rejeicoes}
+
+    def __repr__(self):
+        return f"LineParser(aceitas={self.aceitas}, rejeitadas={self.rejeitadas})"
@@ -0,0 +1,58 @@
+# src/log_config.py
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+LOGGER_RAIZ = 'src'  # Todos os módulos usam logging.getLogger(__name__) -> src.*
+FORMATO_PADRAO = '%(asctime)s [%(levelname)8s] %(name)s: %(message)s'
+
+_listener = None
+_queue_handler = None
+
+
+##################### LOGGING NÃO BLOQUEANTE (QueueHandler + QueueListener) ##################################################
+
+def configurar_logging(nivel=None, handlers=None, formato=FORMATO_PADRAO, reconfigurar=False):
+    # A thread de ingestão só enfileira o registro; a escrita no destino ocorre na thread do listener
+    global _listener, _queue_handler
+    if _listener is not None and not reconfigurar:
+        return logging.getLogger(LOGGER_RAIZ)
+    parar_logging()
+
+    if nivel is None:
+        nivel = os.environ.get('BROKER_LOG_LEVEL', 'INFO').upper()
+    if handlers is None:
+        handlers = [logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(formato))
+
+    fila = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(fila, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    _queue_handler = logging.handlers.QueueHandler(fila)
+    logger = logging.getLogger(LOGGER_RAIZ)
+    logger.addHandler(_queue_handler)
+    logger.setLevel(nivel)  # Níveis desabilitados são descartados antes de formatar a mensagem
+    logger.propagate = False
+    return logger
+
+
+def parar_logging():
+    # Esvazia a fila e devolve o logger 'src' ao comportamento padrão (propaga para o root)
+    global _listener, _queue_handler
+    logger = logging.getLogger(LOGGER_RAIZ)
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+atexit.register(parar_logging)
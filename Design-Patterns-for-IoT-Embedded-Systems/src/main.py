@@ -12,27 +12,52 @@
 
 ##################### INICIO DE PROGRAMA ###################################################################################
 
+import logging
 import os
-import serial
-import time
-from threading import Thread
 
-from .read_excel import ler_dados_excel
-from .observer import GenericSubscriber
-from .devices import AIDevicePublisher
+from .io_cache import carregar_dados_dispositivos
 from .factories import DODeviceFactory
 from .builders import AIDeviceBuilder
+from .ingestion import executar_ingestao
+from .transport import SerialTransport
+from .registry import DeviceRegistry
 
 base_path = os.path.dirname(os.path.abspath(__file__))
 
-##################### INICIALIZA PORTA SERIAL E COMUNICAÇÃO COM NODEMCU ####################################################
-
-ser = serial.Serial('COM5', 115200)
-time.sleep(2)
+logger = logging.getLogger(__name__)
 
 ##################### CLASSE CRIA OBJETO CONFORME ENTRADA ##################################################################
 
 
+def _taxa_opcional(valores):
+    # Coluna 'Rate Max' ausente, vazia ou não numérica = sem limite de taxa
+    try:
+        taxa = float(valores[0])
+    except (IndexError, TypeError, ValueError):
+        return None
+    return taxa if taxa > 0 else None  # NaN também resulta em None
+
+
+def _porta_opcional(valores):
+    # Coluna 'Port' ausente ou vazia = qualquer porta
+    if not valores or not isinstance(valores[0], str) or not valores[0].strip():
+        return None
+    return valores[0].strip()
+
+
+def _canal_opcional(valores):
+    # Coluna 'Channel' ausente ou vazia = ponto sem rota por canal (ainda endereçável por TAG)
+    try:
+        canal = float(valores[0])
+    except (IndexError, TypeError, ValueError):
+        return None
+    if canal != canal:  # NaN
+        return None
+    if canal < 0 or canal != int(canal):
+        raise ValueError(f"Channel inválido na lista de I/O: {valores[0]!r}")
+    return int(canal)
+
+
 def criar_dispositivo(tipo, *args):
     if tipo == "DO":
         factory = DODeviceFactory()
@@ -46,8 +71,11 @@ def criar_dispositivo(tipo, *args):
                        .set_range_min(args[3])
                        .set_range_max(args[4])
                        .set_unit(args[5])
+                       .set_taxa_max(_taxa_opcional(args[6:7]))
+                       .set_porta(_porta_opcional(args[7:8]))
+                       .set_canal(_canal_opcional(args[8:9]))
                        .build())
-        print(dispositivo)
+        logger.debug("Dispositivo criado: %r", dispositivo)
         return dispositivo
         
     else:
@@ -56,31 +84,15 @@ def criar_dispositivo(tipo, *args):
 
 ##################### LEITURA DO SENSOR DE TEMPERATURA A1-AI-TIT01 VIA PORTA SERIAL ##########################################
 
-import time
-
-def ler_sensor(dispositivos_criados, stop_event):  # stop_event é um evento que será usado para parar a thread
-    while not stop_event.is_set():
-        if ser.in_waiting > 0:
-            line = ser.readline().decode('utf-8').strip()  # Use strip() para remover espaços em branco e quebras de linha extras
-            print(f"Leitura do sensor: {line}")
-            
-            # Verifica se a linha contém apenas caracteres numéricos e ponto decimal e tem um formato válido
-            if line.replace('.', '', 1).isdigit() and line.count('.') <= 1:
-                try:
-                    temperatura = float(line)
-                    # Verifica se a temperatura está em um intervalo esperado para evitar leituras absurdas
-                    if 15.0 <= temperatura <= 50.0:  # Faixa de temperatura aceitável
-                        for dispositivo in dispositivos_criados:
-                            if isinstance(dispositivo, AIDevicePublisher) and dispositivo.tag == "A1-AI-TIT01":
-                                dispositivo.update_value(temperatura)
-                    else:
-                        print(f"Leitura fora da faixa esperada: {temperatura} °C")
-                except ValueError:
-                    print(f"Erro ao processar a linha: {line}")
-            else:
-                print(f"Formato inválido de leitura: {line}")
-        
-        time.sleep(1.0)
+def ler_sensor(dispositivos_criados, stop_event, transporte=None, protocolo=None):  # stop_event é um evento que será usado para parar a thread
+    # A porta serial (BROKER_SERIAL_PORT / BROKER_SERIAL_BAUD, padrão COM5 a 115200) só é aberta aqui
+    if transporte is None:
+        transporte = SerialTransport()
+    # 'texto' (padrão) ou 'binario', conforme PROTOCOLO_BINARIO no firmware
+    if protocolo is None:
+        protocolo = os.environ.get('BROKER_SERIAL_PROTOCOL', 'texto')
+    # Lê todas as linhas disponíveis a cada evento da porta, sem espera fixa entre leituras
+    executar_ingestao(dispositivos_criados, [transporte], stop_event, protocolo=protocolo)
 
 
 
@@ -92,12 +104,23 @@ def processar_e_criar_dispositivos():
 
     # Verifica se o arquivo existe
     if not os.path.exists(file_path):
-        print(f"Erro: Arquivo de dados não encontrado {file_path}")
-        return []
-
-    # Lê os dados do Excel
-    devices_data = ler_dados_excel(file_path)
-
-    # Cria dispositivos com base nos dados
-    dispositivos_criados = [criar_dispositivo(*device_info) for device_info in devices_data]
+        logger.error("Arquivo de dados não encontrado %s", file_path)
+        return DeviceRegistry()
+
+    # Lê os dados do Excel (ou do cache binário, se a planilha não mudou)
+    devices_data = carregar_dados_dispositivos(file_path)
+
+    # Cria dispositivos com base nos dados e indexa por TAG, tipo e área
+    dispositivos_criados = DeviceRegistry()
+    for device_info in devices_data:
+        dispositivo = criar_dispositivo(*device_info)
+        if dispositivo.tag in dispositivos_criados:
+            # Uma linha repetida na planilha não impede a carga dos demais pontos
+            logger.warning("TAG %s repetida na lista de I/O: linha ignorada", dispositivo.tag)
+            continue
+        dispositivos_criados.add(dispositivo)
+    # Tabela colunar (valor, timestamp, qualidade) compartilhada pelos pontos AI
+    dispositivos_criados.build_value_table()
+    # Rotas (porta, canal) -> dispositivo das colunas opcionais Port/Channel, compiladas uma vez
+    dispositivos_criados.build_routing_table()
     return dispositivos_criados
@@ -0,0 +1,56 @@
+# src/metrics.py
+
+import threading
+from collections import deque
+
+CAPACIDADE_AMOSTRAS = 1024  # Percentis calculados sobre as últimas N amostras
+
+
+##################### ESTATÍSTICAS DE LATÊNCIA ###############################################################################
+
+class LatencyStats:
+    def __init__(self, capacidade=CAPACIDADE_AMOSTRAS):
+        self._amostras = deque(maxlen=capacidade)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, segundos):
+        # Só acumula; a ordenação para percentis fica para quem lê as métricas
+        with self._lock:
+            self._amostras.append(segundos)
+            self.count += 1
+            self.soma += segundos
+            if segundos > self.maximo:
+                self.maximo = segundos
+
+    def percentil(self, p):
+        with self._lock:
+            amostras = sorted(self._amostras)
+        if not amostras:
+            return None
+        return amostras[min(len(amostras) - 1, int(p / 100 * len(amostras)))]
+
+    def resumo(self):
+        # Valores em milissegundos; média e máximo desde a criação, percentis da janela recente
+        with self._lock:
+            amostras = sorted(self._amostras)
+            count, soma, maximo = self.count, self.soma, self.maximo
+        if not count:
+            return {'count': 0, 'mean_ms': None, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+
+        def ms(p):
+            return 1000 * amostras[min(len(amostras) - 1, int(p / 100 * len(amostras)))]
+
+        return {
+            'count': count,
+            'mean_ms': 1000 * soma / count,
+            'p50_ms': ms(50),
+            'p95_ms': ms(95),
+            'p99_ms': ms(99),
+            'max_ms': 1000 * maximo,
+        }
+
+    def __repr__(self):
+        return f"LatencyStats(count={self.count}, amostras={len(self._amostras)})"
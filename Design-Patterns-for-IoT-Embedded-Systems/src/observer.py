@@ -1,21 +1,85 @@
 # src/observer.py
 
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CAPACIDADE_NOTIFICACOES = 100  # O broker exibe apenas as últimas 5
+
+
 class Observer:
     def update(self, device):
         pass
 
+    def update_batch(self, device, values):
+        # Padrão: uma única atualização com o valor mais recente do lote
+        self.update(device)
+
+
+##################### Histórico limitado de notificações ###################################################################
+
+class NotificationLog:
+    def __init__(self, name, capacidade=CAPACIDADE_NOTIFICACOES):
+        self.name = name
+        # Registros brutos (timestamp, tag, valor, unidade); o texto só é montado ao exibir
+        self._registros = deque(maxlen=capacidade)
+
+    @property
+    def capacidade(self):
+        return self._registros.maxlen
+
+    @property
+    def registros(self):
+        return self._registros
+
+    def registrar(self, tag, value, unit, timestamp=None):
+        self._registros.append((time.time() if timestamp is None else timestamp, tag, value, unit))
+
+    def formatar(self, registro):
+        _, tag, value, unit = registro
+        if value is None:
+            return f"Observer {self.name}: TAG = {tag} recebeu um valor inválido."
+        if isinstance(value, list):  # Lote de leituras (update_batch)
+            return f"Observer {self.name}: TAG = {tag} recebeu {len(value)} leituras, última {value[-1]} {unit}"
+        return f"Observer {self.name}: TAG = {tag} mudou para {value} {unit}"
+
+    def ultimas(self, n):
+        return self[-n:] if n > 0 else []
+
+    def clear(self):
+        self._registros.clear()
+
+    def __getitem__(self, indice):
+        # Mantém a interface de lista (ex.: notifications[-5:]) formatando só o que foi pedido
+        if isinstance(indice, slice):
+            return [self.formatar(self._registros[i]) for i in range(len(self._registros))[indice]]
+        return self.formatar(self._registros[indice])
+
+    def __iter__(self):
+        return (self.formatar(registro) for registro in self._registros)
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __repr__(self):
+        return f"NotificationLog(name={self.name}, registros={len(self)}, capacidade={self.capacidade})"
+
 
 class GenericSubscriber(Observer):
-    def __init__(self, name):
+    def __init__(self, name, capacidade=CAPACIDADE_NOTIFICACOES):
         self.name = name
-        self.notifications = []
+        self.notifications = NotificationLog(name, capacidade)
 
     def update(self, device):
+        self.notifications.registrar(device.tag, device.value, device.unit)
         if device.value is not None:
-            message = f"Observer {self.name}: TAG = {device.tag} mudou para {device.value} {device.unit}"
-            print(message)
-            self.notifications.append(message)
+            logger.debug("Observer %s: TAG = %s mudou para %s %s", self.name, device.tag, device.value, device.unit)
         else:
-            message = f"Observer {self.name}: TAG = {device.tag} recebeu um valor inválido."
-            print(message)
-            self.notifications.append(message)
+            logger.debug("Observer %s: TAG = %s recebeu um valor inválido.", self.name, device.tag)
+
+    def update_batch(self, device, values):
+        self.notifications.registrar(device.tag, list(values), device.unit)
+        logger.debug("Observer %s: TAG = %s recebeu %d leituras, última %s %s",
+                     self.name, device.tag, len(values), values[-1], device.unit)
@@ -0,0 +1,227 @@
+# src/pubsub.py
+
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+
+from .observer import Observer
+from .topics import TopicTrie
+
+logger = logging.getLogger(__name__)
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8766
+LIMITE_BUFFER = 256 * 1024  # Bytes aguardando envio por conexão antes de despejar o consumidor lento
+TAMANHO_MAX_LINHA = 4096
+
+
+##################### PROTOCOLO (uma mensagem JSON por linha, nos dois sentidos) ############################################
+#
+#   cliente -> {"op": "subscribe", "pattern": "A1-AI-*"}     (padrões de src/topics.py; "#" = todos, "area:1")
+#   cliente -> {"op": "unsubscribe", "pattern": "A1-AI-*"}
+#   servidor -> {"tag": ..., "value": ..., "unit": ..., "timestamp": ...}
+#   servidor -> {"ok": "subscribe", "pattern": ...} | {"erro": ...}
+
+def _mensagem(tag, value, unit, timestamp):
+    # Serializada uma única vez por leitura, independente do número de conexões; NaN/inf não existem em JSON
+    value, unit = (None if isinstance(v, float) and not math.isfinite(v) else v for v in (value, unit))
+    return json.dumps({'tag': tag, 'value': value, 'unit': unit, 'timestamp': timestamp},
+                      ensure_ascii=False, allow_nan=False).encode('utf-8') + b'\n'
+
+
+class _Conexao:
+    __slots__ = ('writer', 'endereco', 'chaves', 'pendente', 'enviadas')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.endereco = writer.get_extra_info('peername')
+        self.chaves = {}  # padrão -> chave da assinatura na TopicTrie do servidor
+        self.pendente = []  # Mensagens acumuladas na iteração atual do loop, escritas de uma vez
+        self.enviadas = 0
+
+
+##################### OBSERVADOR LIGADO AOS DISPOSITIVOS AI ##################################################################
+
+class PubSubPublisher(Observer):
+    # Roda na thread de ingestão: só agenda a publicação no loop do servidor e retorna
+    def __init__(self, servidor):
+        self.servidor = servidor
+
+    def update(self, device):
+        self.servidor.publicar(device.tag, device.value, device.unit, area=device.area)
+
+    def update_batch(self, device, values):
+        self.servidor.publicar(device.tag, values[-1] if values else device.value, device.unit, area=device.area)
+
+
+##################### SERVIDOR TCP DE DISTRIBUIÇÃO (FAN-OUT) #################################################################
+
+class PubSubServer:
+    def __init__(self, registry, host=HOST_PADRAO, porta=PORTA_PADRAO, limite_buffer=LIMITE_BUFFER):
+        self.registry = registry
+        self.host = host
+        self.porta = porta
+        self.limite_buffer = limite_buffer
+        self.publisher = PubSubPublisher(self)
+        self.publicadas = 0
+        self.despejadas = 0  # Conexões encerradas por não acompanharem o ritmo das leituras
+        self._conexoes = set()
+        self._trie = TopicTrie()  # Padrão -> conexões; usada só na thread do loop
+        self._com_pendencias = []
+        self._loop = None
+        self._parar = None
+        self._servidor = None
+        self._thread = None
+        self._pronto = threading.Event()
+        self._erro = None
+
+    ##################### CICLO DE VIDA ######################################################################################
+
+    def iniciar(self):
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._executar, name='pubsub', daemon=True)
+        self._thread.start()
+        self._pronto.wait()
+        if self._erro is not None:
+            raise self._erro
+        for dispositivo in self.registry.by_type("AI"):
+            dispositivo.attach(self.publisher, filtrado=False)  # A banda morta filtra só os observadores locais
+        # Pontos incluídos depois também publicam (e entram nas assinaturas por padrão que casarem)
+        self.registry.ao_adicionar(self._novo_dispositivo)
+        return self
+
+    def _novo_dispositivo(self, dispositivo):
+        if dispositivo.tipo == "AI":
+            dispositivo.attach(self.publisher, filtrado=False)
+
+    def _executar(self):
+        try:
+            asyncio.run(self._servir())
+        except OSError as e:  # Porta em uso ou endereço inválido: repassado a iniciar()
+            self._erro = e
+            self._pronto.set()
+
+    async def _servir(self):
+        self._loop = asyncio.get_running_loop()
+        self._parar = asyncio.Event()
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta, limit=TAMANHO_MAX_LINHA)
+        self.porta = self._servidor.sockets[0].getsockname()[1]  # Resolve porta 0 (livre)
+        self._pronto.set()
+        logger.info("Pub/sub em tcp://%s:%d", self.host, self.porta)
+        try:
+            await self._parar.wait()
+        finally:
+            self._servidor.close()
+            for conexao in list(self._conexoes):
+                conexao.writer.transport.abort()
+            # asyncio.run cancela as tarefas das conexões restantes ao sair
+
+    def parar(self, timeout=None):
+        self.registry.remover_ao_adicionar(self._novo_dispositivo)
+        for dispositivo in self.registry.by_type("AI"):
+            try:
+                dispositivo.detach(self.publisher)
+            except ValueError:
+                pass
+        if self._parar is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._parar.set)
+            self._thread.join(timeout)
+
+    ##################### PUBLICAÇÃO #########################################################################################
+
+    def publicar(self, tag, value, unit, timestamp=None, area=None):
+        # Pode ser chamado de qualquer thread
+        if self._loop is None or not self._conexoes:
+            return
+        self._loop.call_soon_threadsafe(self._distribuir, tag, value, unit,
+                                        time.time() if timestamp is None else timestamp, area)
+
+    def _distribuir(self, tag, value, unit, timestamp, area=None):
+        self.publicadas += 1
+        mensagem = None
+        for conexao in self._trie.casar(tag, area):
+            if conexao not in self._conexoes:  # Despejada nesta mesma iteração
+                continue
+            if mensagem is None:
+                mensagem = _mensagem(tag, value, unit, timestamp)
+            if not conexao.pendente:
+                if not self._com_pendencias:
+                    # Escreve depois das publicações já enfileiradas: uma escrita por conexão por iteração
+                    self._loop.call_soon(self._descarregar)
+                self._com_pendencias.append(conexao)
+            conexao.pendente.append(mensagem)
+
+    def _descarregar(self):
+        conexoes, self._com_pendencias = self._com_pendencias, []
+        for conexao in conexoes:
+            if conexao not in self._conexoes:
+                continue
+            transport = conexao.writer.transport
+            transport.write(b''.join(conexao.pendente))
+            conexao.enviadas += len(conexao.pendente)
+            conexao.pendente.clear()
+            # O buffer de envio só cresce se o cliente não lê: descarta a conexão em vez de acumular memória
+            if transport.get_write_buffer_size() > self.limite_buffer:
+                self._despejar(conexao)
+
+    def _despejar(self, conexao):
+        self.despejadas += 1
+        self._desconectar(conexao)
+        logger.warning("Consumidor lento %s desconectado (%d bytes pendentes)",
+                       conexao.endereco, conexao.writer.transport.get_write_buffer_size())
+        conexao.writer.transport.abort()
+
+    ##################### CONEXÕES ###########################################################################################
+
+    async def _atender(self, reader, writer):
+        conexao = _Conexao(writer)
+        self._conexoes.add(conexao)
+        try:
+            while True:
+                try:
+                    linha = await reader.readline()
+                except (ValueError, ConnectionError):  # Linha maior que TAMANHO_MAX_LINHA ou conexão abortada
+                    break
+                if not linha:
+                    break
+                self._comando(conexao, linha)
+        finally:
+            self._desconectar(conexao)
+            writer.close()
+
+    def _desconectar(self, conexao):
+        if conexao in self._conexoes:
+            self._conexoes.discard(conexao)
+            for chave in conexao.chaves.values():
+                self._trie.remover(chave)
+            conexao.chaves.clear()
+
+    def _comando(self, conexao, linha):
+        try:
+            comando = json.loads(linha)
+            op, padrao = comando['op'], str(comando['pattern'])
+            if op not in ('subscribe', 'unsubscribe'):
+                raise ValueError(f"Operação desconhecida: {op!r}")
+            if op == 'subscribe' and padrao not in conexao.chaves:
+                conexao.chaves[padrao] = self._trie.adicionar(padrao, conexao)  # ValueError se o padrão for inválido
+            elif op == 'unsubscribe' and padrao in conexao.chaves:
+                self._trie.remover(conexao.chaves.pop(padrao))
+        except (KeyError, TypeError, ValueError) as e:
+            resposta = {'erro': str(e)}
+        else:
+            resposta = {'ok': op, 'pattern': padrao}
+        conexao.writer.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')
+
+    def metricas(self):
+        return {
+            'conexoes': len(self._conexoes),
+            'publicadas': self.publicadas,
+            'despejadas': self.despejadas,
+        }
+
+    def __repr__(self):
+        return f"PubSubServer(host={self.host}, porta={self.porta}, conexoes={len(self._conexoes)})"
@@ -2,29 +2,40 @@
 
 ##################### Leitura do arquivo de dados ###################################################################################
 
-import pandas as pd
+COLUNAS_AI = ['Tag table', 'TAG', 'Area', 'Descrição', 'Range Min', 'Range Max', 'Unit']
+# Acrescentadas à tupla AI, sempre todas e nesta ordem, se a planilha tiver ao menos uma (as ausentes viram None)
+COLUNAS_OPCIONAIS_AI = ['Rate Max', 'Port', 'Channel']
 
 def ler_dados_excel(file_path):
+    # Importa o pandas só quando a planilha precisa ser lida (o cache dispensa a leitura)
+    import pandas as pd
+
     df = pd.read_excel(file_path)
+    return extrair_dados_dispositivos(df)
+
+def extrair_dados_dispositivos(df):
+    tipos = df['Tag table']
+    com_tag = df['TAG'].notnull()
+    eh_ai = (tipos == 'AI') & com_tag
+    opcionais = [coluna for coluna in COLUNAS_OPCIONAIS_AI if coluna in df.columns]
+    # Linhas sem TAG (AI ou DO) são ignoradas: virariam dispositivos "nan" repetidos no registro
+    df_filtered = df.loc[eh_ai | ((tipos == 'DO') & com_tag), COLUNAS_AI + opcionais]
+
+    # Extrai cada coluna de uma vez, sem criar uma Series por linha (iterrows)
+    colunas = [df_filtered[coluna].tolist() for coluna in COLUNAS_AI]
+    extras = None
+    if opcionais:
+        vazia = [None] * len(df_filtered)
+        extras = list(zip(*(df_filtered[coluna].tolist() if coluna in opcionais else vazia
+                            for coluna in COLUNAS_OPCIONAIS_AI)))
+    eh_ai = eh_ai[df_filtered.index].tolist()
 
-    df_filtered = df.loc[
-        ((df['Tag table'] == 'AI') & (df['TAG'].notnull())) |
-        (df['Tag table'] == 'DO')
-    ]
-    
     devices_data = []
-    for _, row in df_filtered.iterrows():
-        tipo = row['Tag table']
-        tag = row['TAG']
-        area = row['Area']
-        descricao = row['Descrição']
-        
-        if tipo == 'AI':
-            range_min = row['Range Min']
-            range_max = row['Range Max']
-            unit = row['Unit']
-            devices_data.append((tipo, tag, area, descricao, range_min, range_max, unit))
+    for i, (ai, tipo, tag, area, descricao, range_min, range_max, unit) in enumerate(zip(eh_ai, *colunas)):
+        if ai:
+            dados = (tipo, tag, area, descricao, range_min, range_max, unit)
+            devices_data.append(dados + extras[i] if extras else dados)
         else:
             devices_data.append((tipo, tag, area, descricao))
-    
+
     return devices_data
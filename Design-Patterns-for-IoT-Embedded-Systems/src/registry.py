@@ -0,0 +1,106 @@
+# src/registry.py
+
+
+_VAZIO = {}
+
+
+##################### classe DeviceRegistry ###################################################################################
+
+class DeviceRegistry:
+    def __init__(self, dispositivos=()):
+        self._por_tag = {}   # Índice principal: tag -> dispositivo
+        self._por_tipo = {}  # Índice secundário: tipo -> {tag: dispositivo}
+        self._por_area = {}  # Índice secundário: area -> {tag: dispositivo}
+        self.value_table = None  # Tabela colunar dos pontos AI, criada por build_value_table
+        self.routing_table = None  # Rotas (porta, canal) -> dispositivo, criadas por build_routing_table
+        self._ao_adicionar = []  # Chamados com cada novo dispositivo (assinaturas por padrão de TAG)
+        for dispositivo in dispositivos:
+            self.add(dispositivo)
+
+    @classmethod
+    def from_iterable(cls, dispositivos):
+        # Reaproveita o registro quando já recebe um
+        if isinstance(dispositivos, cls):
+            return dispositivos
+        return cls(dispositivos)
+
+    def add(self, dispositivo):
+        if dispositivo.tag in self._por_tag:
+            raise ValueError(f"Dispositivo com TAG {dispositivo.tag} já registrado")
+        if self.routing_table is not None and dispositivo.tipo == "AI":
+            self.routing_table.registrar(dispositivo)  # Antes dos índices: um conflito de rota não deixa registro parcial
+        self._por_tag[dispositivo.tag] = dispositivo
+        self._por_tipo.setdefault(dispositivo.tipo, {})[dispositivo.tag] = dispositivo
+        self._por_area.setdefault(dispositivo.area, {})[dispositivo.tag] = dispositivo
+        if self.value_table is not None and dispositivo.tipo == "AI":
+            self.value_table.registrar(dispositivo)
+        for funcao in self._ao_adicionar:
+            funcao(dispositivo)
+        return dispositivo
+
+    def ao_adicionar(self, funcao):
+        self._ao_adicionar.append(funcao)
+        return funcao
+
+    def remover_ao_adicionar(self, funcao):
+        if funcao in self._ao_adicionar:
+            self._ao_adicionar.remove(funcao)
+
+    def remove(self, tag):
+        dispositivo = self._por_tag.pop(tag)
+        for indice, chave in ((self._por_tipo, dispositivo.tipo), (self._por_area, dispositivo.area)):
+            del indice[chave][tag]
+            if not indice[chave]:
+                del indice[chave]
+        if self.value_table is not None and dispositivo.tipo == "AI":
+            self.value_table.descartar(dispositivo)
+        if self.routing_table is not None and dispositivo.tipo == "AI":
+            self.routing_table.descartar(dispositivo)
+        return dispositivo
+
+    def build_value_table(self):
+        # Importação tardia: o numpy só é carregado quando a tabela é usada
+        from .value_table import AIValueTable
+
+        self.value_table = AIValueTable.from_devices(self.by_type("AI"))
+        return self.value_table
+
+    def build_routing_table(self):
+        from .routing import RoutingTable
+
+        self.routing_table = RoutingTable.from_devices(self.by_type("AI"))
+        return self.routing_table
+
+    def get(self, tag, default=None):
+        return self._por_tag.get(tag, default)
+
+    def by_type(self, tipo):
+        # Views "vivas": refletem inclusões e remoções sem copiar
+        return self._por_tipo.get(tipo, _VAZIO).values()
+
+    def by_area(self, area):
+        return self._por_area.get(area, _VAZIO).values()
+
+    def tags(self):
+        return self._por_tag.keys()
+
+    def types(self):
+        return self._por_tipo.keys()
+
+    def areas(self):
+        return self._por_area.keys()
+
+    def __getitem__(self, tag):
+        return self._por_tag[tag]
+
+    def __contains__(self, tag):
+        return tag in self._por_tag
+
+    def __iter__(self):
+        return iter(self._por_tag.values())
+
+    def __len__(self):
+        return len(self._por_tag)
+
+    def __repr__(self):
+        return f"DeviceRegistry(dispositivos={len(self._por_tag)}, tipos={list(self._por_tipo)}, areas={list(self._por_area)})"
@@ -0,0 +1,108 @@
+# src/render_cache.py
+
+import html
+
+CABECALHO = ("Nº", "Dispositivo AI", "Objeto Associado", "Valor em Tempo Real")
+SEM_VALOR = "N/A"
+
+
+def _celula(conteudo, classe="table-cell"):
+    return f'<td class="{classe}">{html.escape(str(conteudo))}</td>'
+
+
+##################### LINHA PRÉ-RENDERIZADA DA TABELA DE ASSOCIAÇÕES ##########################################################
+
+class AssociationRow:
+    __slots__ = ('dispositivo', 'subscriber', 'observer', 'device', 'prefixo', 'celula_valor', '_chave')
+
+    def __init__(self, dispositivo, subscriber, observer, device=None):
+        self.dispositivo = dispositivo  # Tag do dispositivo associado
+        self.subscriber = subscriber
+        self.observer = observer
+        self.device = device            # Referência resolvida uma vez; None se não houver ponto AI
+        self.prefixo = None
+        self.celula_valor = None
+        self._chave = None
+
+    def renderizar_prefixo(self, numero):
+        # Células estáticas (Nº, tag, subscriber): só mudam quando a numeração muda
+        self.prefixo = f'<tr>{_celula(numero)}{_celula(self.dispositivo)}{_celula(self.subscriber)}'
+
+    def atualizar_valor(self):
+        # Refaz a célula de valor apenas se (valor, unidade) mudou desde a última renderização
+        device = self.device
+        chave = (device.value, device.unit) if device is not None else None
+        if self.celula_valor is not None and chave == self._chave:
+            return False
+        self._chave = chave
+        self.celula_valor = _celula(f"{chave[0]} {chave[1]}" if chave is not None else SEM_VALOR) + '</tr>'
+        return True
+
+    def __getitem__(self, campo):
+        # Compatível com o antigo dicionário {'dispositivo', 'subscriber', 'observer'}
+        return getattr(self, campo)
+
+
+##################### MODELO DE RENDERIZAÇÃO DA TABELA DE ASSOCIAÇÕES #########################################################
+
+class AssociationTable:
+    def __init__(self, classe="association-table"):
+        self.classe = classe
+        self._linhas = []
+        self._chaves = set()  # (tag, subscriber) para detectar associações duplicadas em O(1)
+        self._html = None     # Tabela completa da última renderização; None força remontar
+
+    def adicionar(self, dispositivo, subscriber, observer, device=None):
+        linha = AssociationRow(dispositivo, subscriber, observer, device)
+        linha.renderizar_prefixo(len(self._linhas) + 1)
+        linha.atualizar_valor()
+        self._linhas.append(linha)
+        self._chaves.add((dispositivo, subscriber))
+        self._html = None
+        return linha
+
+    def existe(self, dispositivo, subscriber):
+        return (dispositivo, subscriber) in self._chaves
+
+    def remover(self, dispositivo, subscriber):
+        # Pela chave, não pela posição: outra sessão pode ter deslocado as linhas desde a renderização
+        if (dispositivo, subscriber) not in self._chaves:
+            raise KeyError((dispositivo, subscriber))
+        indice = next(i for i, linha in enumerate(self._linhas)
+                      if linha.dispositivo == dispositivo and linha.subscriber == subscriber)
+        linha = self._linhas.pop(indice)
+        self._chaves.discard((dispositivo, subscriber))
+        for numero, seguinte in enumerate(self._linhas[indice:], start=indice + 1):
+            seguinte.renderizar_prefixo(numero)  # Só as linhas após a removida são renumeradas
+        self._html = None
+        return linha
+
+    def atualizar(self):
+        # Retorna quantas células de valor foram refeitas nesta chamada
+        alteradas = 0
+        for linha in self._linhas:
+            if linha.atualizar_valor():
+                alteradas += 1
+        if alteradas:
+            self._html = None
+        return alteradas
+
+    def html(self):
+        self.atualizar()
+        if self._html is None:
+            cabecalho = ''.join(f'<th class="table-header">{titulo}</th>' for titulo in CABECALHO)
+            corpo = ''.join(linha.prefixo + linha.celula_valor for linha in self._linhas)
+            self._html = f'<table class="{self.classe}"><thead><tr>{cabecalho}</tr></thead><tbody>{corpo}</tbody></table>'
+        return self._html
+
+    def __len__(self):
+        return len(self._linhas)
+
+    def __iter__(self):
+        return iter(self._linhas)
+
+    def __getitem__(self, indice):
+        return self._linhas[indice]
+
+    def __repr__(self):
+        return f"AssociationTable(linhas={len(self._linhas)})"
@@ -0,0 +1,62 @@
+# src/routing.py
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DISPOSITIVO_PADRAO = "A1-AI-TIT01"  # Canal 0 sem rota na lista de I/O (firmware de um único sensor)
+
+
+##################### TABELA DE ROTAS (porta, canal) -> dispositivo ###########################################################
+
+class RoutingTable:
+    def __init__(self, tag_padrao=DISPOSITIVO_PADRAO):
+        self._rotas = {}  # (porta, canal) -> dispositivo; porta None vale para qualquer porta
+        self.tag_padrao = tag_padrao
+        self.padrao = None  # Destino do canal 0 quando nenhuma rota o declara
+
+    @classmethod
+    def from_devices(cls, dispositivos, tag_padrao=DISPOSITIVO_PADRAO):
+        rotas = cls(tag_padrao)
+        for dispositivo in dispositivos:
+            rotas.registrar(dispositivo)
+        return rotas
+
+    def registrar(self, dispositivo):
+        if dispositivo.tag == self.tag_padrao:
+            self.padrao = dispositivo
+        canal = getattr(dispositivo, 'canal', None)
+        if canal is None:
+            return
+        chave = (dispositivo.porta, canal)
+        atual = self._rotas.get(chave)
+        if atual is not None and atual is not dispositivo:
+            raise ValueError(f"Porta {chave[0] or '*'} canal {canal} já roteado para {atual.tag} "
+                             f"(conflito com {dispositivo.tag})")
+        self._rotas[chave] = dispositivo
+
+    def descartar(self, dispositivo):
+        canal = getattr(dispositivo, 'canal', None)
+        if canal is not None and self._rotas.get((dispositivo.porta, canal)) is dispositivo:
+            del self._rotas[(dispositivo.porta, canal)]
+        if self.padrao is dispositivo:
+            self.padrao = None
+
+    def resolver(self, porta, canal):
+        # Rota da porta, depois rota sem porta, depois o destino padrão do canal 0
+        dispositivo = self._rotas.get((porta, canal))
+        if dispositivo is None and porta is not None:
+            dispositivo = self._rotas.get((None, canal))
+        if dispositivo is None and canal == 0:
+            dispositivo = self.padrao
+        return dispositivo
+
+    def __len__(self):
+        return len(self._rotas)
+
+    def __iter__(self):
+        return iter(self._rotas.items())
+
+    def __repr__(self):
+        padrao = self.padrao.tag if self.padrao is not None else None
+        return f"RoutingTable(rotas={len(self._rotas)}, padrao={padrao})"
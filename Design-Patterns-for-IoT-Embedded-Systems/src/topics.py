@@ -0,0 +1,153 @@
+# src/topics.py
+
+import itertools
+
+# Padrões sobre os segmentos da TAG (A1-AI-TIT01 -> A1 / AI / TIT01)
+SEPARADOR = '-'
+CURINGA = '*'      # Exatamente um segmento: A1-AI-* casa A1-AI-TIT01
+MULTINIVEL = '#'   # Zero ou mais segmentos finais (só como último segmento): A1-# casa toda a área A1
+PREFIXO_AREA = 'area:'  # Por área da lista de I/O, independente da TAG: area:1
+
+
+def e_padrao(texto):
+    return CURINGA in texto or MULTINIVEL in texto or texto.startswith(PREFIXO_AREA)
+
+
+def _segmentos(padrao):
+    segmentos = padrao.split(SEPARADOR)
+    for i, segmento in enumerate(segmentos):
+        if not segmento:
+            raise ValueError(f"Padrão com segmento vazio: {padrao!r}")
+        if segmento == MULTINIVEL and i != len(segmentos) - 1:
+            raise ValueError(f"'{MULTINIVEL}' só pode ser o último segmento: {padrao!r}")
+        if segmento not in (CURINGA, MULTINIVEL) and (CURINGA in segmento or MULTINIVEL in segmento):
+            raise ValueError(f"Curinga deve ocupar um segmento inteiro: {padrao!r}")
+    return segmentos
+
+
+class _No:
+    __slots__ = ('filhos', 'curinga', 'multinivel', 'valores')
+
+    def __init__(self):
+        self.filhos = {}
+        self.curinga = None
+        self.multinivel = None
+        self.valores = {}  # chave da assinatura -> valor
+
+    def vazio(self):
+        return not (self.filhos or self.curinga or self.multinivel or self.valores)
+
+
+##################### TRIE DE ASSINATURAS POR PADRÃO DE TAG ##################################################################
+
+class TopicTrie:
+    def __init__(self):
+        self._raiz = _No()
+        self._por_area = {}      # str(area) -> {chave: valor}
+        self._assinaturas = {}   # chave -> padrão
+        self._chaves = itertools.count()
+        # (tag, area) -> valores: as TAGs vêm da lista de I/O (conjunto fixo), então cada uma percorre a trie
+        # uma vez por alteração de assinaturas; depois a consulta é um acesso a dicionário
+        self._cache = {}
+
+    def adicionar(self, padrao, valor):
+        chave = next(self._chaves)
+        if padrao.startswith(PREFIXO_AREA):
+            area = padrao[len(PREFIXO_AREA):].strip()
+            if not area:
+                raise ValueError(f"Área vazia no padrão: {padrao!r}")
+            self._por_area.setdefault(area, {})[chave] = valor
+        else:
+            no = self._raiz
+            for segmento in _segmentos(padrao):
+                if segmento == CURINGA:
+                    no.curinga = no.curinga or _No()
+                    no = no.curinga
+                elif segmento == MULTINIVEL:
+                    no.multinivel = no.multinivel or _No()
+                    no = no.multinivel
+                else:
+                    no = no.filhos.setdefault(segmento, _No())
+            no.valores[chave] = valor
+        self._assinaturas[chave] = padrao
+        self._cache.clear()
+        return chave
+
+    def remover(self, chave):
+        padrao = self._assinaturas.pop(chave)
+        self._cache.clear()
+        if padrao.startswith(PREFIXO_AREA):
+            area = padrao[len(PREFIXO_AREA):].strip()
+            del self._por_area[area][chave]
+            if not self._por_area[area]:
+                del self._por_area[area]
+            return
+
+        # Desce guardando o caminho para podar os nós que ficarem vazios
+        caminho = []
+        no = self._raiz
+        for segmento in _segmentos(padrao):
+            caminho.append((no, segmento))
+            if segmento == CURINGA:
+                no = no.curinga
+            elif segmento == MULTINIVEL:
+                no = no.multinivel
+            else:
+                no = no.filhos[segmento]
+        del no.valores[chave]
+        for pai, segmento in reversed(caminho):
+            if not no.vazio():
+                break
+            if segmento == CURINGA:
+                pai.curinga = None
+            elif segmento == MULTINIVEL:
+                pai.multinivel = None
+            else:
+                del pai.filhos[segmento]
+            no = pai
+
+    def casar(self, tag, area=None):
+        # Valores (sem repetição) de todas as assinaturas que casam com a TAG ou com a área.
+        # O custo depende do número de segmentos da TAG, não do número de assinaturas
+        chave_cache = (tag, area)
+        valores = self._cache.get(chave_cache)
+        if valores is not None:
+            return valores
+
+        encontrados = []
+        ativos = [self._raiz]
+        for segmento in tag.split(SEPARADOR):
+            proximos = []
+            for no in ativos:
+                if no.multinivel is not None:
+                    encontrados.extend(no.multinivel.valores.values())
+                filho = no.filhos.get(segmento)
+                if filho is not None:
+                    proximos.append(filho)
+                if no.curinga is not None:
+                    proximos.append(no.curinga)
+            ativos = proximos
+            if not ativos:
+                break
+        for no in ativos:
+            encontrados.extend(no.valores.values())
+            if no.multinivel is not None:  # '#' também casa com zero segmentos
+                encontrados.extend(no.multinivel.valores.values())
+        if area is not None:
+            encontrados.extend(self._por_area.get(str(area), {}).values())
+
+        valores = self._cache[chave_cache] = tuple(dict.fromkeys(encontrados))
+        return valores
+
+    def __len__(self):
+        return len(self._assinaturas)
+
+    def __repr__(self):
+        return f"TopicTrie(assinaturas={len(self._assinaturas)})"
+
+
+def filtrar(padrao, dispositivos):
+    # Dispositivos que casam com um único padrão (ex.: ao criar a assinatura)
+    trie = TopicTrie()
+    trie.adicionar(padrao, True)
+    return [dispositivo for dispositivo in dispositivos if trie.casar(dispositivo.tag, dispositivo.area)]
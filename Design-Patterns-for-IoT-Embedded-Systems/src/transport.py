@@ -0,0 +1,84 @@
+# src/transport.py
+
+import os
+import threading
+import time
+
+import serial
+
+PORTA_PADRAO = 'COM5'
+BAUDRATE_PADRAO = 115200
+ESTABILIZACAO_PADRAO = 2.0  # O NodeMCU reinicia ao abrir a porta
+
+
+##################### TRANSPORTE SERIAL COM CONEXÃO SOB DEMANDA ##############################################################
+
+class SerialTransport:
+    def __init__(self, port=None, baudrate=None, tempo_estabilizacao=None, serial_port=None):
+        # Sem argumentos, usa as variáveis de ambiente e depois os valores padrão
+        self.port = port or os.environ.get('BROKER_SERIAL_PORT', PORTA_PADRAO)
+        self.baudrate = int(baudrate or os.environ.get('BROKER_SERIAL_BAUD', BAUDRATE_PADRAO))
+        if tempo_estabilizacao is None:
+            tempo_estabilizacao = float(os.environ.get('BROKER_SERIAL_SETTLE', ESTABILIZACAO_PADRAO))
+        self.tempo_estabilizacao = tempo_estabilizacao
+        self._serial = serial_port  # Permite reaproveitar uma porta já aberta
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_serial(cls, serial_port):
+        return cls(serial_port.port, serial_port.baudrate, tempo_estabilizacao=0, serial_port=serial_port)
+
+    @property
+    def conectado(self):
+        return self._serial is not None and self._serial.is_open
+
+    def conectar(self):
+        # A porta só é aberta aqui, nunca na importação dos módulos
+        with self._lock:
+            if self._serial is None:
+                # serial_for_url aceita COMx, /dev/tty*, pty e URLs como loop://
+                self._serial = serial.serial_for_url(self.port, self.baudrate, timeout=0)
+                if self.tempo_estabilizacao > 0:
+                    time.sleep(self.tempo_estabilizacao)
+        return self
+
+    @property
+    def serial(self):
+        return self.conectar()._serial
+
+    def fileno(self):
+        # Retorna None quando a porta não expõe descritor (Windows, loop://)
+        try:
+            return self._serial.fileno()
+        except (AttributeError, NotImplementedError, OSError, ValueError):  # io.UnsupportedOperation
+            return None
+
+    def ler_disponivel(self):
+        pendentes = self._serial.in_waiting
+        if pendentes <= 0:
+            return b''
+        return self._serial.read(pendentes)
+
+    def ler_bloqueante(self, timeout):
+        # Para portas sem descritor (COMx no Windows): bloqueia na própria porta até chegar
+        # ao menos um byte ou vencer o timeout, sem laço de polling com sleep
+        porta = self._serial
+        if porta.timeout != timeout:
+            porta.timeout = timeout
+        dados = porta.read(1)
+        if not dados:
+            return b''
+        pendentes = porta.in_waiting
+        return dados + porta.read(pendentes) if pendentes > 0 else dados
+
+    def escrever(self, dados):
+        return self.serial.write(dados)
+
+    def fechar(self):
+        with self._lock:
+            if self._serial is not None and self._serial.is_open:
+                self._serial.close()
+            self._serial = None
+
+    def __repr__(self):
+        return f"SerialTransport(port={self.port}, baudrate={self.baudrate}, conectado={self.conectado})"
@@ -0,0 +1,208 @@
+# src/value_table.py
+
+import time
+
+import numpy as np
+
+# Qualidade de cada ponto na tabela
+QUALIDADE_SEM_LEITURA = 0
+QUALIDADE_BOA = 1
+QUALIDADE_INVALIDA = 2  # update_value(None)
+
+# Resultado de validar_lote
+LEITURA_VALIDA = 0
+FORA_DA_FAIXA = 1
+TAXA_EXCEDIDA = 2
+
+
+def _como_float(valor):
+    # Range Min/Max vazios ou não numéricos na planilha viram NaN (sem limite)
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _limites(range_min, range_max):
+    # NaN significa sem limite daquele lado; aceita faixas invertidas na planilha (Range Min > Range Max)
+    inferior = -np.inf if np.isnan(range_min) else range_min
+    superior = np.inf if np.isnan(range_max) else range_max
+    if inferior > superior:
+        inferior, superior = superior, inferior
+    return inferior, superior
+
+
+##################### TABELA COLUNAR DE VALORES ATUAIS DOS PONTOS AI #########################################################
+
+class AIValueTable:
+    def __init__(self, capacidade=64):
+        self._tamanho = 0
+        self.tags = []
+        self.areas = []  # Área de cada código usado em _area_codes
+        self._codigo_por_area = {}
+        self._indice_por_tag = {}
+        self._alocar(max(capacidade, 1))
+
+    @classmethod
+    def from_devices(cls, dispositivos):
+        dispositivos = list(dispositivos)
+        tabela = cls(capacidade=len(dispositivos))
+        for dispositivo in dispositivos:
+            tabela.registrar(dispositivo)
+        return tabela
+
+    def _alocar(self, capacidade):
+        n = self._tamanho
+        novos = {
+            'values': np.full(capacidade, np.nan),
+            'timestamps': np.zeros(capacidade),
+            'quality': np.zeros(capacidade, dtype=np.uint8),
+            'range_min': np.full(capacidade, np.nan),
+            'range_max': np.full(capacidade, np.nan),
+            # Limites de validação pré-calculados no registro: a ingestão só compara arrays
+            'limite_inf': np.full(capacidade, -np.inf),
+            'limite_sup': np.full(capacidade, np.inf),
+            'taxa_max': np.full(capacidade, np.inf),
+            '_area_codes': np.zeros(capacidade, dtype=np.int32),
+        }
+        for nome, array in novos.items():
+            if n:
+                array[:n] = getattr(self, nome)[:n]
+            setattr(self, nome, array)
+
+    def registrar(self, dispositivo):
+        if dispositivo.tag in self._indice_por_tag:
+            indice = self._indice_por_tag[dispositivo.tag]
+        else:
+            if self._tamanho == len(self.values):
+                self._alocar(2 * len(self.values))  # Crescimento geométrico
+            indice = self._tamanho
+            self._tamanho += 1
+            self.tags.append(dispositivo.tag)
+            self._indice_por_tag[dispositivo.tag] = indice
+
+        codigo = self._codigo_por_area.get(dispositivo.area)
+        if codigo is None:
+            codigo = self._codigo_por_area[dispositivo.area] = len(self.areas)
+            self.areas.append(dispositivo.area)
+        self._area_codes[indice] = codigo
+        self.range_min[indice] = range_min = _como_float(dispositivo.range_min)
+        self.range_max[indice] = range_max = _como_float(dispositivo.range_max)
+        self.limite_inf[indice], self.limite_sup[indice] = _limites(range_min, range_max)
+        taxa = _como_float(getattr(dispositivo, 'taxa_max', None))
+        self.taxa_max[indice] = taxa if taxa > 0 else np.inf
+
+        dispositivo.bind_value_table(self, indice)
+        if dispositivo.value is not None:
+            self.escrever(indice, dispositivo.value)
+        return indice
+
+    def descartar(self, dispositivo):
+        # O índice não é reaproveitado; o ponto só deixa de entrar nas consultas
+        indice = self._indice_por_tag[dispositivo.tag]
+        self.quality[indice] = QUALIDADE_SEM_LEITURA
+        self.values[indice] = np.nan
+        dispositivo.bind_value_table(None, None)
+
+    def indice(self, tag):
+        return self._indice_por_tag[tag]
+
+    def escrever(self, indice, valor, timestamp=None):
+        if valor is None:
+            self.values[indice] = np.nan
+            self.quality[indice] = QUALIDADE_INVALIDA
+        else:
+            self.values[indice] = valor
+            self.quality[indice] = QUALIDADE_BOA
+        self.timestamps[indice] = time.time() if timestamp is None else timestamp
+
+    def __len__(self):
+        return self._tamanho
+
+    ##################### CONSULTAS VETORIZADAS ##############################################################################
+
+    def snapshot(self):
+        # Cópia consistente das colunas, independente de escritas posteriores
+        n = self._tamanho
+        return {
+            'tag': list(self.tags),
+            'value': self.values[:n].copy(),
+            'timestamp': self.timestamps[:n].copy(),
+            'quality': self.quality[:n].copy(),
+        }
+
+    def mascara_valida(self):
+        return self.quality[:self._tamanho] == QUALIDADE_BOA
+
+    def fora_da_faixa(self):
+        n = self._tamanho
+        valores = self.values[:n]
+        with np.errstate(invalid='ignore'):
+            return self.mascara_valida() & ((valores < self.limite_inf[:n]) | (valores > self.limite_sup[:n]))
+
+    def validar_lote(self, indices, valores, agora=None):
+        # Valida leituras novas contra a faixa e a taxa de variação de cada ponto, antes de escrevê-las.
+        # Retorna um array com LEITURA_VALIDA, FORA_DA_FAIXA ou TAXA_EXCEDIDA por leitura.
+        indices = np.asarray(indices, dtype=np.intp)
+        valores = np.asarray(valores, dtype=float)
+        agora = time.time() if agora is None else agora
+
+        na_faixa = (valores >= self.limite_inf[indices]) & (valores <= self.limite_sup[indices])
+        taxa = self.taxa_max[indices]
+        intervalo = agora - self.timestamps[indices]
+        with np.errstate(invalid='ignore'):
+            # Sem limite (inf) ou sem leitura boa anterior: não há taxa a verificar
+            taxa_ok = (np.isinf(taxa) | (self.quality[indices] != QUALIDADE_BOA)
+                       | (np.abs(valores - self.values[indices]) <= taxa * intervalo))
+
+        resultado = np.full(len(indices), LEITURA_VALIDA, dtype=np.uint8)
+        resultado[~taxa_ok] = TAXA_EXCEDIDA
+        resultado[~na_faixa] = FORA_DA_FAIXA
+        if len(indices) > 1:
+            self._revalidar_repetidos(indices, valores, resultado)
+        return resultado
+
+    def _revalidar_repetidos(self, indices, valores, resultado):
+        # Um bloco do parse_chunk pode trazer várias leituras do mesmo ponto: a partir da primeira aceita,
+        # as seguintes são comparadas com ela, em ordem, e não com o estado anterior ao lote
+        unicos, contagens = np.unique(indices, return_counts=True)
+        repetidos = unicos[(contagens > 1) & ~np.isinf(self.taxa_max[unicos])]
+        if not len(repetidos):
+            return
+        aceitos = {}  # índice -> último valor aceito neste lote
+        for posicao in np.flatnonzero(np.isin(indices, repetidos)).tolist():
+            indice = int(indices[posicao])
+            if indice not in aceitos:
+                # Nenhuma leitura aceita ainda: vale a comparação com a tabela
+                if resultado[posicao] == LEITURA_VALIDA:
+                    aceitos[indice] = valores[posicao]
+            elif resultado[posicao] != FORA_DA_FAIXA:
+                # Mesmo instante da leitura aceita antes (intervalo zero): qualquer variação excede Rate Max
+                if valores[posicao] == aceitos[indice]:
+                    resultado[posicao] = LEITURA_VALIDA
+                else:
+                    resultado[posicao] = TAXA_EXCEDIDA
+
+    def estatisticas_por_area(self):
+        n = self._tamanho
+        validos = self.mascara_valida()
+        codigos = self._area_codes[:n][validos]
+        valores = self.values[:n][validos]
+        if not len(valores):
+            return {}
+
+        # Agrupa por área com uma ordenação e reduceat, sem laço por ponto
+        ordem = np.argsort(codigos, kind='stable')
+        codigos = codigos[ordem]
+        valores = valores[ordem]
+        inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+        contagens = np.diff(np.r_[inicios, len(valores)])
+
+        minimos = np.minimum.reduceat(valores, inicios)
+        maximos = np.maximum.reduceat(valores, inicios)
+        medias = np.add.reduceat(valores, inicios) / contagens
+
+        return {
+            self.areas[codigo]: {'min': float(mn), 'max': float(mx), 'mean': float(md), 'count': int(c)}
+            for codigo, mn, mx, md, c in zip(codigos[inicios], minimos, maximos, medias, contagens)
+        }
@@ -0,0 +1,100 @@
+import os
+import sys
+import gc
+import tracemalloc
+import pytest
+
+# Adicionar diretórios necessários ao path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importações dos módulos a serem testados
+from src.devices import AIDevicePublisher, DODevice
+
+# Marcadores específicos para testes de desempenho
+pytestmark = [pytest.mark.performance, pytest.mark.devices]
+
+NUM_DEVICES = 20_000
+# Bytes por dispositivo (objeto + ponteiro na lista), CPython 64 bits; o estado opcional do AI fica fora do objeto
+ORCAMENTO_BYTES = {"AI": 128, "DO": 80}
+
+
+# Modelo anterior (baseado em __dict__), mantido apenas como referência de memória
+class LegacyDevice:
+    def __init__(self, tag, area, descricao, tipo):
+        self.tag = tag
+        self.area = area
+        self.descricao = descricao
+        self.tipo = tipo
+
+
+class LegacyAIDevicePublisher(LegacyDevice):
+    def __init__(self, tag, area, descricao, range_min, range_max, unit):
+        super().__init__(tag, area, descricao, "AI")
+        self.range_min = range_min
+        self.range_max = range_max
+        self.unit = unit
+        self.value = None
+        self.subscribers = []
+
+
+class LegacyDODevice(LegacyDevice):
+    def __init__(self, tag, area, descricao):
+        super().__init__(tag, area, descricao, "DO")
+
+
+def medir_bytes_por_dispositivo(fabrica):
+    """Mede a memória alocada por dispositivo, sem contar as strings compartilhadas."""
+    tags = [f"A1-AI-P{i:06d}" for i in range(NUM_DEVICES)]
+    gc.collect()
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    dispositivos = [fabrica(tag) for tag in tags]
+    fim, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(dispositivos) == NUM_DEVICES
+    return (fim - inicio) / NUM_DEVICES
+
+
+@pytest.mark.parametrize("nome, legado, atual", [
+    ("AI", lambda tag: LegacyAIDevicePublisher(tag, 1, "Sensor", 0, 100, "°C"),
+           lambda tag: AIDevicePublisher(tag, 1, "Sensor", 0, 100, "°C")),
+    ("DO", lambda tag: LegacyDODevice(tag, 1, "Válvula"),
+           lambda tag: DODevice(tag, 1, "Válvula")),
+])
+def test_memoria_por_dispositivo(nome, legado, atual):
+    """Compara a memória por dispositivo entre o modelo com __dict__ e o modelo com __slots__."""
+    bytes_legado = medir_bytes_por_dispositivo(legado)
+    bytes_atual = medir_bytes_por_dispositivo(atual)
+
+    print(f"\n{nome}: __dict__={bytes_legado:.0f} B/dispositivo, __slots__={bytes_atual:.0f} B/dispositivo "
+          f"({100 * (1 - bytes_atual / bytes_legado):.0f}% menor)")
+
+    assert bytes_atual < bytes_legado
+    assert bytes_atual <= ORCAMENTO_BYTES[nome]
+
+
+def test_dispositivos_sem_dict():
+    """Garante que os dispositivos não voltem a ter __dict__ por instância."""
+    assert not hasattr(AIDevicePublisher("A1-AI-TIT01", 1, "Sensor", 0, 100, "°C"), '__dict__')
+    assert not hasattr(DODevice("A1-VA11", 1, "Válvula"), '__dict__')
+
+
+def test_estado_opcional_alocado_sob_demanda():
+    """Garante que rota, inscritos, tabela, histórico, lote e banda morta só alocam memória quando usados."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Sensor", 0, 100, "°C", taxa_max=None, porta=None, canal=None)
+    dispositivo.update_value(25.0)
+    dispositivo.set_batch()
+    dispositivo.set_deadband()
+    dispositivo.bind_value_table(None, None)
+    assert dispositivo._extras is None
+
+    dispositivo.canal = 3
+    assert dispositivo._extras is not None and dispositivo.canal == 3
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import pytest
+
+# Adicionar diretórios necessários ao path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importações dos módulos a serem testados
+from src.framing import FrameDecoder, codificar_quadro
+from src.line_parser import LineParser
+
+# Marcadores específicos para testes de desempenho
+pytestmark = [pytest.mark.performance]
+
+NUM_CANAIS = 8
+BAUD_BYTES_POR_S = 115200 / 10  # 8N1: 10 bits por byte
+
+
+def test_binario_vs_texto_multicanal():
+    """Compara bytes no fio e tempo de decodificação: quadros binários vs linhas tag=valor."""
+    num_leituras = 200_000
+    valores = [(i % NUM_CANAIS, 20 + (i % 1000) / 100) for i in range(num_leituras)]
+    texto = b"".join(f"A1-AI-CH{canal:02d}={valor:.2f}\n".encode() for canal, valor in valores)
+    binario = b"".join(codificar_quadro(canal, i // NUM_CANAIS, valor) for i, (canal, valor) in enumerate(valores))
+
+    tempo_texto = tempo_binario = float('inf')
+    for _ in range(3):
+        parser = LineParser()
+        start_time = time.perf_counter()
+        leituras_texto, _ = parser.parse_chunk(texto)
+        tempo_texto = min(tempo_texto, time.perf_counter() - start_time)
+
+        decoder = FrameDecoder()
+        start_time = time.perf_counter()
+        leituras_binario = []
+        for inicio in range(0, len(binario), 4096):  # Blocos como os entregues pela porta
+            leituras_binario += decoder.feed(binario[inicio:inicio + 4096])
+        tempo_binario = min(tempo_binario, time.perf_counter() - start_time)
+
+    print(f"\nTexto: {len(texto) / num_leituras:.1f} B/leitura ({BAUD_BYTES_POR_S * num_leituras / len(texto):,.0f} "
+          f"leituras/s a 115200), {1e9 * tempo_texto / num_leituras:.0f} ns/leitura")
+    print(f"Binário: {len(binario) / num_leituras:.1f} B/leitura ({BAUD_BYTES_POR_S * num_leituras / len(binario):,.0f} "
+          f"leituras/s a 115200), {1e9 * tempo_binario / num_leituras:.0f} ns/leitura")
+
+    assert len(leituras_texto) == len(leituras_binario) == num_leituras
+    assert decoder.perdidos == 0 and decoder.crc_invalidos == 0
+    assert len(binario) < len(texto)
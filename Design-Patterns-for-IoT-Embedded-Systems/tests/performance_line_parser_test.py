@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import pytest
+
+# Adicionar diretórios necessários ao path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importações dos módulos a serem testados
+from src.line_parser import LineParser
+
+# Marcadores específicos para testes de desempenho
+pytestmark = [pytest.mark.performance]
+
+
+# Validação anterior de ler_sensor, mantida apenas como referência de desempenho
+def validar_legado(linha):
+    linha = linha.decode('utf-8', errors='replace').strip()
+    if linha.replace('.', '', 1).isdigit() and linha.count('.') <= 1:
+        try:
+            return float(linha)
+        except ValueError:
+            return None
+    return None
+
+
+def gerar_bloco(num_linhas):
+    """Bloco como chega da serial: leituras de 2 casas, 1% de linhas corrompidas."""
+    linhas = [b"#@!" if i % 100 == 0 else f"{20 + (i % 1000) / 100:.2f}\r".encode() for i in range(num_linhas)]
+    return b"\n".join(linhas) + b"\n"
+
+
+@pytest.mark.parametrize("num_linhas", [
+    200_000,
+    pytest.param(2_000_000, marks=pytest.mark.slow),
+])
+def test_parser_vs_validacao_legada(num_linhas):
+    """Compara o parser em bytes com decode/strip/isdigit por linha."""
+    bloco = gerar_bloco(num_linhas)
+    linhas = bloco[:-1].split(b"\n")
+
+    # Melhor de 3 execuções, para reduzir o ruído da máquina
+    tempo_legado = tempo_parser = float('inf')
+    for _ in range(3):
+        start_time = time.perf_counter()
+        esperado = [v for v in map(validar_legado, linhas) if v is not None]
+        tempo_legado = min(tempo_legado, time.perf_counter() - start_time)
+
+        parser = LineParser()
+        start_time = time.perf_counter()
+        leituras, resto = parser.parse_chunk(bloco)
+        tempo_parser = min(tempo_parser, time.perf_counter() - start_time)
+
+    print(f"\n{num_linhas:,} linhas: legado={tempo_legado:.3f}s ({1e9 * tempo_legado / num_linhas:.0f} ns/linha), "
+          f"parser={tempo_parser:.3f}s ({1e9 * tempo_parser / num_linhas:.0f} ns/linha), "
+          f"{tempo_legado / tempo_parser:.1f}x")
+
+    assert resto == b""
+    assert [valor for _, valor in leituras] == esperado
+    assert parser.rejeitadas == num_linhas // 100
+    assert tempo_parser < tempo_legado
@@ -0,0 +1,72 @@
+import os
+import sys
+import io
+import time
+import logging
+import contextlib
+import pytest
+
+# Adicionar diretórios necessários ao path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importações dos módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.log_config import configurar_logging, parar_logging
+
+# Marcadores específicos para testes de desempenho
+pytestmark = [pytest.mark.performance]
+
+NUM_LEITURAS = 20_000
+
+
+class LegacyPrintPublisher(AIDevicePublisher):
+    """Reproduz o update_value anterior, que imprimia cada leitura em stdout."""
+    __slots__ = ()
+
+    def update_value(self, new_value):
+        self.value = new_value
+        print(f"Atualizando {self.tag} com valor {self.value} {self.unit}")
+        self.notify()
+
+
+def medir_leituras_por_segundo(dispositivo):
+    """Mede a taxa de update_value em leituras por segundo."""
+    start_time = time.perf_counter()
+    for i in range(NUM_LEITURAS):
+        dispositivo.update_value(20.0 + i % 10)
+    return NUM_LEITURAS / (time.perf_counter() - start_time)
+
+
+@pytest.fixture(autouse=True)
+def restaurar_logging():
+    yield
+    parar_logging()
+
+
+def test_throughput_logging_ligado_e_desligado():
+    """Compara print() em stdout com o logging em fila habilitado (DEBUG) e desabilitado (INFO)."""
+    criar = lambda cls: cls("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+
+    # stdout redirecionado para memória: o custo real em terminal/arquivo é ainda maior
+    with contextlib.redirect_stdout(io.StringIO()):
+        taxa_print = medir_leituras_por_segundo(criar(LegacyPrintPublisher))
+
+    configurar_logging(logging.DEBUG, handlers=[logging.NullHandler()], reconfigurar=True)
+    taxa_debug = medir_leituras_por_segundo(criar(AIDevicePublisher))
+
+    configurar_logging(logging.INFO, handlers=[logging.NullHandler()], reconfigurar=True)
+    taxa_info = medir_leituras_por_segundo(criar(AIDevicePublisher))
+
+    print(f"\nprint(): {taxa_print:,.0f} leituras/s | logging DEBUG (fila): {taxa_debug:,.0f} leituras/s | "
+          f"logging INFO (desabilitado): {taxa_info:,.0f} leituras/s")
+
+    # Com o nível desabilitado, o registro não é formatado nem enfileirado
+    assert taxa_info > taxa_print
@@ -0,0 +1,128 @@
+import os
+import random
+import sys
+import threading
+import time
+import pytest
+
+# Adicionar diretórios necessários ao path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importações dos módulos a serem testados
+from src.devices import AIDevicePublisher
+
+# Marcadores específicos para testes de desempenho
+pytestmark = [pytest.mark.performance, pytest.mark.observer]
+
+DURACAO = 1.0  # Segundos de estresse
+NUM_THREADS_UI = 4  # Threads que fazem attach/detach, como sessões do Streamlit
+NUM_FIXOS = 50
+
+
+class ContadorSubscriber:
+    def __init__(self):
+        self.chamadas = 0
+
+    def update(self, subject):
+        self.chamadas += 1
+
+
+def test_estresse_attach_detach_durante_notificacao():
+    """Ingestão notificando sem parar enquanto outras threads inscrevem e removem observadores."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+    fixos = [ContadorSubscriber() for _ in range(NUM_FIXOS)]
+    for subscriber in fixos:
+        dispositivo.attach(subscriber)
+
+    parar = threading.Event()
+    erros = []
+    contagens = {'notificacoes': 0, 'alteracoes': 0}
+
+    def ingestao():
+        valor = 0.0
+        try:
+            while not parar.is_set():
+                dispositivo.update_value(valor)
+                valor += 1.0
+                contagens['notificacoes'] += 1
+        except Exception as exc:  # Com a lista mutável: "list.remove(x): x not in list", itens pulados etc.
+            erros.append(exc)
+
+    def interface():
+        try:
+            while not parar.is_set():
+                temporarios = [ContadorSubscriber() for _ in range(5)]
+                for subscriber in temporarios:
+                    dispositivo.attach(subscriber)
+                for subscriber in temporarios:
+                    dispositivo.detach(subscriber)
+                contagens['alteracoes'] += 10
+        except Exception as exc:
+            erros.append(exc)
+
+    threads = [threading.Thread(target=ingestao)] + [threading.Thread(target=interface) for _ in range(NUM_THREADS_UI)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURACAO)
+    parar.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"\n{contagens['notificacoes'] / DURACAO:,.0f} notificações/s com "
+          f"{contagens['alteracoes'] / DURACAO:,.0f} attach/detach/s concorrentes")
+
+    assert erros == []
+    assert dispositivo.subscribers == fixos  # Só os temporários saíram, na ordem de inscrição
+    # Observadores fixos nunca são pulados por alterações concorrentes
+    assert all(subscriber.chamadas == contagens['notificacoes'] for subscriber in fixos)
+
+
+def test_notify_sem_alteracoes_nao_usa_lock():
+    """Mede notify() com inscritos estáveis: a tupla é reaproveitada entre notificações."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+    for _ in range(NUM_FIXOS):
+        dispositivo.attach(ContadorSubscriber())
+    dispositivo.notify()
+    tupla = dispositivo._subscribers
+
+    n = 20_000
+    inicio = time.perf_counter()
+    for _ in range(n):
+        dispositivo.notify()
+    duracao = time.perf_counter() - inicio
+
+    print(f"\nnotify() com {NUM_FIXOS} inscritos: {1e6 * duracao / n:.1f} µs")
+    assert dispositivo._subscribers is tupla
+
+
+def test_reducao_de_notificacoes_com_deadband(monkeypatch):
+    """Sinal estável com ruído de ±0,01 °C a 2 leituras/s durante 1 h: compara notificações com e sem banda morta."""
+    relogio = [0.0]
+    monkeypatch.setattr('src.devices.time.monotonic', lambda: relogio[0])
+    gerador = random.Random(0)
+    leituras = [25.0 + gerador.uniform(-0.01, 0.01) for _ in range(7200)]
+
+    def contar(configurar):
+        dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+        contador = ContadorSubscriber()
+        dispositivo.attach(contador)
+        configurar(dispositivo)
+        for i, valor in enumerate(leituras):
+            relogio[0] = i * 0.5
+            dispositivo.update_value(valor)
+        return contador.chamadas
+
+    sem_filtro = contar(lambda d: None)
+    com_filtro = contar(lambda d: d.set_deadband(percentual=0.1, heartbeat=5.0))
+
+    print(f"\nNotificações em 1 h: sem banda morta={sem_filtro}, com banda morta={com_filtro} "
+          f"({sem_filtro / com_filtro:.0f}x menos)")
+    assert com_filtro * 5 <= sem_filtro
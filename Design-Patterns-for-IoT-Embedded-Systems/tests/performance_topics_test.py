@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import fnmatch
+import pytest
+
+# Adicionar diretórios necessários ao path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importações dos módulos a serem testados
+from src.topics import TopicTrie
+
+# Marcadores específicos para testes de desempenho
+pytestmark = [pytest.mark.performance]
+
+
+def gerar_padroes(quantidade):
+    """Assinaturas como as de vários consumidores: pontos isolados e curingas por área/tipo."""
+    padroes = []
+    for i in range(quantidade):
+        area = f"A{i % 50}"
+        padroes.append([f"{area}-AI-P{i:05d}", f"{area}-AI-*", f"{area}-#", f"*-AI-P{i:05d}"][i % 4])
+    return padroes
+
+
+@pytest.mark.parametrize("num_padroes", [
+    100,
+    pytest.param(10_000, marks=pytest.mark.slow),
+])
+def test_trie_vs_varredura_fnmatch(num_padroes):
+    """Compara a resolução pela trie (sem cache) com testar cada padrão via fnmatch."""
+    padroes = gerar_padroes(num_padroes)
+    tags = [f"A{i % 50}-AI-P{i:05d}" for i in range(50)]
+    trie = TopicTrie()
+    for i, padrao in enumerate(padroes):
+        trie.adicionar(padrao, i)  # Um valor por assinatura, como uma conexão por padrão
+
+    globs = [padrao.replace('#', '*') for padrao in padroes]
+
+    # Melhor de 3 execuções, para reduzir o ruído da máquina
+    tempo_varredura = tempo_trie = float('inf')
+    for _ in range(3):
+        start_time = time.perf_counter()
+        esperado = [sum(fnmatch.fnmatchcase(tag, glob) for glob in globs) for tag in tags]
+        tempo_varredura = min(tempo_varredura, time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        obtido = []
+        for tag in tags:
+            trie._cache.clear()  # Mede a descida na trie, não o cache por TAG
+            obtido.append(len(trie.casar(tag)))
+        tempo_trie = min(tempo_trie, time.perf_counter() - start_time)
+
+    print(f"\n{num_padroes:,} assinaturas, {len(tags)} TAGs: varredura={1e6 * tempo_varredura / len(tags):.1f} us/TAG, "
+          f"trie={1e6 * tempo_trie / len(tags):.1f} us/TAG, {tempo_varredura / tempo_trie:.1f}x")
+
+    assert obtido == esperado
+    if num_padroes >= 10_000:
+        assert tempo_trie < tempo_varredura
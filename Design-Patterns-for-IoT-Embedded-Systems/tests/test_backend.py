@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+import queue
+import threading
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.backend import BrokerBackend, SubscriberHub, preparar_dispositivos
+from src.devices import AIDevicePublisher, DODevice
+from src.registry import DeviceRegistry
+
+pytestmark = [pytest.mark.unit, pytest.mark.integration]
+
+
+class QueueSource:
+    """Fonte sem descritor alimentada por uma fila (leitura bloqueante)."""
+    port = "fila"
+
+    def __init__(self):
+        self.chegadas = queue.Queue()
+        self.fechada = False
+
+    def conectar(self):
+        return self
+
+    def fileno(self):
+        return None
+
+    def ler_disponivel(self):
+        return b''
+
+    def ler_bloqueante(self, timeout):
+        try:
+            return self.chegadas.get(timeout=timeout)
+        except queue.Empty:
+            return b''
+
+    def fechar(self):
+        self.fechada = True
+
+
+@pytest.fixture
+def registry():
+    """Cria um registro com um ponto AI e um DO."""
+    return DeviceRegistry([
+        AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C"),
+        DODevice("A1-VA11", 1, "Válvula 11"),
+    ])
+
+
+def test_preparar_dispositivos_banda_morta(registry, monkeypatch):
+    """Testa a banda morta desligada por padrão e configurada por variável de ambiente."""
+    monkeypatch.delenv('BROKER_DEADBAND_PERCENT', raising=False)
+    monkeypatch.delenv('BROKER_DEADBAND_HEARTBEAT', raising=False)
+    preparar_dispositivos(registry)
+    assert registry["A1-AI-TIT01"].deadband is None
+
+    monkeypatch.setenv('BROKER_DEADBAND_PERCENT', '0.1')
+    monkeypatch.setenv('BROKER_DEADBAND_HEARTBEAT', '5')
+    deadband = preparar_dispositivos(registry)["A1-AI-TIT01"].deadband
+    assert (deadband.banda, deadband.heartbeat) == (0.9, 5.0)  # 0,1% de 0 a 900 °C
+
+
+def test_hub_associar_e_desassociar(registry):
+    """Testa a criação e a remoção de associações compartilhadas."""
+    hub = SubscriberHub(registry)
+    linha = hub.associar("A1-AI-TIT01", "Painel")
+    dispositivo = registry["A1-AI-TIT01"]
+
+    assert dispositivo.subscribers == [linha.observer]
+    with pytest.raises(ValueError):
+        hub.associar("A1-AI-TIT01", "Painel")
+    with pytest.raises(ValueError):
+        hub.associar("A1-VA11", "Painel")
+    with pytest.raises(ValueError):
+        hub.associar("A1-AI-TIT01", "  ")
+
+    outra = hub.associar("A1-AI-TIT01", "Alarme")
+    hub.desassociar("A1-AI-TIT01", "Painel")  # Remove pela chave, mesmo com outra linha na tabela
+    assert dispositivo.subscribers == [outra.observer]
+    assert hub.linhas() == [outra]
+    with pytest.raises(ValueError):
+        hub.desassociar("A1-AI-TIT01", "Painel")
+    hub.desassociar("A1-AI-TIT01", "Alarme")
+    assert len(hub) == 0
+
+
+def test_hub_associacao_por_padrao(registry):
+    """Testa a assinatura por padrão, a inclusão automática de novos pontos e a remoção."""
+    hub = SubscriberHub(registry)
+    linha = hub.associar("A1-AI-*", "Painel")
+    por_area = hub.associar("area:2", "Área 2")
+    novo = registry.add(AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m"))
+    outro = registry.add(AIDevicePublisher("A2-AI-PIT01", 2, "Pressão", 0, 10, "bar"))
+
+    assert [d.tag for d in linha.device.dispositivos] == ["A1-AI-TIT01", "A1-AI-LIT01"]
+    assert [d.tag for d in por_area.device.dispositivos] == ["A2-AI-PIT01"]
+    assert "2 pontos" in hub.html()
+
+    novo.update_value(12.0)
+    assert "A1-AI-LIT01 = 12.0 m" in hub.html()
+    assert hub.notificacoes() == [("Painel", ["Observer Painel: TAG = A1-AI-LIT01 mudou para 12.0 m"]), ("Área 2", [])]
+    with pytest.raises(ValueError):
+        hub.associar("A1-#-X", "Inválido")
+
+    hub.desassociar("A1-AI-*", "Painel")
+    assert novo.subscribers == [] and registry["A1-AI-TIT01"].subscribers == []
+    registry.add(AIDevicePublisher("A1-AI-FIT01", 1, "Vazão", 0, 50, "m³/h"))
+    assert registry["A1-AI-FIT01"].subscribers == []
+    assert outro.subscribers == [por_area.observer]
+
+
+def test_hub_concorrente(registry):
+    """Testa associações simultâneas de várias sessões sem perder linhas."""
+    hub = SubscriberHub(registry)
+
+    def sessao(n):
+        for i in range(50):
+            hub.associar("A1-AI-TIT01", f"S{n}-{i}")
+            hub.html()
+
+    threads = [threading.Thread(target=sessao, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(hub.linhas()) == 200
+    assert len(registry["A1-AI-TIT01"].subscribers) == 200
+
+
+def test_backend_ingestao_unica(registry):
+    """Testa que o backend roda uma única ingestão e expõe as métricas do motor."""
+    fonte = QueueSource()
+    backend = BrokerBackend(registry, fontes=[fonte])
+
+    assert backend.iniciar() is backend.iniciar()  # Segunda chamada não cria outra thread
+    fonte.chegadas.put(b"25.5\n")
+    for _ in range(200):
+        if registry["A1-AI-TIT01"].value == 25.5:
+            break
+        time.sleep(0.01)
+    backend.parar(timeout=5)
+
+    assert registry["A1-AI-TIT01"].value == 25.5
+    assert backend.metricas()['linhas_despachadas'] == 1
+    assert not backend.ativo
+    assert fonte.fechada
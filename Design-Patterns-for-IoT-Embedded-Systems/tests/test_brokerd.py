@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import threading
+import pytest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.backend import BrokerBackend
+from src.broker_client import RemoteBackend
+from src.brokerd import criar_servidor
+from src.devices import AIDevicePublisher, DODevice
+from src.registry import DeviceRegistry
+
+pytestmark = [pytest.mark.unit, pytest.mark.integration]
+
+
+@pytest.fixture
+def servidor():
+    """Sobe a API em uma porta livre com um backend sem ingestão (valores escritos pelo teste)."""
+    registry = DeviceRegistry([
+        AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C"),
+        AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m"),
+        DODevice("A1-VA11", 1, "Válvula 11"),
+    ])
+    registry.build_value_table()
+    registry["A1-AI-TIT01"].enable_history(10)
+    servidor = criar_servidor(BrokerBackend(registry, fontes=[]), porta=0)
+    thread = threading.Thread(target=servidor.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def remoto(servidor):
+    """Cliente sem cache, para cada chamada refletir o estado atual do daemon."""
+    host, porta = servidor.server_address[:2]
+    return RemoteBackend(f"http://{host}:{porta}", ttl=0)
+
+
+def test_snapshot_e_leitura(servidor, remoto):
+    """Testa o snapshot da tabela de valores e a leitura de um ponto pelo cliente."""
+    registry = servidor.backend.dispositivos
+    registry["A1-AI-TIT01"].update_value(21.5)
+    registry["A1-AI-LIT01"].update_value(None)
+
+    snapshot = {ponto['tag']: ponto for ponto in remoto.snapshot()}
+
+    assert remoto.verificar() == {'ativo': False, 'dispositivos': 3}
+    assert remoto.tags("AI") == ["A1-AI-TIT01", "A1-AI-LIT01"]
+    assert snapshot["A1-AI-TIT01"]['value'] == 21.5
+    assert snapshot["A1-AI-LIT01"]['value'] is None
+    assert remoto.leitura("A1-AI-TIT01") == {'tag': "A1-AI-TIT01", 'value': 21.5, 'unit': "°C"}
+    assert remoto.leitura("A1-VA11") is None
+
+
+def test_unidade_nan_vira_null(servidor):
+    """Testa que a célula Unit vazia (NaN) sai como null em JSON válido, e não como NaN."""
+    registry = servidor.backend.dispositivos
+    registry.add(AIDevicePublisher("A2-AI-TESTE", 2, "Teste", 0, 1, float('nan'))).update_value(0.5)
+    servidor.backend.hub.associar("A2-AI-TESTE", "Painel")
+    host, porta = servidor.server_address[:2]
+
+    def estrito(constante):
+        raise AssertionError(f"{constante} não é JSON válido")
+
+    for rota in ('/snapshot', '/dispositivos?tipo=AI', '/associacoes'):
+        with urlopen(f"http://{host}:{porta}{rota}") as resposta:
+            dados = json.loads(resposta.read(), parse_constant=estrito)
+        assert [d['unit'] for d in dados if d.get('tag', d.get('dispositivo')) == "A2-AI-TESTE"] == [None]
+
+
+def test_descricao_nan_nao_quebra_lista_de_tags(servidor, remoto):
+    """Testa que uma Descrição vazia (NaN) não derruba /dispositivos nem a lista de TAGs do cliente."""
+    servidor.backend.dispositivos.add(AIDevicePublisher("A2-AI-SEMDESC", 2, float('nan'), 0, 1, "m"))
+
+    assert "A2-AI-SEMDESC" in remoto.tags("AI")
+    dispositivos = {d['tag']: d for d in remoto.cliente.get('/dispositivos?tipo=AI')}
+    assert dispositivos["A2-AI-SEMDESC"]['descricao'] is None
+
+
+def test_historico_reaproveita_total(servidor, remoto):
+    """Testa a tendência com NaN convertido em None e a resposta curta quando não há amostras novas."""
+    dispositivo = servidor.backend.dispositivos["A1-AI-TIT01"]
+    for valor in [20.0, None, 22.0]:
+        dispositivo.update_value(valor)
+
+    total, timestamps, valores = remoto.tendencia("A1-AI-TIT01")
+
+    assert total == 3
+    assert valores == [20.0, None, 22.0]
+    assert len(timestamps) == 3
+    assert remoto.tendencia("A1-AI-TIT01", total_conhecido=3) == (3, None, None)
+    assert remoto.tendencia("A1-AI-LIT01") is None
+
+
+def test_cache_de_historico_limitado(servidor, remoto):
+    """Testa que novas amostras não criam entradas novas no cache do cliente."""
+    dispositivo = servidor.backend.dispositivos["A1-AI-TIT01"]
+    total = None
+    for valor in range(50):
+        dispositivo.update_value(float(valor))
+        total, timestamps, valores = remoto.tendencia("A1-AI-TIT01", total_conhecido=total)
+        assert valores[-1] == float(valor)
+
+    assert len(remoto._tendencias) == 1
+    assert not any(caminho.startswith('/historico') for caminho in remoto.cliente._cache)
+    assert remoto.tendencia("A1-AI-TIT01", total_conhecido=total) == (total, None, None)
+    assert remoto.tendencia("A1-AI-TIT01")[2][-1] == 49.0  # Outra sessão, sem gráfico: recebe a série guardada
+
+
+def test_associacoes_remotas(servidor, remoto):
+    """Testa criar, listar e remover associações pela API, com erros da API como ValueError."""
+    remoto.hub.associar("A1-AI-TIT01", "Painel")
+    servidor.backend.dispositivos["A1-AI-TIT01"].update_value(30.0)
+
+    assert remoto.hub.existe("A1-AI-TIT01", "Painel")
+    assert "30.0 °C" in remoto.hub.html()
+    assert remoto.hub.notificacoes() == [("Painel", ["Observer Painel: TAG = A1-AI-TIT01 mudou para 30.0 °C"])]
+    with pytest.raises(ValueError):
+        remoto.hub.associar("A1-AI-TIT01", "Painel")
+    with pytest.raises(ValueError):
+        remoto.hub.associar("A1-VA11", "Painel")
+    with pytest.raises(ValueError):
+        remoto.hub.associar("A1-AI-TIT01", "  ")  # 400: nome vazio após strip()
+
+    remoto.hub.associar("A1-AI-*", "Tendência")
+    remoto.hub.desassociar("A1-AI-TIT01", "Painel")
+    assert [linha.subscriber for linha in remoto.hub.linhas()] == ["Tendência"]
+    with pytest.raises(ValueError):
+        remoto.hub.desassociar("A1-AI-TIT01", "Painel")
+    remoto.hub.desassociar("A1-AI-*", "Tendência")
+    assert len(remoto.hub) == 0
+
+
+def test_rotas_invalidas(remoto):
+    """Testa os códigos de erro para rota desconhecida e parâmetros inválidos."""
+    url = remoto.cliente.url
+    for caminho, status in [("/nada", 404), ("/historico", 400), ("/historico?tag=A1-AI-TIT01&pontos=x", 400)]:
+        with pytest.raises(HTTPError) as erro:
+            urlopen(url + caminho)
+        assert erro.value.code == status
+        assert 'erro' in json.loads(erro.value.read())
@@ -256,6 +256,13 @@ def test_builder_input_types(ai_device_builder):
     ai_device_builder.set_unit("°C")
     assert ai_device_builder._unit == "°C"
 
+# Teste para a taxa de variação opcional
+def test_set_taxa_max(ai_device_builder):
+    """Testa se a taxa máxima de variação é repassada ao dispositivo construído."""
+    device = ai_device_builder.set_tag("A1-AI-TIT01").set_taxa_max(2.5).build()
+    assert device.taxa_max == 2.5
+    assert ai_device_builder.set_taxa_max(None).build().taxa_max is None
+
 # Teste para reinicialização do builder após construção
 def test_builder_reuse(ai_device_builder, monkeypatch):
     """Testa a reutilização do builder após a construção de um objeto."""
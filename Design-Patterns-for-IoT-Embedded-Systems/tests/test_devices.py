@@ -1,5 +1,6 @@
 import os
 import sys
+import logging
 import pytest
 from unittest.mock import patch, MagicMock, Mock, call
 
@@ -118,6 +119,26 @@ class TestAIDevicePublisher:
         assert mock_subscriber not in ai_device.subscribers
         assert len(ai_device.subscribers) == 0
     
+    def test_detach_por_identidade(self, ai_device, mock_subscriber):
+        """Testa que detach remove uma inscrição por vez e falha para observadores não inscritos."""
+        ai_device.attach(mock_subscriber)
+        ai_device.attach(mock_subscriber)
+
+        ai_device.detach(mock_subscriber)
+        assert ai_device.subscribers == [mock_subscriber]
+
+        ai_device.detach(mock_subscriber)
+        with pytest.raises(ValueError):
+            ai_device.detach(mock_subscriber)
+
+    def test_subscribers_e_uma_copia(self, ai_device, mock_subscriber):
+        """Testa que alterar a lista devolvida não altera os inscritos."""
+        ai_device.subscribers.append(mock_subscriber)
+        ai_device.notify()
+
+        assert ai_device.subscribers == []
+        mock_subscriber.update.assert_not_called()
+    
     def test_notify(self, ai_device, mock_subscriber):
         """Testa o método notify para notificar subscribers."""
         # Adiciona um subscriber
@@ -144,8 +165,9 @@ class TestAIDevicePublisher:
         for subscriber in subscribers:
             subscriber.update.assert_called_once_with(ai_device)
     
-    def test_update_value(self, ai_device, mock_subscriber, capsys):
+    def test_update_value(self, ai_device, mock_subscriber, caplog):
         """Testa o método update_value para atualizar o valor e notificar."""
+        caplog.set_level(logging.DEBUG, logger="src.devices")
         # Adiciona um subscriber
         ai_device.attach(mock_subscriber)
         
@@ -158,21 +180,26 @@ class TestAIDevicePublisher:
         # Verifica se o subscriber foi notificado
         mock_subscriber.update.assert_called_once_with(ai_device)
         
-        # Verifica a mensagem de log impressa
-        captured = capsys.readouterr()
-        assert f"Atualizando {ai_device.tag} com valor {ai_device.value} {ai_device.unit}" in captured.out
+        # Verifica a mensagem de log registrada
+        assert f"Atualizando {ai_device.tag} com valor {ai_device.value} {ai_device.unit}" in caplog.text
     
-    def test_update_value_without_subscribers(self, ai_device, capsys):
+    def test_update_value_without_subscribers(self, ai_device, caplog):
         """Testa o método update_value sem subscribers."""
+        caplog.set_level(logging.DEBUG, logger="src.devices")
         # Chama o método update_value com um novo valor
         ai_device.update_value(30.0)
         
         # Verifica se o valor foi atualizado
         assert ai_device.value == 30.0
         
-        # Verifica a mensagem de log impressa
-        captured = capsys.readouterr()
-        assert f"Atualizando {ai_device.tag} com valor {ai_device.value} {ai_device.unit}" in captured.out
+        # Verifica a mensagem de log registrada
+        assert f"Atualizando {ai_device.tag} com valor {ai_device.value} {ai_device.unit}" in caplog.text
+
+    def test_update_value_sem_saida_em_stdout(self, ai_device, capsys):
+        """Testa que update_value não escreve mais em stdout no caminho de leitura."""
+        ai_device.update_value(30.0)
+
+        assert capsys.readouterr().out == ""
     
     def test_repr(self, ai_device):
         """Testa a representação string da classe AIDevicePublisher."""
@@ -322,6 +349,170 @@ def test_ai_device_value_range(ai_device):
     ai_device.update_value(110.0)
     assert is_in_range(ai_device.value, ai_device.range_min, ai_device.range_max) is False
 
+# Testes para o modo de notificação em lote
+class TestNotificationBatch:
+    """Testes para o modo de notificação em lote do AIDevicePublisher."""
+
+    def test_lote_por_quantidade(self, ai_device, mock_subscriber):
+        """Testa a entrega de um único update_batch a cada N leituras."""
+        ai_device.attach(mock_subscriber)
+        ai_device.set_batch(tamanho_max=3)
+
+        for valor in [20.0, 21.0, 22.0, 23.0]:
+            ai_device.update_value(valor)
+
+        mock_subscriber.update_batch.assert_called_once_with(ai_device, [20.0, 21.0, 22.0])
+        mock_subscriber.update.assert_not_called()
+        assert ai_device.value == 23.0
+
+        ai_device.flush()
+        mock_subscriber.update_batch.assert_called_with(ai_device, [23.0])
+
+    def test_lote_por_janela(self, ai_device, mock_subscriber, monkeypatch):
+        """Testa a entrega quando a janela de tempo vence."""
+        relogio = [100.0]
+        monkeypatch.setattr('src.devices.time.monotonic', lambda: relogio[0])
+        ai_device.attach(mock_subscriber)
+        ai_device.set_batch(janela=1.0)
+
+        ai_device.update_value(20.0)
+        relogio[0] = 100.5
+        ai_device.update_value(21.0)
+        ai_device.flush_if_due()
+        mock_subscriber.update_batch.assert_not_called()
+
+        relogio[0] = 101.0
+        ai_device.flush_if_due()
+        mock_subscriber.update_batch.assert_called_once_with(ai_device, [20.0, 21.0])
+
+    def test_subscriber_sem_update_batch(self, ai_device):
+        """Testa que observadores sem update_batch recebem update com o último valor."""
+        class OnlyUpdate:
+            def __init__(self):
+                self.values = []
+
+            def update(self, device):
+                self.values.append(device.value)
+
+        subscriber = OnlyUpdate()
+        ai_device.attach(subscriber)
+        ai_device.set_batch(tamanho_max=2)
+        for valor in [1.0, 2.0, 3.0, 4.0]:
+            ai_device.update_value(valor)
+
+        assert subscriber.values == [2.0, 4.0]
+
+    def test_desabilitar_lote_entrega_pendentes(self, ai_device, mock_subscriber):
+        """Testa que desabilitar o lote entrega as leituras pendentes."""
+        ai_device.attach(mock_subscriber)
+        ai_device.set_batch(tamanho_max=10)
+        ai_device.update_value(20.0)
+
+        ai_device.set_batch()
+        mock_subscriber.update_batch.assert_called_once_with(ai_device, [20.0])
+
+        ai_device.update_value(21.0)
+        mock_subscriber.update.assert_called_once_with(ai_device)
+
+    def test_lote_sem_parametros(self):
+        """Testa a validação dos parâmetros do lote."""
+        from src.devices import NotificationBatch
+        with pytest.raises(ValueError):
+            NotificationBatch()
+
+
+class TestDeadband:
+    """Testes para a banda morta e o heartbeat do AIDevicePublisher."""
+
+    def test_banda_absoluta(self, ai_device, mock_subscriber):
+        """Testa que variações dentro da banda não notificam, mas atualizam o valor."""
+        ai_device.attach(mock_subscriber)
+        ai_device.set_deadband(absoluto=0.5)
+
+        for valor in [20.0, 20.2, 20.4, 20.6, 20.6]:
+            ai_device.update_value(valor)
+
+        assert mock_subscriber.update.call_count == 2  # 20.0 e 20.6 (> 0.5 de 20.0)
+        assert ai_device.value == 20.6
+        assert ai_device.deadband.suprimidas == 3
+
+    def test_banda_percentual_do_span(self, ai_device, mock_subscriber):
+        """Testa a banda como percentual de range_max - range_min (0 a 100 no fixture)."""
+        ai_device.attach(mock_subscriber)
+        deadband = ai_device.set_deadband(absoluto=0.1, percentual=2)
+
+        assert deadband.banda == 2.0
+        for valor in [50.0, 51.5, 52.5]:
+            ai_device.update_value(valor)
+        assert mock_subscriber.update.call_count == 2
+
+    def test_percentual_sem_faixa(self, mock_subscriber, caplog):
+        """Testa que sem Range Min/Max numéricos vale apenas a banda absoluta."""
+        dispositivo = AIDevicePublisher("A1-AI-X", 1, "Sem faixa", " ", float('nan'), None)
+
+        assert dispositivo.set_deadband(absoluto=1.0, percentual=5).banda == 1.0
+        assert "banda percentual ignorada" in caplog.text
+
+    def test_heartbeat(self, ai_device, mock_subscriber, monkeypatch):
+        """Testa a notificação periódica de um sinal estável."""
+        relogio = [100.0]
+        monkeypatch.setattr('src.devices.time.monotonic', lambda: relogio[0])
+        ai_device.attach(mock_subscriber)
+        ai_device.set_deadband(heartbeat=5.0)
+
+        for instante in [100.0, 101.0, 104.5, 105.0, 106.0]:
+            relogio[0] = instante
+            ai_device.update_value(25.0)
+
+        assert mock_subscriber.update.call_count == 2  # 100.0 e 105.0
+
+    def test_transicao_para_invalido(self, ai_device, mock_subscriber):
+        """Testa que a passagem para e de leitura inválida sempre notifica."""
+        ai_device.attach(mock_subscriber)
+        ai_device.set_deadband(absoluto=10.0)
+
+        for valor in [20.0, None, None, 20.0]:
+            ai_device.update_value(valor)
+
+        assert mock_subscriber.update.call_count == 3
+
+    def test_desabilitar(self, ai_device, mock_subscriber):
+        """Testa que set_deadband() sem argumentos volta a notificar toda leitura."""
+        ai_device.attach(mock_subscriber)
+        ai_device.set_deadband(absoluto=10.0)
+        ai_device.update_value(20.0)
+        ai_device.update_value(20.0)
+
+        ai_device.set_deadband()
+        ai_device.update_value(20.0)
+
+        assert mock_subscriber.update.call_count == 2
+        assert ai_device.deadband is None
+
+    def test_inscrito_sem_filtro(self, ai_device, mock_subscriber):
+        """Testa que um inscrito com filtrado=False recebe também as leituras suprimidas."""
+        from unittest.mock import Mock
+        todas = Mock()
+        ai_device.attach(mock_subscriber)
+        ai_device.attach(todas, filtrado=False)
+        ai_device.set_deadband(absoluto=10.0)
+
+        for valor in [20.0, 20.5, 21.0]:
+            ai_device.update_value(valor)
+        assert mock_subscriber.update.call_count == 1
+        assert todas.update.call_count == 3
+
+        ai_device.detach(todas)
+        ai_device.update_value(21.5)
+        assert todas.update.call_count == 3
+
+    def test_parametros_invalidos(self, ai_device):
+        """Testa a validação da banda e do heartbeat."""
+        with pytest.raises(ValueError):
+            ai_device.set_deadband(absoluto=-1)
+        with pytest.raises(ValueError):
+            ai_device.set_deadband(heartbeat=0)
+
 if __name__ == "__main__":
     # Executa os testes
-    pytest.main(["-v", __file__])
\ No newline at end of file
+    pytest.main(["-v", __file__])
@@ -0,0 +1,170 @@
+import os
+import sys
+import threading
+import time
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.dispatcher import AsyncDispatcher, COALESCER, DESCARTAR_ANTIGAS, DESCARTAR_NOVAS
+from src.metrics import LatencyStats
+from src.observer import GenericSubscriber
+
+pytestmark = [pytest.mark.unit, pytest.mark.observer]
+
+
+class BlockingSubscriber:
+    """Observador lento: só processa depois que `liberar` for sinalizado."""
+
+    def __init__(self):
+        self.name = "Lento"
+        self.liberar = threading.Event()
+        self.iniciou = threading.Event()
+        self.valores = []
+
+    def update(self, subject):
+        self.iniciou.set()
+        self.liberar.wait(5)
+        self.valores.append(subject.value)
+
+
+@pytest.fixture
+def ai_device():
+    """Cria um dispositivo AI para teste."""
+    return AIDevicePublisher("A1-AI-TIT01", "Área 1", "Sensor de Temperatura", 0, 100, "°C")
+
+
+@pytest.fixture
+def dispatcher():
+    """Despachante encerrado ao fim de cada teste."""
+    dispatcher = AsyncDispatcher(max_workers=2)
+    yield dispatcher
+    dispatcher.encerrar()
+
+
+def preencher_com_lento(ai_device, dispatcher, politica, valores, tamanho_fila=3):
+    """Ocupa o observador lento com a primeira leitura e enfileira as demais."""
+    lento = BlockingSubscriber()
+    envoltorio = dispatcher.attach(ai_device, lento, tamanho_fila=tamanho_fila, politica=politica)
+    ai_device.update_value(valores[0])
+    assert lento.iniciou.wait(5)
+    for valor in valores[1:]:
+        ai_device.update_value(valor)
+    return lento, envoltorio
+
+
+def test_notify_nao_espera_observador_lento(ai_device, dispatcher):
+    """Testa que update_value retorna enquanto o observador ainda está bloqueado."""
+    lento, envoltorio = preencher_com_lento(ai_device, dispatcher, DESCARTAR_ANTIGAS, [1.0])
+
+    inicio = time.perf_counter()
+    ai_device.update_value(2.0)
+    assert time.perf_counter() - inicio < 0.1
+    assert envoltorio.pendentes == 1
+
+    lento.liberar.set()
+    dispatcher.encerrar()
+    assert lento.valores == [1.0, 2.0]  # Cada entrega vê o valor da sua notificação
+
+
+@pytest.mark.parametrize("politica, esperado, descartadas", [
+    (DESCARTAR_ANTIGAS, [1.0, 4.0, 5.0, 6.0], 2),
+    (DESCARTAR_NOVAS, [1.0, 2.0, 3.0, 4.0], 2),
+    (COALESCER, [1.0, 6.0], 0),
+])
+def test_politicas_de_fila_cheia(ai_device, dispatcher, politica, esperado, descartadas):
+    """Testa as políticas com fila de 3 posições e 5 leituras acumuladas."""
+    lento, envoltorio = preencher_com_lento(ai_device, dispatcher, politica, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    lento.liberar.set()
+    dispatcher.encerrar()
+
+    assert lento.valores == esperado
+    assert envoltorio.descartadas == descartadas
+    assert envoltorio.coalescidas == (4 if politica == COALESCER else 0)
+
+
+def test_metricas_e_erros(ai_device, dispatcher, caplog):
+    """Testa contadores, latência e que exceções do observador não chegam à ingestão."""
+    class Falha:
+        name = "Falha"
+
+        def update(self, subject):
+            raise RuntimeError("falha no observador")
+
+    dispatcher.attach(ai_device, Falha())
+    generico = GenericSubscriber("Painel")
+    dispatcher.attach(ai_device, generico)
+
+    ai_device.update_value(10.0)
+    ai_device.update_value(20.0)
+    dispatcher.encerrar()
+
+    metricas = {m['subscriber']: m for m in dispatcher.metricas()}
+    assert metricas["Falha"]['erros'] == 2
+    assert metricas["Painel"]['entregues'] == 2
+    assert metricas["Painel"]['latencia']['count'] == 2
+    assert metricas["Painel"]['latencia']['max_ms'] >= 0
+    assert generico.notifications[-1].endswith("mudou para 20.0 °C")
+    assert "falha no observador" in caplog.text
+
+
+def test_lote_entregue_com_update_batch(ai_device, dispatcher):
+    """Testa que lotes do dispositivo chegam ao observador como lote."""
+    generico = GenericSubscriber("Painel")
+    dispatcher.attach(ai_device, generico)
+    ai_device.set_batch(tamanho_max=2)
+
+    ai_device.update_value(1.0)
+    ai_device.update_value(2.0)
+    dispatcher.encerrar()
+
+    assert generico.notifications.registros[0][2] == [1.0, 2.0]
+
+
+def test_attach_detach(ai_device, dispatcher):
+    """Testa a inscrição pelo despachante e a remoção pelo observador original."""
+    generico = GenericSubscriber("Painel")
+    envoltorio = dispatcher.attach(ai_device, generico)
+    assert ai_device.subscribers == [envoltorio]
+
+    with pytest.raises(ValueError):
+        dispatcher.attach(ai_device, generico)
+
+    dispatcher.detach(ai_device, generico)
+    assert ai_device.subscribers == []
+    with pytest.raises(ValueError):
+        dispatcher.detach(ai_device, generico)
+
+
+def test_politica_invalida(ai_device, dispatcher):
+    """Testa a validação da política."""
+    with pytest.raises(ValueError):
+        dispatcher.attach(ai_device, GenericSubscriber("Painel"), politica="fifo")
+
+
+def test_latency_stats():
+    """Testa o resumo de latência em milissegundos."""
+    stats = LatencyStats(capacidade=100)
+    assert stats.resumo()['count'] == 0
+
+    for i in range(1, 101):
+        stats.registrar(i / 1000)
+
+    resumo = stats.resumo()
+    assert resumo['count'] == 100
+    assert resumo['mean_ms'] == pytest.approx(50.5)
+    assert resumo['p50_ms'] == pytest.approx(51.0)
+    assert resumo['p99_ms'] == pytest.approx(100.0)
+    assert resumo['max_ms'] == pytest.approx(100.0)
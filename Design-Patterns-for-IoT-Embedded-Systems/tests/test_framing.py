@@ -0,0 +1,126 @@
+import os
+import sys
+import asyncio
+import binascii
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.framing import FrameDecoder, SYNC, TIPO_FLOAT32, TIPO_INT16, codificar_quadro
+from src.ingestion import IngestionEngine, PROTOCOLO_BINARIO
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_formato_do_quadro():
+    """Testa o layout SYNC | TIPO | CANAL | SEQ | valor | CRC-16 usado pelo firmware."""
+    quadro = codificar_quadro(2, 7, 25.5)
+
+    assert len(quadro) == 10
+    assert quadro[:4] == bytes((SYNC, TIPO_FLOAT32, 2, 7))
+    assert int.from_bytes(quadro[-2:], 'little') == binascii.crc_hqx(quadro[1:-2], 0xFFFF)
+    assert len(codificar_quadro(2, 7, 25.5, TIPO_INT16)) == 8
+    assert binascii.crc_hqx(b"123456789", 0xFFFF) == 0x29B1  # CRC-16/CCITT-FALSE, igual ao crc16() do .ino
+
+
+def test_decodificacao_byte_a_byte():
+    """Testa que quadros entregues em pedaços arbitrários são reconstituídos."""
+    fluxo = (codificar_quadro(0, 0, 25.5) + codificar_quadro(1, 0, -3.25, TIPO_INT16)
+             + codificar_quadro(0, 1, None))
+    decoder = FrameDecoder()
+
+    leituras = []
+    for i in range(len(fluxo)):
+        leituras += decoder.feed(fluxo[i:i + 1])
+
+    assert leituras == [(0, 25.5), (1, -3.25), (0, None)]
+    assert decoder.pendentes == 0
+    assert decoder.resumo() == {'quadros': 3, 'crc_invalidos': 0, 'bytes_descartados': 0, 'perdidos': 0}
+
+
+def test_ressincroniza_apos_ruido_e_crc_invalido():
+    """Testa o descarte de lixo e de quadros corrompidos sem perder os seguintes."""
+    corrompido = bytearray(codificar_quadro(0, 0, 20.0))
+    corrompido[5] ^= 0xFF
+    fluxo = b"lixo\n" + bytes(corrompido) + codificar_quadro(0, 1, 21.0)
+    decoder = FrameDecoder()
+
+    assert decoder.feed(fluxo) == [(0, 21.0)]
+    assert decoder.crc_invalidos == 1
+    assert decoder.bytes_descartados == 5 + 9  # Ruído + quadro corrompido após o SYNC
+
+
+def test_deteccao_de_quadros_perdidos():
+    """Testa a contagem de perdas pela sequência de cada canal, inclusive na volta de 255 para 0."""
+    decoder = FrameDecoder()
+    decoder.feed(codificar_quadro(0, 254, 1.0) + codificar_quadro(0, 255, 1.0) + codificar_quadro(0, 2, 1.0))
+    decoder.feed(codificar_quadro(1, 10, 1.0) + codificar_quadro(1, 11, 1.0))
+
+    assert decoder.perdidos == 2
+    assert decoder.perdidos_por_canal == {0: 2}
+
+
+def test_codificacao_invalida():
+    """Testa valores fora do intervalo do int16 escalado e tipos desconhecidos."""
+    with pytest.raises(ValueError):
+        codificar_quadro(0, 0, 400.0, TIPO_INT16)
+    with pytest.raises(ValueError):
+        codificar_quadro(0, 0, 1.0, tipo=0x7F)
+
+
+def test_engine_protocolo_binario():
+    """Testa o motor de ingestão entregando quadros binários ao dispositivo do canal 0."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+    valores = []
+    dispositivo.attach(type("Coletor", (), {"update": lambda self, d: valores.append(d.value)})())
+    fluxo = codificar_quadro(0, 0, 24.5) + codificar_quadro(0, 1, 25.0) + codificar_quadro(0, 3, 25.5)
+
+    class FakeSource:
+        port = "fake"
+
+        def __init__(self):
+            self.chunks = [fluxo[13:], fluxo[:13]]  # Quadro dividido entre duas leituras
+
+        def conectar(self):
+            return self
+
+        def fileno(self):
+            return None
+
+        def ler_disponivel(self):
+            return self.chunks.pop() if self.chunks else b''
+
+        def fechar(self):
+            pass
+
+    engine = IngestionEngine([dispositivo], [FakeSource()], protocolo=PROTOCOLO_BINARIO, intervalo_polling=0.01)
+
+    async def runner():
+        task = asyncio.create_task(engine.executar())
+        for _ in range(100):
+            if len(valores) == 3:
+                break
+            await asyncio.sleep(0.01)
+        engine.parar()
+        await task
+
+    asyncio.run(runner())
+    assert valores == [24.5, 25.0, 25.5]
+    assert engine.decodificadores["fake"].perdidos == 1
+
+
+def test_protocolo_desconhecido():
+    """Testa a validação do protocolo do motor."""
+    with pytest.raises(ValueError):
+        IngestionEngine([], [], protocolo="modbus")
@@ -0,0 +1,122 @@
+import os
+import sys
+import pytest
+import numpy as np
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.history import RingBuffer
+
+pytestmark = [pytest.mark.unit, pytest.mark.devices]
+
+
+def preencher(buffer, valores):
+    """Adiciona valores com timestamps iguais ao próprio valor."""
+    for valor in valores:
+        buffer.append(float(valor), timestamp=float(valor))
+
+
+def test_append_e_ultimos_antes_de_encher():
+    """Testa a leitura enquanto o buffer ainda não está cheio."""
+    buffer = RingBuffer(5)
+    preencher(buffer, range(3))
+
+    timestamps, valores = buffer.ultimos()
+
+    assert len(buffer) == 3
+    assert valores.tolist() == [0.0, 1.0, 2.0]
+    assert timestamps.tolist() == [0.0, 1.0, 2.0]
+
+
+def test_sobrescreve_amostras_antigas():
+    """Testa que a capacidade é fixa e as amostras mais antigas são descartadas."""
+    buffer = RingBuffer(4)
+    preencher(buffer, range(11))
+
+    assert len(buffer) == 4
+    assert buffer.total == 11
+    assert buffer.ultimos()[1].tolist() == [7.0, 8.0, 9.0, 10.0]
+    assert buffer.ultimos(2)[1].tolist() == [9.0, 10.0]
+
+
+@pytest.mark.parametrize("quantidade", range(1, 12))
+def test_janelas_sao_views_sem_copia(quantidade):
+    """Testa que qualquer janela, em qualquer posição de escrita, é uma view do buffer."""
+    buffer = RingBuffer(4)
+    preencher(buffer, range(quantidade))
+
+    timestamps, valores = buffer.ultimos()
+
+    assert np.shares_memory(valores, buffer._values)
+    assert np.shares_memory(timestamps, buffer._timestamps)
+    assert valores.tolist() == [float(v) for v in range(max(0, quantidade - 4), quantidade)]
+    assert not valores.flags.writeable
+
+
+def test_janela_por_tempo():
+    """Testa a seleção de amostras por intervalo de tempo."""
+    buffer = RingBuffer(10)
+    preencher(buffer, range(15))
+
+    timestamps, valores = buffer.janela(8.0, 11.0)
+
+    assert valores.tolist() == [8.0, 9.0, 10.0]
+    assert buffer.janela(13.0)[1].tolist() == [13.0, 14.0]
+
+
+def test_reamostrar_por_media():
+    """Testa a redução por média de blocos mantendo o último timestamp de cada bloco."""
+    buffer = RingBuffer(100)
+    preencher(buffer, range(100))
+
+    timestamps, valores = buffer.reamostrar(10)
+
+    assert len(valores) == 10
+    assert valores[0] == pytest.approx(4.5)
+    assert timestamps[0] == 9.0
+    assert timestamps[-1] == 99.0
+
+
+def test_reamostrar_ignora_leituras_invalidas():
+    """Testa que leituras None não contaminam a média do bloco."""
+    buffer = RingBuffer(4)
+    buffer.append(1.0, 1.0)
+    buffer.append(None, 2.0)
+    buffer.append(None, 3.0)
+    buffer.append(None, 4.0)
+
+    _, valores = buffer.reamostrar(2)
+
+    assert valores[0] == 1.0
+    assert np.isnan(valores[1])
+
+
+def test_capacidade_invalida():
+    """Testa a validação da capacidade."""
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_historico_do_dispositivo():
+    """Testa o histórico habilitado em um AIDevicePublisher."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+    assert dispositivo.historico is None
+
+    dispositivo.enable_history(3)
+    for valor in [20.0, 21.0, 22.0, 23.0]:
+        dispositivo.update_value(valor)
+
+    timestamps, valores = dispositivo.historico.ultimos()
+    assert valores.tolist() == [21.0, 22.0, 23.0]
+    assert np.all(np.diff(timestamps) >= 0)
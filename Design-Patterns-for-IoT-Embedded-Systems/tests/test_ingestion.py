@@ -0,0 +1,343 @@
+import os
+import sys
+import asyncio
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.registry import DeviceRegistry
+from src.ingestion import IngestionEngine, processar_linha
+from src.line_parser import LineParser
+from src.transport import SerialTransport
+
+pytestmark = [pytest.mark.unit, pytest.mark.integration]
+
+posix_only = pytest.mark.skipif(os.name != 'posix', reason="pty disponível apenas em sistemas POSIX")
+
+
+# Subscriber simples que registra os valores recebidos
+class ValueCollector:
+    def __init__(self):
+        self.values = []
+
+    def update(self, device):
+        self.values.append(device.value)
+
+
+@pytest.fixture
+def ai_device():
+    """Cria o dispositivo AI roteado pelo processamento padrão."""
+    return AIDevicePublisher("A1-AI-TIT01", "1", "Temperatura Tanque 01", 0, 900, "°C")
+
+
+@pytest.fixture
+def pty_pair():
+    """Cria um par pty (mestre, caminho do escravo) que simula uma porta serial."""
+    master, slave = os.openpty()
+    path = os.ttyname(slave)
+    yield master, path
+    os.close(master)
+    os.close(slave)
+
+
+def run_engine_until(engine, condition, feed=None, timeout=5.0):
+    """Executa o motor de ingestão até a condição ser satisfeita ou o tempo esgotar."""
+    async def runner():
+        task = asyncio.create_task(engine.executar())
+        # Aguarda a abertura das portas (a abertura descarta o buffer de entrada)
+        await asyncio.sleep(0.05)
+        if feed:
+            feed()
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not condition() and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.01)
+        engine.parar()
+        await task
+
+    asyncio.run(runner())
+
+
+def test_processar_linha_atualiza_dispositivo(ai_device):
+    """Testa o processamento de uma linha válida em bytes."""
+    collector = ValueCollector()
+    ai_device.attach(collector)
+
+    processar_linha(DeviceRegistry([ai_device]), b"25.50\r\n")
+
+    assert ai_device.value == 25.5
+    assert collector.values == [25.5]
+
+
+def test_processar_linha_descarta_invalidas(ai_device):
+    """Testa o descarte de linhas fora da faixa (Range Min/Max = 0 a 900) ou mal formatadas."""
+    processar_linha(DeviceRegistry([ai_device]), b"abc")
+    processar_linha(DeviceRegistry([ai_device]), b"950.0")
+    processar_linha(DeviceRegistry([ai_device]), b"-0.5")
+
+    assert ai_device.value is None
+
+
+def test_processar_linha_quadro_com_tags(ai_device):
+    """Testa um quadro tag=valor atualizando mais de um dispositivo e a contagem de rejeições."""
+    nivel = AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m")
+    registry = DeviceRegistry([ai_device, nivel])
+    parser = LineParser()
+
+    processar_linha(registry, b"A1-AI-TIT01=26.0,A1-AI-LIT01=0.5\r\n", parser)
+    processar_linha(registry, b"A1-AI-TIT01=", parser)
+
+    assert ai_device.value == 26.0
+    assert nivel.value == 0.5
+    assert parser.aceitas == 1
+    assert parser.rejeicoes['campo_vazio'] == 1
+
+
+@posix_only
+def test_engine_drena_todas_as_linhas_de_uma_vez(ai_device, pty_pair):
+    """Testa se várias linhas recebidas juntas são todas entregues."""
+    master, path = pty_pair
+    collector = ValueCollector()
+    ai_device.attach(collector)
+
+    engine = IngestionEngine([ai_device], [SerialTransport(path, tempo_estabilizacao=0)])
+    run_engine_until(engine, lambda: len(collector.values) >= 4,
+                     feed=lambda: os.write(master, b"20.00\n21.00\n22.00\n23.00\n"))
+
+    assert collector.values == [20.0, 21.0, 22.0, 23.0]
+    assert engine.linhas_recebidas == 4
+    assert engine.linhas_despachadas == 4
+
+
+@posix_only
+def test_engine_parse_do_bloco_inteiro(ai_device, pty_pair):
+    """Testa o parse_chunk no motor: linhas válidas, rejeitadas e quadro tag=valor no mesmo bloco."""
+    master, path = pty_pair
+    collector = ValueCollector()
+    ai_device.attach(collector)
+
+    engine = IngestionEngine([ai_device], [SerialTransport(path, tempo_estabilizacao=0)])
+    run_engine_until(engine, lambda: engine.linhas_despachadas >= 4,
+                     feed=lambda: os.write(master, b"20.0\nabc\nA1-AI-TIT01=21.0\n22.0\n2"))
+
+    assert collector.values == [20.0, 21.0, 22.0]
+    assert engine.parser.aceitas == 3
+    assert engine.parser.rejeicoes['numero_invalido'] == 1
+    assert engine.linhas_recebidas == engine.linhas_despachadas == 4
+
+
+@posix_only
+def test_engine_multiplas_portas(pty_pair):
+    """Testa a leitura concorrente de duas portas com handler customizado."""
+    master1, path1 = pty_pair
+    master2, slave2 = os.openpty()
+    try:
+        recebidas = []
+        engine = IngestionEngine(
+            [],
+            [SerialTransport(path1, tempo_estabilizacao=0), SerialTransport(os.ttyname(slave2), tempo_estabilizacao=0)],
+            handler=lambda fonte, linha: recebidas.append((fonte.port, linha)),
+        )
+
+        def feed():
+            os.write(master1, b"1\n")
+            os.write(master2, b"2\n")
+
+        run_engine_until(engine, lambda: len(recebidas) >= 2, feed=feed)
+
+        assert sorted(recebidas) == sorted([(path1, b"1"), (os.ttyname(slave2), b"2")])
+    finally:
+        os.close(master2)
+        os.close(slave2)
+
+
+@posix_only
+def test_engine_linha_parcial_aguarda_terminador(pty_pair):
+    """Testa que uma linha sem terminador só é entregue quando completa."""
+    master, path = pty_pair
+    recebidas = []
+    engine = IngestionEngine([], [SerialTransport(path, tempo_estabilizacao=0)], handler=lambda fonte, linha: recebidas.append(linha))
+
+    async def runner():
+        task = asyncio.create_task(engine.executar())
+        await asyncio.sleep(0.05)
+        os.write(master, b"24.")
+        await asyncio.sleep(0.1)
+        assert recebidas == []
+        os.write(master, b"50\n")
+        for _ in range(100):
+            if recebidas:
+                break
+            await asyncio.sleep(0.01)
+        engine.parar()
+        await task
+
+    asyncio.run(runner())
+    assert recebidas == [b"24.50"]
+
+
+def test_engine_fila_limitada_preserva_ordem():
+    """Testa se uma fila menor que o lote recebido entrega todas as linhas em ordem."""
+    despachadas = []
+
+    class FakeSource:
+        port = "fake"
+
+        def __init__(self):
+            self.chunks = [b"1\n2\n3\n4\n5\n"]
+
+        def conectar(self):
+            return self
+
+        def fileno(self):
+            return None
+
+        def ler_disponivel(self):
+            return self.chunks.pop() if self.chunks else b''
+
+        def fechar(self):
+            pass
+
+    engine = IngestionEngine([], [FakeSource()], handler=lambda f, l: despachadas.append(l),
+                             tamanho_fila=2, intervalo_polling=0.01)
+
+    async def runner():
+        task = asyncio.create_task(engine.executar())
+        for _ in range(100):
+            if len(despachadas) == 5:
+                break
+            await asyncio.sleep(0.01)
+        engine.parar()
+        await task
+
+    asyncio.run(runner())
+    assert despachadas == [b"1", b"2", b"3", b"4", b"5"]
+    assert engine._fila.maxsize == 2
+
+
+def test_engine_fecha_portas_se_uma_conexao_falha():
+    """Testa que as portas já abertas são fechadas quando outra porta falha ao conectar."""
+    class FakeSource:
+        def __init__(self, port, falha=False):
+            self.port = port
+            self.falha = falha
+            self.aberta = False
+
+        def conectar(self):
+            if self.falha:
+                raise OSError(f"could not open port {self.port}")
+            self.aberta = True
+            return self
+
+        def fechar(self):
+            self.aberta = False
+
+    fontes = [FakeSource("COM5"), FakeSource("COM6", falha=True), FakeSource("COM7")]
+    engine = IngestionEngine([], fontes, handler=lambda f, l: None)
+
+    with pytest.raises(OSError, match="COM6"):
+        asyncio.run(engine.executar())
+    assert not any(fonte.aberta for fonte in fontes)
+
+
+def test_validacao_por_dispositivo():
+    """Testa a faixa de cada ponto da lista de I/O em vez da janela fixa de 15 a 50 °C."""
+    temperatura = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", -20, 120, "°C")
+    nivel = AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m")
+    registry = DeviceRegistry([temperatura, nivel])
+    rejeicoes = {}
+
+    processar_linha(registry, b"-5.0", rejeicoes=rejeicoes)  # Abaixo de 15 °C, mas dentro da faixa do ponto
+    processar_linha(registry, b"A1-AI-LIT01=30,A1-AI-TIT01=-4.5", rejeicoes=rejeicoes)
+    processar_linha(registry, b"A1-AI-TIT01=100000", rejeicoes=rejeicoes)
+    processar_linha(registry, b"A9-AI-X=1", rejeicoes=rejeicoes)
+
+    assert temperatura.value == -4.5
+    assert nivel.value is None
+    assert rejeicoes == {'fora_da_faixa': 2, 'sem_rota': 1}
+
+
+def test_validacao_taxa_de_variacao(monkeypatch):
+    """Testa o descarte de saltos acima de Rate Max entre leituras consecutivas."""
+    relogio = [1000.0]
+    monkeypatch.setattr('src.devices.time.time', lambda: relogio[0])
+    monkeypatch.setattr('src.value_table.time.time', lambda: relogio[0])
+    temperatura = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C", taxa_max=2.0)
+    registry = DeviceRegistry([temperatura])
+    rejeicoes = {}
+
+    processar_linha(registry, b"20.0", rejeicoes=rejeicoes)
+    relogio[0] = 1000.5
+    processar_linha(registry, b"25.0", rejeicoes=rejeicoes)  # 10 °C/s
+    processar_linha(registry, b"20.8", rejeicoes=rejeicoes)  # 1.6 °C/s
+
+    assert temperatura.value == 20.8
+    assert rejeicoes == {'taxa_excedida': 1}
+
+
+def test_engine_leitura_bloqueante_sem_polling():
+    """Testa que fontes sem descritor são lidas por leitura bloqueante, sem laço de polling."""
+    import queue
+
+    class BlockingSource:
+        port = "bloqueante"
+
+        def __init__(self):
+            self.chegadas = queue.Queue()
+            self.chamadas_ler_disponivel = 0
+
+        def conectar(self):
+            return self
+
+        def fileno(self):
+            return None
+
+        def ler_disponivel(self):
+            self.chamadas_ler_disponivel += 1
+            return b''
+
+        def ler_bloqueante(self, timeout):
+            try:
+                return self.chegadas.get(timeout=timeout)
+            except queue.Empty:
+                return b''
+
+        def fechar(self):
+            pass
+
+    fonte = BlockingSource()
+    recebidas = []
+    engine = IngestionEngine([], [fonte], handler=lambda f, linha: recebidas.append(linha), timeout_leitura=0.05)
+    run_engine_until(engine, lambda: len(recebidas) == 2, feed=lambda: fonte.chegadas.put(b"1\n2\n"))
+
+    assert recebidas == [b"1", b"2"]
+    assert fonte.chamadas_ler_disponivel == 0
+    metricas = engine.metricas()
+    assert metricas['latencia']['count'] == 2
+    assert metricas['linhas_despachadas'] == 2
+
+
+@posix_only
+def test_engine_latencia_fim_a_fim(ai_device, pty_pair):
+    """Testa a latência medida da chegada dos bytes até o observador com o descritor da porta (select/epoll)."""
+    master, path = pty_pair
+    collector = ValueCollector()
+    ai_device.attach(collector)
+    engine = IngestionEngine([ai_device], [SerialTransport(path, tempo_estabilizacao=0)])
+
+    run_engine_until(engine, lambda: len(collector.values) >= 1, feed=lambda: os.write(master, b"25.00\n"))
+
+    latencia = engine.metricas()['latencia']
+    assert latencia['count'] == 1
+    assert latencia['max_ms'] < 100  # Sem a espera de 1 s entre verificações do laço antigo
+
@@ -0,0 +1,162 @@
+import os
+import sys
+import pytest
+import pandas as pd
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src import io_cache
+
+pytestmark = [pytest.mark.unit]
+
+
+def escrever_planilha(file_path, tags):
+    """Escreve uma lista de I/O mínima com as TAGs AI informadas."""
+    pd.DataFrame({
+        'TAG': tags,
+        'Tag table': ['AI'] * len(tags),
+        'Area': [1] * len(tags),
+        'Descrição': [f"Sensor {tag}" for tag in tags],
+        'Range Min': [0] * len(tags),
+        'Range Max': [100] * len(tags),
+        'Unit': ['°C'] * len(tags),
+    }).to_excel(file_path, index=False)
+
+
+@pytest.fixture
+def planilha(tmp_path):
+    """Cria uma planilha temporária com dois dispositivos AI."""
+    file_path = str(tmp_path / "io_list.xlsx")
+    escrever_planilha(file_path, ["A1-AI-TIT01", "A1-AI-TIT02"])
+    return file_path
+
+
+@pytest.fixture
+def contador_leituras(monkeypatch):
+    """Conta quantas vezes a planilha é efetivamente lida."""
+    chamadas = []
+    original = io_cache.ler_dados_excel
+
+    def ler_contando(file_path):
+        chamadas.append(file_path)
+        return original(file_path)
+
+    monkeypatch.setattr(io_cache, 'ler_dados_excel', ler_contando)
+    return chamadas
+
+
+def test_cache_criado_e_reutilizado(planilha, contador_leituras):
+    """Testa se a segunda carga vem do cache sem ler a planilha."""
+    primeira = io_cache.carregar_dados_dispositivos(planilha)
+    assert os.path.exists(io_cache.caminho_cache(planilha))
+
+    segunda = io_cache.carregar_dados_dispositivos(planilha)
+
+    assert primeira == segunda
+    assert len(contador_leituras) == 1
+
+
+def test_cache_invalidado_quando_planilha_muda(planilha, contador_leituras):
+    """Testa a invalidação automática quando o conteúdo muda."""
+    io_cache.carregar_dados_dispositivos(planilha)
+
+    escrever_planilha(planilha, ["A1-AI-TIT01", "A1-AI-TIT02", "A1-AI-TIT03"])
+    dados = io_cache.carregar_dados_dispositivos(planilha)
+
+    assert [d[1] for d in dados] == ["A1-AI-TIT01", "A1-AI-TIT02", "A1-AI-TIT03"]
+    assert len(contador_leituras) == 2
+
+
+def test_mtime_alterado_com_mesmo_conteudo(planilha, contador_leituras):
+    """Testa que apenas tocar o arquivo não força nova leitura da planilha."""
+    io_cache.carregar_dados_dispositivos(planilha)
+
+    stat = os.stat(planilha)
+    os.utime(planilha, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    io_cache.carregar_dados_dispositivos(planilha)
+
+    assert len(contador_leituras) == 1
+
+
+def test_cache_corrompido_e_reconstruido(planilha, contador_leituras):
+    """Testa a recuperação quando o arquivo de cache está corrompido."""
+    with open(io_cache.caminho_cache(planilha), 'wb') as f:
+        f.write(b"lixo")
+
+    dados = io_cache.carregar_dados_dispositivos(planilha)
+
+    assert len(dados) == 2
+    assert len(contador_leituras) == 1
+
+
+def test_cli_prebuild(planilha, capsys):
+    """Testa a pré-compilação do cache pela linha de comando."""
+    assert io_cache.main([planilha]) == 0
+    assert os.path.exists(io_cache.caminho_cache(planilha))
+    assert "2 dispositivos" in capsys.readouterr().out
+
+    assert io_cache.main([planilha + ".inexistente"]) == 1
+
+
+def test_colunas_opcionais():
+    """Testa Rate Max, Port e Channel acrescentadas às tuplas AI e usadas na criação do dispositivo."""
+    from src.main import criar_dispositivo
+    from src.read_excel import extrair_dados_dispositivos
+
+    df = pd.DataFrame({
+        'TAG': ['A1-VA11', 'A1-AI-TIT01', 'A1-AI-LIT01'],
+        'Tag table': ['DO', 'AI', 'AI'],
+        'Area': [1, 1, 1],
+        'Descrição': ['Válvula', 'Temperatura', 'Nível'],
+        'Range Min': [None, 0, 0],
+        'Range Max': [None, 900, 25],
+        'Unit': [None, '°C', 'm'],
+        'Rate Max': [None, 5.0, None],
+        'Channel': [None, 2, None],  # Sem a coluna Port: rotas valem para qualquer porta
+    })
+
+    dados = extrair_dados_dispositivos(df)
+
+    assert dados[0] == ('DO', 'A1-VA11', 1, 'Válvula')
+    assert dados[1] == ('AI', 'A1-AI-TIT01', 1, 'Temperatura', 0, 900, '°C', 5.0, None, 2.0)
+    temperatura = criar_dispositivo(*dados[1])
+    nivel = criar_dispositivo(*dados[2])
+    assert (temperatura.taxa_max, temperatura.porta, temperatura.canal) == (5.0, None, 2)
+    assert (nivel.taxa_max, nivel.porta, nivel.canal) == (None, None, None)  # Células vazias (NaN)
+    assert criar_dispositivo(*dados[1][:7]).canal is None  # Planilha sem colunas opcionais
+
+
+def test_linhas_sem_tag_e_tags_repetidas(monkeypatch, caplog):
+    """Testa que linhas DO sem TAG são descartadas e TAGs repetidas não abortam a carga."""
+    import src.main
+    from src.read_excel import extrair_dados_dispositivos
+
+    df = pd.DataFrame({
+        'TAG': ['A1-VA11', None, None, 'A1-AI-TIT01', 'A1-AI-TIT01'],
+        'Tag table': ['DO', 'DO', 'DO', 'AI', 'AI'],
+        'Area': [1, 1, 1, 1, 1],
+        'Descrição': ['Válvula', 'Reserva', 'Reserva', 'Temperatura', 'Temperatura (cópia)'],
+        'Range Min': [None, None, None, 0, 0],
+        'Range Max': [None, None, None, 900, 900],
+        'Unit': [None, None, None, '°C', '°C'],
+    })
+    dados = extrair_dados_dispositivos(df)
+    assert [linha[1] for linha in dados] == ['A1-VA11', 'A1-AI-TIT01', 'A1-AI-TIT01']
+
+    monkeypatch.setattr('src.main.os.path.exists', lambda caminho: True)
+    monkeypatch.setattr('src.main.carregar_dados_dispositivos', lambda caminho: dados)
+    registry = src.main.processar_e_criar_dispositivos()
+
+    assert sorted(registry.tags()) == ['A1-AI-TIT01', 'A1-VA11']
+    assert registry['A1-AI-TIT01'].descricao == 'Temperatura'
+    assert "A1-AI-TIT01 repetida" in caplog.text
@@ -0,0 +1,84 @@
+import os
+import sys
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src import line_parser
+from src.line_parser import LineParser
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+def parser():
+    return LineParser()
+
+
+@pytest.mark.parametrize("linha, esperado", [
+    (b"25.50", [(0, 25.5)]),
+    (b"25.50\r", [(0, 25.5)]),
+    (b"  -3.25 ", [(0, -3.25)]),
+    (b"+7", [(0, 7.0)]),
+    (b"25.1,-3.2,1", [(0, 25.1), (1, -3.2), (2, 1.0)]),
+    (b"A1-AI-TIT01=25.5", [("A1-AI-TIT01", 25.5)]),
+    (b"A1-AI-TIT01=25.5, A1-AI-LIT01 = -0.5\r", [("A1-AI-TIT01", 25.5), ("A1-AI-LIT01", -0.5)]),
+])
+def test_formatos_aceitos(parser, linha, esperado):
+    """Testa valor simples com sinal, quadros CSV multicanal e tag=valor."""
+    assert parser.parse(linha) == esperado
+    assert parser.aceitas == 1
+    assert parser.rejeitadas == 0
+
+
+@pytest.mark.parametrize("linha, motivo", [
+    (b"", line_parser.VAZIA),
+    (b" \r", line_parser.VAZIA),
+    (b"abc", line_parser.NUMERO_INVALIDO),
+    (b"25.5.1", line_parser.NUMERO_INVALIDO),
+    (b"1_000", line_parser.NUMERO_INVALIDO),  # Separador de dígitos aceito por float()
+    (b"A1-AI-TIT01=2_5", line_parser.NUMERO_INVALIDO),
+    (b"nan", line_parser.NAO_FINITO),
+    (b"A1-AI-TIT01=inf", line_parser.NAO_FINITO),
+    (b"25.1,,3.2", line_parser.CAMPO_VAZIO),
+    (b"A1-AI-TIT01=", line_parser.CAMPO_VAZIO),
+    (b"=25.1", line_parser.TAG_INVALIDA),
+    ("TÍT=1".encode('utf-8'), line_parser.TAG_INVALIDA),
+    (b"25.1,x", line_parser.NUMERO_INVALIDO),
+    (b"1" * 300, line_parser.MUITO_LONGA),
+])
+def test_rejeicoes_por_motivo(parser, linha, motivo):
+    """Testa que cada linha inválida é contabilizada pelo motivo correto."""
+    assert parser.parse(linha) is None
+    assert parser.ultimo_motivo == motivo
+    assert parser.rejeicoes[motivo] == 1
+    assert parser.resumo() == {'aceitas': 0, 'rejeitadas': 1, **{m: int(m == motivo) for m in line_parser.MOTIVOS}}
+
+
+def test_parse_chunk_devolve_resto(parser):
+    """Testa o processamento de um bloco com linha incompleta no final."""
+    leituras, resto = parser.parse_chunk(b"20.0\r\nlixo\n1_0\nT1=21.5,T2=1\n22.")
+
+    assert leituras == [(0, 20.0), ("T1", 21.5), ("T2", 1.0)]
+    assert resto == b"22."
+    assert parser.rejeicoes[line_parser.NUMERO_INVALIDO] == 2
+
+    assert parser.parse_chunk(resto) == ([], b"22.")
+
+
+def test_tags_decodificadas_uma_vez(parser):
+    """Testa que a mesma TAG reutiliza a string já decodificada."""
+    primeira = parser.parse(b"A1-AI-TIT01=1")[0][0]
+    segunda = parser.parse(b"A1-AI-TIT01=2")[0][0]
+
+    assert primeira is segunda
@@ -0,0 +1,82 @@
+import os
+import sys
+import logging
+import threading
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.log_config import configurar_logging, parar_logging
+
+pytestmark = [pytest.mark.unit]
+
+
+class ListHandler(logging.Handler):
+    """Handler que guarda os registros e a thread em que foram emitidos."""
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+@pytest.fixture
+def handler():
+    """Configura o logging em fila com um handler de teste e restaura ao final."""
+    handler = ListHandler()
+    yield handler
+    parar_logging()
+
+
+def test_registros_entregues_pela_thread_do_listener(handler):
+    """Testa que a escrita ocorre fora da thread que gerou o registro."""
+    configurar_logging(logging.DEBUG, handlers=[handler], formato='%(message)s', reconfigurar=True)
+
+    AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C").update_value(25.5)
+    parar_logging()  # Esvazia a fila
+
+    assert handler.records == ["Atualizando A1-AI-TIT01 com valor 25.5 °C"]
+    assert threading.current_thread().name not in handler.threads
+
+
+def test_nivel_desabilitado_nao_gera_registro(handler):
+    """Testa que mensagens abaixo do nível configurado são descartadas."""
+    configurar_logging(logging.INFO, handlers=[handler], formato='%(message)s', reconfigurar=True)
+
+    AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C").update_value(25.5)
+    logging.getLogger("src.ingestion").warning("Formato inválido de leitura: %s", "abc")
+    parar_logging()
+
+    assert handler.records == ["Formato inválido de leitura: abc"]
+
+
+def test_configuracao_idempotente(handler):
+    """Testa que chamadas repetidas não duplicam handlers."""
+    configurar_logging(logging.INFO, handlers=[handler], reconfigurar=True)
+    configurar_logging(logging.INFO, handlers=[handler])
+
+    assert len(logging.getLogger("src").handlers) == 1
+
+
+def test_parar_logging_restaura_propagacao(handler):
+    """Testa que parar_logging devolve o logger 'src' ao padrão."""
+    configurar_logging(logging.INFO, handlers=[handler], reconfigurar=True)
+    parar_logging()
+
+    logger = logging.getLogger("src")
+    assert logger.propagate is True
+    assert logger.handlers == []
@@ -0,0 +1,88 @@
+import os
+import sys
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.observer import GenericSubscriber, NotificationLog
+
+pytestmark = [pytest.mark.unit, pytest.mark.observer]
+
+
+@pytest.fixture
+def ai_device():
+    """Cria um dispositivo AI para teste."""
+    return AIDevicePublisher("A1-AI-TIT01", "Área 1", "Sensor de Temperatura", 0, 100, "°C")
+
+
+def test_mensagens_formatadas_ao_exibir(ai_device):
+    """Testa o texto das notificações, gerado apenas na leitura."""
+    subscriber = GenericSubscriber("Painel")
+    ai_device.attach(subscriber)
+
+    ai_device.update_value(25.5)
+    ai_device.update_value(None)
+
+    assert list(subscriber.notifications) == [
+        "Observer Painel: TAG = A1-AI-TIT01 mudou para 25.5 °C",
+        "Observer Painel: TAG = A1-AI-TIT01 recebeu um valor inválido.",
+    ]
+
+
+def test_registros_brutos(ai_device):
+    """Testa que o armazenamento guarda (timestamp, tag, valor, unidade) sem strings."""
+    subscriber = GenericSubscriber("Painel")
+    ai_device.attach(subscriber)
+    ai_device.update_value(25.5)
+
+    timestamp, tag, value, unit = subscriber.notifications.registros[0]
+    assert timestamp > 0
+    assert (tag, value, unit) == ("A1-AI-TIT01", 25.5, "°C")
+
+
+def test_capacidade_limitada(ai_device):
+    """Testa que apenas as notificações mais recentes são mantidas."""
+    subscriber = GenericSubscriber("Painel", capacidade=3)
+    ai_device.attach(subscriber)
+
+    for valor in range(10):
+        ai_device.update_value(float(valor))
+
+    assert len(subscriber.notifications) == 3
+    assert subscriber.notifications[0].endswith("mudou para 7.0 °C")
+
+
+def test_interface_de_lista():
+    """Testa fatias, índices negativos e ultimas() como no broker (notifications[-5:])."""
+    log = NotificationLog("Painel")
+    for valor in range(8):
+        log.registrar("A1-AI-TIT01", float(valor), "°C", timestamp=valor)
+
+    assert log[-5:] == log.ultimas(5)
+    assert [m.split()[-2] for m in log[-5:]] == ["3.0", "4.0", "5.0", "6.0", "7.0"]
+    assert log[-1].endswith("mudou para 7.0 °C")
+    assert log.ultimas(0) == []
+    assert bool(NotificationLog("Vazio")) is False
+
+
+def test_notificacao_em_lote(ai_device):
+    """Testa o registro de um lote como uma única notificação."""
+    subscriber = GenericSubscriber("Painel")
+    ai_device.attach(subscriber)
+    ai_device.set_batch(tamanho_max=3)
+
+    for valor in [20.0, 21.0, 22.0]:
+        ai_device.update_value(valor)
+
+    assert list(subscriber.notifications) == ["Observer Painel: TAG = A1-AI-TIT01 recebeu 3 leituras, última 22.0 °C"]
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import socket
+import time
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.pubsub import PubSubServer
+from src.registry import DeviceRegistry
+
+pytestmark = [pytest.mark.unit, pytest.mark.integration]
+
+
+class Cliente:
+    """Cliente de linha JSON sobre TCP para os testes."""
+
+    def __init__(self, porta, rcvbuf=None):
+        self.sock = socket.socket()
+        if rcvbuf is not None:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        self.sock.settimeout(2)
+        self.sock.connect(('127.0.0.1', porta))
+        self.arquivo = self.sock.makefile('rb')
+
+    def enviar(self, **comando):
+        self.sock.sendall(json.dumps(comando).encode() + b'\n')
+        return self.receber()
+
+    def receber(self):
+        return json.loads(self.arquivo.readline())
+
+    def fechar(self):
+        self.arquivo.close()
+        self.sock.close()
+
+
+@pytest.fixture
+def servidor():
+    """Sobe o servidor pub/sub em uma porta livre com três pontos AI em duas áreas."""
+    registry = DeviceRegistry([
+        AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C"),
+        AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m"),
+        AIDevicePublisher("A2-AI-PIT01", 2, "Pressão", 0, 10, "bar"),
+    ])
+    servidor = PubSubServer(registry, porta=0).iniciar()
+    yield servidor
+    servidor.parar(timeout=5)
+
+
+def aguardar(condicao, tentativas=200):
+    for _ in range(tentativas):
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_inscricao_por_padrao(servidor):
+    """Testa que cada cliente recebe só as TAGs que casam com seus padrões."""
+    area1 = Cliente(servidor.porta)
+    todos = Cliente(servidor.porta)
+    assert area1.enviar(op="subscribe", pattern="A1-AI-*") == {'ok': 'subscribe', 'pattern': "A1-AI-*"}
+    assert todos.enviar(op="subscribe", pattern="#")['ok'] == 'subscribe'
+
+    servidor.registry["A2-AI-PIT01"].update_value(3.5)
+    servidor.registry["A1-AI-TIT01"].update_value(21.5)
+
+    mensagem = area1.receber()
+    assert (mensagem['tag'], mensagem['value'], mensagem['unit']) == ("A1-AI-TIT01", 21.5, "°C")
+    assert [todos.receber()['tag'] for _ in range(2)] == ["A2-AI-PIT01", "A1-AI-TIT01"]
+    area1.fechar()
+    todos.fechar()
+
+
+def test_cancelar_inscricao_e_comando_invalido(servidor):
+    """Testa unsubscribe e a resposta de erro para comandos malformados."""
+    cliente = Cliente(servidor.porta)
+    cliente.enviar(op="subscribe", pattern="A1-AI-TIT01")
+    cliente.enviar(op="subscribe", pattern="A1-AI-LIT01")
+    cliente.enviar(op="unsubscribe", pattern="A1-AI-TIT01")
+    assert 'erro' in cliente.enviar(op="publish", pattern="x")
+    assert 'erro' in cliente.enviar(op="subscribe", pattern="A1-#-TIT01")
+
+    servidor.registry["A1-AI-TIT01"].update_value(20.0)
+    servidor.registry["A1-AI-LIT01"].update_value(1.0)
+
+    assert cliente.receber()['tag'] == "A1-AI-LIT01"
+    cliente.fechar()
+
+
+def test_banda_morta_nao_filtra_o_fan_out(servidor):
+    """Testa que a banda morta do ponto não suprime as leituras publicadas."""
+    cliente = Cliente(servidor.porta)
+    cliente.enviar(op="subscribe", pattern="A1-AI-TIT01")
+    dispositivo = servidor.registry["A1-AI-TIT01"]
+    dispositivo.set_deadband(absoluto=10.0)
+
+    for valor in [20.0, 20.5, 21.0]:
+        dispositivo.update_value(valor)
+
+    assert [cliente.receber()['value'] for _ in range(3)] == [20.0, 20.5, 21.0]
+    assert dispositivo.deadband.suprimidas == 2
+    cliente.fechar()
+
+
+def test_area_e_novos_dispositivos(servidor):
+    """Testa a assinatura por área e a inclusão automática de pontos criados depois."""
+    cliente = Cliente(servidor.porta)
+    cliente.enviar(op="subscribe", pattern="area:2")
+    cliente.enviar(op="subscribe", pattern="A3-AI-*")
+    novo = servidor.registry.add(AIDevicePublisher("A3-AI-FIT01", 3, "Vazão", 0, 50, "m³/h"))
+
+    servidor.registry["A1-AI-TIT01"].update_value(20.0)
+    servidor.registry["A2-AI-PIT01"].update_value(4.0)
+    novo.update_value(12.0)
+
+    assert [cliente.receber()['tag'] for _ in range(2)] == ["A2-AI-PIT01", "A3-AI-FIT01"]
+    cliente.fechar()
+
+
+def test_despeja_consumidor_lento(servidor):
+    """Testa que um cliente que não lê é desconectado sem afetar os demais."""
+    servidor.limite_buffer = 64 * 1024
+    lento = Cliente(servidor.porta, rcvbuf=4096)
+    rapido = Cliente(servidor.porta)
+    lento.enviar(op="subscribe", pattern="#")
+    rapido.enviar(op="subscribe", pattern="A1-AI-LIT01")
+    dispositivo = servidor.registry["A1-AI-TIT01"]
+
+    for lote in range(200):
+        for i in range(1000):
+            dispositivo.update_value(float(i))
+        if aguardar(lambda: servidor.despejadas == 1, tentativas=1):
+            break
+
+    assert aguardar(lambda: servidor.metricas()['despejadas'] == 1)
+    assert aguardar(lambda: servidor.metricas()['conexoes'] == 1)
+    servidor.registry["A1-AI-LIT01"].update_value(2.0)
+    assert rapido.receber()['value'] == 2.0
+    lento.fechar()
+    rapido.fechar()
@@ -0,0 +1,99 @@
+import os
+import sys
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher, DODevice
+from src.registry import DeviceRegistry
+
+pytestmark = [pytest.mark.unit, pytest.mark.devices]
+
+
+@pytest.fixture
+def devices():
+    """Cria uma lista mista de dispositivos AI e DO em duas áreas."""
+    return [
+        DODevice("A1-VA11", 1, "Válvula 11"),
+        AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura Tanque 01", 0, 900, "°C"),
+        AIDevicePublisher("A1-AI-LIT01", 1, "Nível Tanque 01", 0, 25, "m"),
+        AIDevicePublisher("A2-AI-TESTE", 2, "Teste", 10, 0, None),
+    ]
+
+
+@pytest.fixture
+def registry(devices):
+    """Cria um registro com os dispositivos de teste."""
+    return DeviceRegistry(devices)
+
+
+def test_lookup_por_tag(registry, devices):
+    """Testa a busca direta por TAG."""
+    assert registry.get("A1-AI-TIT01") is devices[1]
+    assert registry["A1-VA11"] is devices[0]
+    assert registry.get("INEXISTENTE") is None
+    assert "A1-AI-LIT01" in registry
+    with pytest.raises(KeyError):
+        registry["INEXISTENTE"]
+
+
+def test_indices_secundarios(registry):
+    """Testa os índices por tipo e por área."""
+    assert [d.tag for d in registry.by_type("AI")] == ["A1-AI-TIT01", "A1-AI-LIT01", "A2-AI-TESTE"]
+    assert [d.tag for d in registry.by_type("DO")] == ["A1-VA11"]
+    assert [d.tag for d in registry.by_area(2)] == ["A2-AI-TESTE"]
+    assert list(registry.by_type("DI")) == []
+    assert set(registry.types()) == {"AI", "DO"}
+    assert set(registry.areas()) == {1, 2}
+
+
+def test_views_refletem_alteracoes(registry):
+    """Testa se as views acompanham inclusões e remoções."""
+    ai_view = registry.by_type("AI")
+    registry.add(AIDevicePublisher("A2-AI-PIT01", 2, "Pressão", 0, 10, "bar"))
+    assert len(ai_view) == 4
+
+    registry.remove("A2-AI-TESTE")
+    registry.remove("A2-AI-PIT01")
+    assert len(ai_view) == 2
+    assert 2 not in registry.areas()
+
+
+def test_iteracao_e_tamanho(registry, devices):
+    """Testa a compatibilidade com o uso anterior como lista."""
+    assert len(registry) == 4
+    assert list(registry) == devices
+    assert bool(DeviceRegistry()) is False
+
+
+def test_tag_duplicada(registry):
+    """Testa a rejeição de TAG duplicada."""
+    with pytest.raises(ValueError):
+        registry.add(DODevice("A1-VA11", 1, "Outra válvula"))
+
+
+def test_from_iterable_reaproveita_registro(registry, devices):
+    """Testa que from_iterable não recria um registro existente."""
+    assert DeviceRegistry.from_iterable(registry) is registry
+    assert len(DeviceRegistry.from_iterable(devices)) == 4
+
+
+def test_ao_adicionar(registry):
+    """Testa o aviso de novos dispositivos e o cancelamento da inscrição."""
+    recebidos = []
+    registry.ao_adicionar(recebidos.append)
+    novo = registry.add(DODevice("A1-VA12", 1, "Válvula 12"))
+    registry.remover_ao_adicionar(recebidos.append)
+    registry.add(DODevice("A1-VA13", 1, "Válvula 13"))
+
+    assert recebidos == [novo]
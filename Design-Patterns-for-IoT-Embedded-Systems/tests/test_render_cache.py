@@ -0,0 +1,83 @@
+import os
+import sys
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.observer import GenericSubscriber
+from src.render_cache import AssociationTable, SEM_VALOR
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+def tabela():
+    """Cria uma tabela com duas associações em dispositivos distintos."""
+    tabela = AssociationTable()
+    tit = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+    lit = AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m")
+    tabela.adicionar(tit.tag, "Painel", GenericSubscriber("Painel"), tit)
+    tabela.adicionar(lit.tag, "Alarme", GenericSubscriber("Alarme"), lit)
+    return tabela
+
+
+def test_html_contem_linhas(tabela):
+    """Testa o HTML gerado com cabeçalho, numeração e valores."""
+    tabela[0].device.update_value(21.5)
+    html = tabela.html()
+
+    assert html.count('<tr>') == 3
+    assert '<td class="table-cell">1</td><td class="table-cell">A1-AI-TIT01</td>' in html
+    assert "21.5 °C" in html
+    assert "None m" in html
+
+
+def test_so_refaz_celulas_alteradas(tabela):
+    """Testa que apenas as células de valor que mudaram são refeitas e o HTML é reaproveitado."""
+    tabela.html()
+    prefixo = tabela[1].prefixo
+    html = tabela.html()
+
+    assert tabela.atualizar() == 0
+    assert tabela.html() is html
+
+    tabela[0].device.update_value(30.0)
+    assert tabela.atualizar() == 1
+    assert tabela[1].prefixo is prefixo
+    assert "30.0 °C" in tabela.html()
+
+
+def test_remover_renumera_e_libera_chave(tabela):
+    """Testa a remoção, a renumeração das linhas seguintes e a detecção de duplicatas."""
+    assert tabela.existe("A1-AI-LIT01", "Alarme")
+
+    linha = tabela.remover("A1-AI-TIT01", "Painel")
+
+    assert linha["subscriber"] == "Painel"
+    assert not tabela.existe("A1-AI-TIT01", "Painel")
+    assert len(tabela) == 1
+    assert tabela[0].prefixo.startswith('<tr><td class="table-cell">1</td>')
+    with pytest.raises(KeyError):
+        tabela.remover("A1-AI-TIT01", "Painel")
+
+
+def test_escapa_nome_e_sem_dispositivo():
+    """Testa o escape do nome digitado pelo usuário e a célula de associação sem ponto AI."""
+    tabela = AssociationTable()
+    tabela.adicionar("A1-VA11", "<b>x</b>", GenericSubscriber("x"))
+
+    html = tabela.html()
+
+    assert "&lt;b&gt;x&lt;/b&gt;" in html
+    assert f'<td class="table-cell">{SEM_VALOR}</td>' in html
@@ -0,0 +1,101 @@
+import os
+import sys
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher, DODevice
+from src.ingestion import processar_linha
+from src.main import criar_dispositivo
+from src.registry import DeviceRegistry
+from src.routing import RoutingTable
+
+pytestmark = [pytest.mark.unit]
+
+
+def ponto(tag, porta=None, canal=None):
+    return AIDevicePublisher(tag, 1, "Sensor", -100, 100, "°C", porta=porta, canal=canal)
+
+
+@pytest.fixture
+def registry():
+    """Dois pontos na COM5, um na COM6 e um com canal válido em qualquer porta."""
+    registry = DeviceRegistry([
+        DODevice("A1-VA11", 1, "Válvula 11"),
+        ponto("A1-AI-TIT01"),
+        ponto("A1-AI-C5C1", "COM5", 1),
+        ponto("A1-AI-C5C2", "COM5", 2),
+        ponto("A1-AI-C6C1", "COM6", 1),
+        ponto("A1-AI-QQC2", None, 2),
+    ])
+    registry.build_routing_table()
+    return registry
+
+
+def test_resolucao_por_porta_e_canal(registry):
+    """Testa a ordem de resolução: rota da porta, rota sem porta, padrão do canal 0."""
+    rotas = registry.routing_table
+
+    assert rotas.resolver("COM5", 1).tag == "A1-AI-C5C1"
+    assert rotas.resolver("COM6", 1).tag == "A1-AI-C6C1"
+    assert rotas.resolver("COM5", 2).tag == "A1-AI-C5C2"
+    assert rotas.resolver("COM6", 2).tag == "A1-AI-QQC2"
+    assert rotas.resolver("COM7", 0).tag == "A1-AI-TIT01"
+    assert rotas.resolver("COM7", 1) is None
+    assert len(rotas) == 4
+
+
+def test_rota_explicita_do_canal_0_substitui_o_padrao():
+    """Testa que um Channel 0 declarado na lista de I/O tem precedência sobre A1-AI-TIT01."""
+    rotas = RoutingTable.from_devices([ponto("A1-AI-TIT01"), ponto("A1-AI-OUTRO", "COM5", 0)])
+
+    assert rotas.resolver("COM5", 0).tag == "A1-AI-OUTRO"
+    assert rotas.resolver("COM6", 0).tag == "A1-AI-TIT01"
+
+
+def test_conflito_de_rota(registry):
+    """Testa que duas TAGs na mesma porta/canal são recusadas sem registro parcial."""
+    with pytest.raises(ValueError, match="A1-AI-C5C1"):
+        registry.add(ponto("A1-AI-DUPLICADO", "COM5", 1))
+
+    assert "A1-AI-DUPLICADO" not in registry
+
+
+def test_inclusao_e_remocao_atualizam_rotas(registry):
+    """Testa que o registry mantém a tabela de rotas em dia."""
+    registry.add(ponto("A1-AI-C6C3", "COM6", 3))
+    assert registry.routing_table.resolver("COM6", 3).tag == "A1-AI-C6C3"
+
+    registry.remove("A1-AI-C6C3")
+    registry.remove("A1-AI-TIT01")
+    assert registry.routing_table.resolver("COM6", 3) is None
+    assert registry.routing_table.resolver("COM6", 0) is None
+
+
+def test_linha_csv_multicanal_por_porta(registry):
+    """Testa o despacho de um quadro CSV de vários canais para os pontos da porta de origem."""
+    rejeicoes = {}
+    processar_linha(registry, b"10.0,11.0,12.0,13.0", rejeicoes=rejeicoes, porta="COM5")
+    processar_linha(registry, b"20.0,21.0", rejeicoes=rejeicoes, porta="COM6")
+
+    valores = {d.tag: d.value for d in registry.by_type("AI")}
+    assert valores == {"A1-AI-TIT01": 20.0, "A1-AI-C5C1": 11.0, "A1-AI-C5C2": 12.0,
+                       "A1-AI-C6C1": 21.0, "A1-AI-QQC2": None}
+    assert rejeicoes == {'sem_rota': 1}  # Canal 3 da COM5
+
+
+def test_canal_invalido_na_lista_de_io():
+    """Testa a validação da coluna Channel na criação do dispositivo."""
+    assert criar_dispositivo("AI", "A1-AI-X", 1, "X", 0, 1, "m", None, " COM5 ", 4.0).porta == "COM5"
+    with pytest.raises(ValueError):
+        criar_dispositivo("AI", "A1-AI-X", 1, "X", 0, 1, "m", None, "COM5", 1.5)
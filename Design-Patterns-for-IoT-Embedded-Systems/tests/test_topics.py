@@ -0,0 +1,86 @@
+import os
+import sys
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher
+from src.topics import TopicTrie, e_padrao, filtrar
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+def trie():
+    """Cria uma trie com padrões literais, de um segmento, multinível e por área."""
+    trie = TopicTrie()
+    for padrao in ["A1-AI-TIT01", "A1-AI-*", "A1-*-TIT01", "A1-#", "#", "area:2", "A2-AI-*"]:
+        trie.adicionar(padrao, padrao)
+    return trie
+
+
+@pytest.mark.parametrize("tag, area, esperado", [
+    ("A1-AI-TIT01", 1, {"A1-AI-TIT01", "A1-AI-*", "A1-*-TIT01", "A1-#", "#"}),
+    ("A1-AI-LIT01", 1, {"A1-AI-*", "A1-#", "#"}),
+    ("A1", 1, {"A1-#", "#"}),
+    ("A1-AI", 1, {"A1-#", "#"}),
+    ("A2-AI-PIT01", 2, {"A2-AI-*", "area:2", "#"}),
+    ("A2-AI-PIT01-X", None, {"#"}),
+])
+def test_casar(trie, tag, area, esperado):
+    """Testa a resolução de TAGs contra padrões literais, '*', '#' e área."""
+    assert set(trie.casar(tag, area)) == esperado
+
+
+def test_sem_repeticao_e_cache(trie):
+    """Testa que o mesmo valor em dois padrões aparece uma vez e que o cache é refeito ao alterar."""
+    trie.adicionar("A1-AI-*", "A1-#")  # Mesmo valor de outra assinatura
+    resultado = trie.casar("A1-AI-TIT01", 1)
+    assert len(resultado) == len(set(resultado))
+    assert trie.casar("A1-AI-TIT01", 1) is resultado
+
+    chave = trie.adicionar("*-AI-TIT01", "novo")
+    assert "novo" in trie.casar("A1-AI-TIT01", 1)
+    trie.remover(chave)
+    assert "novo" not in trie.casar("A1-AI-TIT01", 1)
+
+
+def test_remover_poda_nos():
+    """Testa que remover todas as assinaturas deixa a trie vazia."""
+    vazia = TopicTrie()
+    chaves = [vazia.adicionar(p, p) for p in ["A1-AI-*", "A1-AI-TIT01", "A1-#", "area:1"]]
+    for chave in chaves:
+        vazia.remover(chave)
+
+    assert len(vazia) == 0
+    assert vazia._raiz.vazio()
+    assert vazia.casar("A1-AI-TIT01", 1) == ()
+
+
+@pytest.mark.parametrize("padrao", ["A1--TIT01", "A1-#-TIT01", "A1-TIT*", "area:"])
+def test_padroes_invalidos(padrao):
+    """Testa a validação dos padrões."""
+    with pytest.raises(ValueError):
+        TopicTrie().adicionar(padrao, None)
+
+
+def test_e_padrao_e_filtrar():
+    """Testa a detecção de padrões e a seleção de dispositivos por um único padrão."""
+    dispositivos = [
+        AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C"),
+        AIDevicePublisher("A2-AI-PIT01", 2, "Pressão", 0, 10, "bar"),
+    ]
+    assert not e_padrao("A1-AI-TIT01")
+    assert e_padrao("A1-AI-*") and e_padrao("A1-#") and e_padrao("area:1")
+    assert [d.tag for d in filtrar("area:2", dispositivos)] == ["A2-AI-PIT01"]
+    assert [d.tag for d in filtrar("*-AI-*", dispositivos)] == ["A1-AI-TIT01", "A2-AI-PIT01"]
@@ -0,0 +1,107 @@
+import os
+import sys
+import importlib
+import threading
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+import serial
+from src.devices import AIDevicePublisher
+from src.transport import SerialTransport
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_transporte_nao_conecta_na_criacao(monkeypatch):
+    """Testa que criar o transporte não abre a porta."""
+    monkeypatch.setattr(serial, 'serial_for_url', lambda *a, **k: pytest.fail("porta aberta na criação"))
+
+    transporte = SerialTransport('COM5', 115200)
+
+    assert transporte.conectado is False
+
+
+def test_configuracao_por_variaveis_de_ambiente(monkeypatch):
+    """Testa a configuração de porta e baudrate pelo ambiente."""
+    monkeypatch.setenv('BROKER_SERIAL_PORT', '/dev/ttyUSB0')
+    monkeypatch.setenv('BROKER_SERIAL_BAUD', '9600')
+    monkeypatch.setenv('BROKER_SERIAL_SETTLE', '0')
+
+    transporte = SerialTransport()
+
+    assert transporte.port == '/dev/ttyUSB0'
+    assert transporte.baudrate == 9600
+    assert transporte.tempo_estabilizacao == 0.0
+
+
+def test_loopback_conecta_sob_demanda():
+    """Testa o transporte com a porta loop:// do pyserial."""
+    transporte = SerialTransport('loop://', tempo_estabilizacao=0)
+
+    transporte.escrever(b"25.50\n")
+
+    assert transporte.conectado is True
+    assert transporte.ler_disponivel() == b"25.50\n"
+    transporte.fechar()
+    assert transporte.conectado is False
+
+
+def test_leitura_bloqueante_loopback():
+    """Testa a leitura bloqueante usada em portas sem descritor: retorna ao chegar dado ou no timeout."""
+    transporte = SerialTransport('loop://', tempo_estabilizacao=0).conectar()
+    try:
+        assert transporte.fileno() is None
+        assert transporte.ler_bloqueante(0.05) == b''
+
+        threading.Timer(0.05, transporte.escrever, args=(b"25.50\n26.00\n",)).start()
+        assert transporte.ler_bloqueante(2.0) == b"25.50\n26.00\n"
+    finally:
+        transporte.fechar()
+
+
+def test_importar_main_nao_abre_porta(monkeypatch):
+    """Testa que importar src.main não abre a porta serial nem aguarda."""
+    monkeypatch.setattr(serial, 'Serial', lambda *a, **k: pytest.fail("porta aberta na importação"))
+    monkeypatch.setattr(serial, 'serial_for_url', lambda *a, **k: pytest.fail("porta aberta na importação"))
+
+    import src.main
+    importlib.reload(src.main)
+
+    assert callable(src.main.processar_e_criar_dispositivos)
+
+
+def test_ler_sensor_com_transporte_loopback():
+    """Testa a ingestão completa usando o transporte loop:// como substituto da porta."""
+    from src.main import ler_sensor
+
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C")
+    recebido = threading.Event()
+
+    class Subscriber:
+        def update(self, device):
+            recebido.set()
+
+    dispositivo.attach(Subscriber())
+    transporte = SerialTransport('loop://', tempo_estabilizacao=0)
+    stop_event = threading.Event()
+    thread = threading.Thread(target=ler_sensor, args=([dispositivo], stop_event, transporte), daemon=True)
+    thread.start()
+
+    transporte.escrever(b"30.25\n")
+    try:
+        assert recebido.wait(5.0)
+        assert dispositivo.value == 30.25
+    finally:
+        stop_event.set()
+        thread.join(5.0)
@@ -0,0 +1,159 @@
+import os
+import sys
+import math
+import pytest
+
+# Adicionando os caminhos necessários para importação
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(script_dir, '..'))
+src_dir = os.path.join(parent_dir, 'src')
+
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+# Importando os módulos a serem testados
+from src.devices import AIDevicePublisher, DODevice
+from src.registry import DeviceRegistry
+from src.value_table import (AIValueTable, FORA_DA_FAIXA, LEITURA_VALIDA, QUALIDADE_BOA, QUALIDADE_INVALIDA,
+                             QUALIDADE_SEM_LEITURA, TAXA_EXCEDIDA)
+
+pytestmark = [pytest.mark.unit, pytest.mark.devices]
+
+
+@pytest.fixture
+def registry():
+    """Cria um registro com pontos AI em duas áreas e um DO, já com a tabela colunar."""
+    registry = DeviceRegistry([
+        DODevice("A1-VA11", 1, "Válvula 11"),
+        AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C"),
+        AIDevicePublisher("A1-AI-LIT01", 1, "Nível", 0, 25, "m"),
+        AIDevicePublisher("A2-AI-TESTE", 2, "Faixa invertida", 10, 0, None),
+        AIDevicePublisher("A2-AI-SEMFAIXA", 2, "Sem faixa", " ", float('nan'), None),
+    ])
+    registry.build_value_table()
+    return registry
+
+
+def test_apenas_pontos_ai_na_tabela(registry):
+    """Testa que somente dispositivos AI recebem índice na tabela."""
+    tabela = registry.value_table
+    assert len(tabela) == 4
+    assert tabela.tags == ["A1-AI-TIT01", "A1-AI-LIT01", "A2-AI-TESTE", "A2-AI-SEMFAIXA"]
+
+
+def test_update_value_escreve_na_tabela(registry):
+    """Testa se update_value espelha o valor, o timestamp e a qualidade."""
+    tabela = registry.value_table
+    registry["A1-AI-LIT01"].update_value(12.5)
+    registry["A2-AI-TESTE"].update_value(None)
+
+    snapshot = tabela.snapshot()
+    i = tabela.indice("A1-AI-LIT01")
+    assert snapshot['value'][i] == 12.5
+    assert snapshot['quality'][i] == QUALIDADE_BOA
+    assert snapshot['timestamp'][i] > 0
+    assert snapshot['quality'][tabela.indice("A2-AI-TESTE")] == QUALIDADE_INVALIDA
+    assert snapshot['quality'][tabela.indice("A1-AI-TIT01")] == QUALIDADE_SEM_LEITURA
+
+
+def test_snapshot_e_uma_copia(registry):
+    """Testa que o snapshot não muda com escritas posteriores."""
+    registry["A1-AI-TIT01"].update_value(20.0)
+    snapshot = registry.value_table.snapshot()
+    registry["A1-AI-TIT01"].update_value(30.0)
+
+    assert snapshot['value'][0] == 20.0
+
+
+def test_estatisticas_por_area(registry):
+    """Testa min/max/média por área considerando apenas leituras válidas."""
+    registry["A1-AI-TIT01"].update_value(20.0)
+    registry["A1-AI-LIT01"].update_value(10.0)
+    registry["A2-AI-TESTE"].update_value(5.0)
+    registry["A2-AI-SEMFAIXA"].update_value(None)
+
+    stats = registry.value_table.estatisticas_por_area()
+
+    assert stats[1] == {'min': 10.0, 'max': 20.0, 'mean': 15.0, 'count': 2}
+    assert stats[2] == {'min': 5.0, 'max': 5.0, 'mean': 5.0, 'count': 1}
+
+
+def test_fora_da_faixa(registry):
+    """Testa a máscara de fora da faixa com faixa invertida e sem faixa."""
+    registry["A1-AI-TIT01"].update_value(950.0)  # Acima de 900
+    registry["A1-AI-LIT01"].update_value(12.0)   # Dentro
+    registry["A2-AI-TESTE"].update_value(-1.0)   # Abaixo de min(10, 0)
+    registry["A2-AI-SEMFAIXA"].update_value(1e9)  # Sem limites definidos
+
+    assert registry.value_table.fora_da_faixa().tolist() == [True, False, True, False]
+
+
+def test_crescimento_e_novos_dispositivos(registry):
+    """Testa a inclusão de novos pontos após a criação da tabela."""
+    tabela = registry.value_table
+    for i in range(100):
+        registry.add(AIDevicePublisher(f"A3-AI-P{i:03d}", 3, "Novo", 0, 1, "bar"))
+    registry["A3-AI-P099"].update_value(0.5)
+
+    assert len(tabela) == 104
+    assert tabela.snapshot()['value'][tabela.indice("A3-AI-P099")] == 0.5
+
+
+def test_remocao_sai_das_consultas(registry):
+    """Testa que um ponto removido deixa de entrar nas estatísticas."""
+    dispositivo = registry["A2-AI-TESTE"]
+    dispositivo.update_value(5.0)
+    registry.remove("A2-AI-TESTE")
+    dispositivo.update_value(7.0)
+
+    assert 2 not in registry.value_table.estatisticas_por_area()
+
+
+def test_tabela_vazia():
+    """Testa consultas em uma tabela sem pontos."""
+    tabela = AIValueTable.from_devices([])
+    assert tabela.estatisticas_por_area() == {}
+    assert tabela.fora_da_faixa().tolist() == []
+    assert math.isnan(AIValueTable().values[0])
+
+
+def test_validar_lote_faixa(registry):
+    """Testa a validação pela faixa de cada ponto: invertida, unilateral e sem limites."""
+    tabela = registry.value_table
+    semi = registry.add(AIDevicePublisher("A3-AI-SEMI", 3, "Só mínimo", 5, None, "bar"))
+    tags = ["A1-AI-TIT01", "A1-AI-TIT01", "A2-AI-TESTE", "A2-AI-TESTE", "A2-AI-SEMFAIXA", "A3-AI-SEMI", "A3-AI-SEMI"]
+    valores = [900.0, 900.5, 0.0, -0.1, -1e9, 1e9, 4.9]
+
+    resultado = tabela.validar_lote([tabela.indice(tag) for tag in tags], valores)
+
+    assert resultado.tolist() == [LEITURA_VALIDA, FORA_DA_FAIXA, LEITURA_VALIDA, FORA_DA_FAIXA,
+                                  LEITURA_VALIDA, LEITURA_VALIDA, FORA_DA_FAIXA]
+    assert tabela.limite_inf[tabela.indice(semi.tag)] == 5.0
+
+
+def test_validar_lote_taxa():
+    """Testa o limite de variação por segundo em relação à última leitura boa."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C", taxa_max=2.0)
+    tabela = AIValueTable.from_devices([dispositivo])
+
+    assert tabela.validar_lote([0], [500.0], agora=100.0).tolist() == [LEITURA_VALIDA]  # Sem leitura anterior
+    tabela.escrever(0, 20.0, timestamp=100.0)
+
+    resultado = tabela.validar_lote([0, 0, 0], [21.0, 23.0, 1000.0], agora=101.0)
+    assert resultado.tolist() == [LEITURA_VALIDA, TAXA_EXCEDIDA, FORA_DA_FAIXA]
+
+
+def test_validar_lote_leituras_repetidas_em_ordem():
+    """Testa que leituras repetidas de um ponto no mesmo lote são validadas contra a anterior aceita."""
+    dispositivo = AIDevicePublisher("A1-AI-TIT01", 1, "Temperatura", 0, 900, "°C", taxa_max=1.0)
+    tabela = AIValueTable.from_devices([dispositivo])
+    tabela.escrever(0, 20.0, timestamp=100.0)
+
+    # 20 -> 29 em 10 s é aceito; 29 -> 21 no mesmo instante é um salto
+    assert tabela.validar_lote([0, 0], [29.0, 21.0], agora=110.0).tolist() == [LEITURA_VALIDA, TAXA_EXCEDIDA]
+    # Primeira leitura rejeitada: a seguinte continua comparada com a tabela (20 em 100 s)
+    assert tabela.validar_lote([0, 0, 0], [50.0, 21.0, 21.0], agora=110.0).tolist() == [
+        TAXA_EXCEDIDA, LEITURA_VALIDA, LEITURA_VALIDA]